@@ -0,0 +1,75 @@
+"""
+BENCHMARK - ANONIMIZACIÓN EN LOTE
+=================================
+Mide cuántas notas de audiencia por segundo se anonimizan una por una en
+este proceso y con ``anonimizar_lote`` repartiéndolas entre varios
+procesos. Las notas son sintéticas, de unas pocas frases cada una.
+
+La ganancia depende de los núcleos disponibles: con un solo núcleo los
+procesos solo agregan el costo de arrancarlos y de enviar los textos.
+
+Uso:
+    python benchmarks/bench_anonimizacion_lote.py [notas]
+"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from benchmarks.bench_anonimizador import generar_frase
+from utils.anonimizador import anonimizador, anonimizar_lote
+
+NOTAS = 3000
+FRASES_POR_NOTA = 6
+
+
+def generar_notas(cantidad: int, semilla: int = 2025) -> list:
+    """Genera ``cantidad`` notas sintéticas de FRASES_POR_NOTA frases."""
+    aleatorio = random.Random(semilla)
+    return [
+        " ".join(generar_frase(aleatorio) for _ in range(FRASES_POR_NOTA))
+        for _ in range(cantidad)
+    ]
+
+
+def medir(funcion, notas: list) -> float:
+    """Segundos que tarda ``funcion(notas)``."""
+    inicio = time.perf_counter()
+    resultados = funcion(notas)
+    segundos = time.perf_counter() - inicio
+    assert len(resultados) == len(notas)
+    return segundos
+
+
+def main():
+    """Ejecuta el benchmark e imprime notas por segundo de cada variante."""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else NOTAS
+    notas = generar_notas(cantidad)
+    anonimizador.anonimizar_texto(notas[0])  # carga el diccionario de nombres
+    nucleos = os.cpu_count() or 1
+
+    print("⏱️  BENCHMARK: ANONIMIZACIÓN EN LOTE")
+    print("=" * 60)
+    print(f"{cantidad} notas ({sum(map(len, notas))} caracteres), {nucleos} núcleo(s)")
+
+    variantes = [("una por una", lambda textos: [anonimizador.anonimizar_texto(t) for t in textos])]
+    for procesos in sorted({2, 4, nucleos}):
+        variantes.append((
+            f"lote, {procesos} procesos",
+            lambda textos, procesos=procesos: anonimizar_lote(textos, max_procesos=procesos),
+        ))
+
+    base = None
+    for etiqueta, funcion in variantes:
+        segundos = medir(funcion, notas)
+        base = base or segundos
+        print(f"  {etiqueta:20s} {segundos:7.2f} s | {cantidad / segundos:8.0f} notas/s | x{base / segundos:.2f}")
+
+
+if __name__ == "__main__":
+    main()
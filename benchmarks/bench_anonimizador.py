@@ -0,0 +1,101 @@
+"""
+BENCHMARK - ANONIMIZADOR
+========================
+Mide cuánto tardan la anonimización, un reintento con el mismo texto
+(resultado guardado en caché) y ``restaurar_datos_ia`` en dictados
+sintéticos de varias páginas con nombres, cédulas, celulares, correos,
+direcciones y radicados.
+
+Uso:
+    python benchmarks/bench_anonimizador.py
+"""
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from utils.anonimizador import anonimizador, anonimizar_para_ia, restaurar_datos_ia
+
+PAGINAS = (1, 5, 20)
+CARACTERES_POR_PAGINA = 3000
+REPETICIONES = 5
+
+NOMBRES = ["CARLOS ANDRÉS", "María Helena", "LUIS FERNANDO", "Ana Patricia", "Pedro José"]
+APELLIDOS = ["RODRÍGUEZ VILLA", "gonzález torres", "MARTÍN SILVA", "Hernández López", "RAMÍREZ"]
+ROLES = ["El imputado", "La víctima", "El defensor", "La fiscal", "El testigo"]
+RELLENO = [
+    "La audiencia se instaló en la sala virtual con la presencia de las partes.",
+    "El despacho dejó constancia de la asistencia y verificó la conexión.",
+    "Se corrió traslado de la solicitud y las partes presentaron sus argumentos.",
+    "No se pudo realizar la diligencia por problemas técnicos del sistema.",
+]
+
+
+def generar_frase(aleatorio: random.Random) -> str:
+    """Genera una frase de dictado con uno o dos datos sensibles."""
+    nombre = f"{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)}"
+    cedula = f"{aleatorio.randint(1, 99)}.{aleatorio.randint(100, 999)}.{aleatorio.randint(100, 999)}"
+    celular = f"3{aleatorio.randint(0, 50):02d} {aleatorio.randint(100, 999)} {aleatorio.randint(1000, 9999)}"
+    radicado = f"05001-60-00000-2024-{aleatorio.randint(0, 99999):05d}-00"
+    plantillas = [
+        f"{aleatorio.choice(ROLES)} {nombre} identificado con C.C. {cedula} compareció.",
+        f"Se puede contactar al celular {celular} o al correo usuario{aleatorio.randint(1, 999)}@correo.com.",
+        f"Dirección: Carrera {aleatorio.randint(1, 99)} #{aleatorio.randint(1, 99)}-{aleatorio.randint(1, 99)}, Medellín.",
+        f"Dentro del radicado {radicado} se fijó nueva fecha.",
+        aleatorio.choice(RELLENO),
+        aleatorio.choice(RELLENO),
+    ]
+    return aleatorio.choice(plantillas)
+
+
+def generar_dictado(paginas: int, semilla: int = 2025) -> str:
+    """Genera un dictado sintético de aproximadamente ``paginas`` páginas."""
+    aleatorio = random.Random(semilla)
+    frases = []
+    longitud = 0
+    while longitud < paginas * CARACTERES_POR_PAGINA:
+        frase = generar_frase(aleatorio)
+        frases.append(frase)
+        longitud += len(frase) + 1
+    return " ".join(frases)
+
+
+def medir(funcion, *args) -> float:
+    """Mediana (ms) de REPETICIONES llamadas a ``funcion(*args)``."""
+    tiempos = []
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        funcion(*args)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    """Ejecuta el benchmark e imprime los resultados."""
+    print("⏱️  BENCHMARK: ANONIMIZADOR")
+    print("=" * 60)
+    for paginas in PAGINAS:
+        texto = generar_dictado(paginas)
+        anonimizar_ms = medir(anonimizador.anonimizar_texto, texto)
+
+        # El primer llamado guarda el resultado; los siguientes son reintentos
+        texto_anonimo, mapeo = anonimizar_para_ia(texto)
+        reintento_ms = medir(anonimizar_para_ia, texto)
+
+        # Respuesta de la IA con el dictado completo en observaciones
+        respuesta = {"radicado": texto_anonimo[:40], "observaciones": texto_anonimo}
+        restaurar_ms = medir(restaurar_datos_ia, respuesta, mapeo)
+
+        print(f"{paginas:3d} página(s) ({len(texto):6d} caracteres): "
+              f"anonimizar {anonimizar_ms:7.1f} ms | "
+              f"reintento {reintento_ms:5.2f} ms | "
+              f"restaurar {restaurar_ms:6.1f} ms ({len(mapeo)} datos)")
+
+
+if __name__ == "__main__":
+    main()
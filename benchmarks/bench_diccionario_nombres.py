@@ -0,0 +1,70 @@
+"""
+BENCHMARK - DICCIONARIO DE NOMBRES
+==================================
+Compara ``buscar_nombres`` decidiendo solo por la forma de las palabras con
+la versión que puntúa cada secuencia contra el diccionario de nombres y
+apellidos colombianos. Reporta el tiempo de detección, cuántos tramos se
+marcan como nombre y cuántos de ellos son frases del dictado (falsos
+positivos) en los dictados sintéticos de ``bench_anonimizador``.
+
+Uso:
+    python benchmarks/bench_diccionario_nombres.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from benchmarks.bench_anonimizador import APELLIDOS, NOMBRES, PAGINAS, generar_dictado
+from utils.detector_nombres import buscar_nombres, clave_palabra, diccionario_nombres
+
+REPETICIONES = 5
+
+# Claves de las palabras que sí son nombres en los dictados sintéticos
+PALABRAS_DE_NOMBRES = {
+    clave_palabra(palabra)
+    for texto in NOMBRES + APELLIDOS
+    for palabra in texto.split()
+}
+
+
+def es_falso_positivo(tramo: str) -> bool:
+    """Un tramo sin ninguna palabra de los nombres generados no es un nombre."""
+    palabras = tramo.replace(",", " ").split()
+    return not any(clave_palabra(palabra) in PALABRAS_DE_NOMBRES for palabra in palabras)
+
+
+def medir(texto: str, conocidos) -> tuple:
+    """Mejor tiempo (ms) de REPETICIONES ejecuciones y tramos detectados."""
+    mejor = float("inf")
+    tramos = []
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        tramos = [texto[a:b] for a, b in buscar_nombres(texto, conocidos)]
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000, tramos
+
+
+def main():
+    """Ejecuta el benchmark e imprime tiempos y falsos positivos por tamaño."""
+    inicio = time.perf_counter()
+    conocidos = diccionario_nombres()
+    carga = (time.perf_counter() - inicio) * 1000
+
+    print("⏱️  BENCHMARK: DICCIONARIO DE NOMBRES")
+    print("=" * 60)
+    print(f"Diccionario: {len(conocidos)} palabras, cargado en {carga:.2f} ms")
+    for paginas in PAGINAS:
+        texto = generar_dictado(paginas)
+        print(f"{paginas:3d} página(s) ({len(texto):6d} caracteres):")
+        for etiqueta, diccionario in (("solo forma", frozenset()), ("diccionario", conocidos)):
+            tiempo, tramos = medir(texto, diccionario)
+            falsos = sum(es_falso_positivo(tramo) for tramo in tramos)
+            print(f"  {etiqueta:12s} {tiempo:8.2f} ms | {len(tramos):4d} tramos | {falsos:4d} falsos positivos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+BENCHMARK - GUARDADO EN EXCEL
+=============================
+Compara la latencia por guardado del flujo anterior (guardar_audiencia +
+reordenar_y_guardar, dos ciclos de carga/escritura) con guardar_y_reordenar
+(un único ciclo) sobre una hoja de 100 filas, y con el motor SQLite, que no
+reescribe el libro en cada guardado.
+
+Uso:
+    python benchmarks/bench_guardado_excel.py
+"""
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from models.audiencia import Audiencia
+from models.excel_manager import ExcelManager
+
+PLANTILLA = proyecto_root / "templates" / "plantilla_audiencias.xlsx"
+FILAS_PREVIAS = 80
+GUARDADOS = 20
+
+
+def crear_audiencia(i: int) -> Audiencia:
+    """Genera una audiencia sintética con fecha y hora variables."""
+    return Audiencia(
+        radicado=f"05001-60-00000-2025-{i:05d}-00",
+        tipo="Audiencia preliminar",
+        fecha=f"{(i % 28) + 1:02d}/{(i % 12) + 1:02d}/2025",
+        hora=f"{8 + i % 9:02d}:{(i * 7) % 60:02d}",
+        juzgado="Juzgado Primero Penal del Circuito",
+        realizada_si="SI" if i % 3 else "",
+        realizada_no="" if i % 3 else "NO",
+        motivos=["Juez" if i % 3 == 0 else ""] + [""] * 7,
+        observaciones="Registro sintético de benchmark",
+    )
+
+
+def preparar_archivo(directorio: Path, nombre: str) -> str:
+    """Copia la plantilla y la llena con FILAS_PREVIAS registros."""
+    destino = directorio / nombre
+    shutil.copy2(PLANTILLA, destino)
+    manager = ExcelManager(str(destino))
+    for i in range(FILAS_PREVIAS):
+        manager.guardar_audiencia(crear_audiencia(i))
+    manager.reordenar_y_guardar()
+    return str(destino)
+
+
+def medir(flujos, archivos, motores) -> list:
+    """Alterna los flujos guardado a guardado y devuelve la mediana (ms) de cada uno."""
+    managers = [
+        ExcelManager(archivo, motor=motor) for archivo, motor in zip(archivos, motores)
+    ]
+    tiempos = [[] for _ in flujos]
+    for i in range(GUARDADOS):
+        audiencia = crear_audiencia(FILAS_PREVIAS + i)
+        for flujo, manager, muestras in zip(flujos, managers, tiempos):
+            inicio = time.perf_counter()
+            flujo(manager, audiencia)
+            muestras.append((time.perf_counter() - inicio) * 1000)
+    for manager in managers:
+        manager.cerrar()
+    return [statistics.median(muestras) for muestras in tiempos]
+
+
+def flujo_anterior(manager: ExcelManager, audiencia: Audiencia):
+    manager.guardar_audiencia(audiencia)
+    manager.reordenar_y_guardar()
+
+
+def flujo_unico(manager: ExcelManager, audiencia: Audiencia):
+    manager.guardar_y_reordenar(audiencia)
+
+
+def main():
+    """Ejecuta el benchmark e imprime la comparación."""
+    print("⏱️  BENCHMARK: GUARDADO EN EXCEL (hoja de 100 filas)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directorio = Path(tmp)
+        archivos = [
+            preparar_archivo(directorio, "anterior.xlsx"),
+            preparar_archivo(directorio, "unico.xlsx"),
+            preparar_archivo(directorio, "sqlite.xlsx"),
+        ]
+        ms_anterior, ms_unico, ms_sqlite = medir(
+            [flujo_anterior, flujo_unico, flujo_unico],
+            archivos,
+            ["excel", "excel", "sqlite"],
+        )
+
+    print(f"guardar_audiencia + reordenar_y_guardar: {ms_anterior:8.1f} ms/guardado (mediana)")
+    print(f"guardar_y_reordenar:                     {ms_unico:8.1f} ms/guardado (mediana)")
+    print(f"guardar_y_reordenar (motor sqlite):      {ms_sqlite:8.1f} ms/guardado (mediana)")
+    print(f"Aceleración: {ms_anterior / ms_unico:.2f}x (un ciclo), "
+          f"{ms_anterior / ms_sqlite:.0f}x (sqlite)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+BENCHMARK - IMPORTACIÓN EN LOTE
+===============================
+Mide el rendimiento (registros/s) de ``guardar_lote`` con 1.000 y 10.000
+audiencias en ambos motores, frente a guardar una por una con
+``guardar_y_reordenar`` (medido sobre las primeras GUARDADOS_UNO_A_UNO).
+
+Uso:
+    python benchmarks/bench_importacion_lote.py
+"""
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from models.audiencia import Audiencia
+from models.excel_manager import ExcelManager
+
+PLANTILLA = proyecto_root / "templates" / "plantilla_audiencias.xlsx"
+TAMANOS = (1_000, 10_000)
+GUARDADOS_UNO_A_UNO = 100
+
+
+def crear_audiencia(i: int) -> Audiencia:
+    """Genera una audiencia sintética válida con fecha y hora variables."""
+    realizada = i % 3 != 0
+    return Audiencia(
+        radicado=f"05001-60-00000-2025-{i:05d}-00",
+        tipo="Audiencia preliminar",
+        fecha=f"{(i % 28) + 1:02d}/{(i % 12) + 1:02d}/2025",
+        hora=f"{8 + i % 9:02d}:{(i * 7) % 60:02d}",
+        juzgado="Juzgado Primero Penal del Circuito",
+        realizada_si="SI" if realizada else "",
+        realizada_no="" if realizada else "NO",
+        motivos=["" if realizada else "Juez"] + [""] * 7,
+        observaciones="Registro sintético de benchmark",
+    )
+
+
+def copiar_plantilla(directorio: Path, nombre: str) -> str:
+    destino = directorio / nombre
+    shutil.copy2(PLANTILLA, destino)
+    return str(destino)
+
+
+def medir_lote(directorio: Path, n: int, motor: str) -> float:
+    """Registros por segundo de guardar_lote (incluye exportar el libro)."""
+    audiencias = [crear_audiencia(i) for i in range(n)]
+    manager = ExcelManager(copiar_plantilla(directorio, f"lote_{motor}_{n}.xlsx"), motor=motor)
+    inicio = time.perf_counter()
+    manager.guardar_lote(audiencias)
+    manager.exportar()
+    segundos = time.perf_counter() - inicio
+    manager.cerrar()
+    return n / segundos
+
+
+def medir_uno_a_uno(directorio: Path) -> float:
+    """Registros por segundo guardando con guardar_y_reordenar uno por uno."""
+    manager = ExcelManager(copiar_plantilla(directorio, "uno_a_uno.xlsx"))
+    inicio = time.perf_counter()
+    for i in range(GUARDADOS_UNO_A_UNO):
+        manager.guardar_y_reordenar(crear_audiencia(i))
+    segundos = time.perf_counter() - inicio
+    manager.cerrar()
+    return GUARDADOS_UNO_A_UNO / segundos
+
+
+def main():
+    """Ejecuta el benchmark e imprime la comparación."""
+    print("⏱️  BENCHMARK: IMPORTACIÓN EN LOTE")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directorio = Path(tmp)
+        uno_a_uno = medir_uno_a_uno(directorio)
+        print(f"guardar_y_reordenar uno a uno ({GUARDADOS_UNO_A_UNO} registros): "
+              f"{uno_a_uno:10.0f} registros/s")
+        for n in TAMANOS:
+            for motor in ExcelManager.MOTORES:
+                rps = medir_lote(directorio, n, motor)
+                print(f"guardar_lote {n:>6} registros (motor {motor:6}): "
+                      f"{rps:10.0f} registros/s  ({rps / uno_a_uno:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+BENCHMARK - MEMORIA DE REGISTROS CARGADOS
+=========================================
+Compara la memoria retenida por 50.000 filas cargadas como:
+
+- lista de celdas por fila, como devuelve ``leer_registros``;
+- ((1, fecha, hora), fila) como ordenaba antes ``reordenar_y_guardar``;
+- ``Registro`` (slots, clave entera y motivos como máscara), que usa ahora
+  ``ExcelManager`` internamente.
+
+Las filas se generan como las entrega openpyxl: una tupla nueva por fila y
+los textos repetidos tomados de la tabla de cadenas compartidas.
+
+Uso:
+    python benchmarks/bench_memoria_registros.py
+"""
+import gc
+import sys
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from models.audiencia import ETIQUETAS_MOTIVOS
+from models.registro import Registro
+
+FILAS = 50_000
+
+# Tabla de cadenas compartidas del libro (fechas de un año, horas, juzgados...)
+FECHAS = [f"{d:02d}/{m:02d}/2025" for m in range(1, 13) for d in range(1, 29)]
+HORAS = [f"{h:02d}:{m:02d}" for h in range(7, 18) for m in range(0, 60, 5)]
+JUZGADOS = [f"Juzgado {i} Penal del Circuito" for i in range(1, 31)]
+TIPOS = ["Audiencia preliminar", "Juicio oral", "Lectura de fallo", "Otra"]
+
+
+def filas_libro():
+    """Genera filas (número + columnas 2 a 17) como iter_rows(values_only=True)."""
+    for i in range(FILAS):
+        realizada = i % 3 != 0
+        motivos = [None] * 8
+        if not realizada:
+            motivos[i % 8] = ETIQUETAS_MOTIVOS[i % 8]
+        yield (
+            i + 1,
+            f"05001-60-00000-2025-{i:05d}-00",
+            TIPOS[i % len(TIPOS)],
+            FECHAS[i % len(FECHAS)],
+            HORAS[i % len(HORAS)],
+            JUZGADOS[i % len(JUZGADOS)],
+            "SI" if realizada else None,
+            None if realizada else "NO",
+            *motivos,
+            None if i % 4 else f"Observación {i}",
+        )
+
+
+def como_listas():
+    return [(fila[0], list(fila)) for fila in filas_libro()]
+
+
+def como_tuplas_con_fechas():
+    return [
+        ((1, datetime.strptime(fila[3], "%d/%m/%Y"), datetime.strptime(fila[4], "%H:%M")), fila)
+        for fila in filas_libro()
+    ]
+
+
+def como_registros():
+    return [Registro.desde_valores(fila[1:]) for fila in filas_libro()]
+
+
+def medir(construir) -> int:
+    """Bytes retenidos por la estructura que devuelve ``construir``."""
+    gc.collect()
+    tracemalloc.start()
+    datos = construir()
+    gc.collect()
+    retenido, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del datos
+    return retenido
+
+
+def main():
+    """Ejecuta el benchmark e imprime la comparación."""
+    print(f"💾 BENCHMARK: MEMORIA DE {FILAS:,} REGISTROS CARGADOS")
+    print("=" * 60)
+
+    listas = medir(como_listas)
+    tuplas = medir(como_tuplas_con_fechas)
+    registros = medir(como_registros)
+
+    for nombre, retenido in (
+        ("(fila, lista de celdas)", listas),
+        ("((1, fecha, hora), fila)", tuplas),
+        ("Registro (slots + máscara)", registros),
+    ):
+        print(f"{nombre:28} {retenido / 2**20:8.1f} MiB  "
+              f"({retenido / FILAS:6.0f} bytes/registro)")
+    print(f"Reducción: {listas / registros:.1f}x frente a listas, "
+          f"{tuplas / registros:.1f}x frente a tuplas con fechas")
+
+
+if __name__ == "__main__":
+    main()
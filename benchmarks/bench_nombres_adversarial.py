@@ -0,0 +1,92 @@
+"""
+BENCHMARK - DETECCIÓN DE NOMBRES CON ENTRADAS ADVERSARIAS
+=========================================================
+Compara los 15 patrones de nombres que usaba el anonimizador con
+``buscar_nombres`` en textos pensados para provocar retroceso en las
+expresiones regulares: pasajes largos en mayúsculas o minúsculas sin coma,
+una coma al final, espacios repetidos y roles seguidos. Al duplicar el
+tamaño, un tiempo lineal se duplica; uno cuadrático se cuadruplica.
+
+Uso:
+    python benchmarks/bench_nombres_adversarial.py
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from utils.detector_nombres import buscar_nombres
+
+TAMANOS = (250, 500, 1000, 2000, 4000)
+# Los patrones anteriores son cuadráticos: se miden solo hasta este tamaño
+TAMANO_MAXIMO_ANTERIOR = 500
+REPETICIONES = 3
+
+# Patrones de nombres anteriores (sin las correcciones posteriores)
+PATRONES_ANTERIORES = [re.compile(patron) for patron in (
+    r'([A-ZÁÉÍÓÚÑ]+(?:\s+[A-ZÁÉÍÓÚÑ]+)*,\s*[A-ZÁÉÍÓÚÑ]+(?:\s+[A-ZÁÉÍÓÚÑ]+)*)',
+    r'([a-záéíóúñ]+(?:\s+[a-záéíóúñ]+)*,\s*[a-záéíóúñ]+(?:\s+[a-záéíóúñ]+)*)',
+    r'([A-Za-záéíóúñÁÉÍÓÚÑ]+(?:\s+[A-Za-záéíóúñÁÉÍÓÚÑ]+)*,\s*[A-Za-záéíóúñÁÉÍÓÚÑ]+(?:\s+[A-Za-záéíóúñÁÉÍÓÚÑ]+)*)',
+    r'(?:Imputado|Defensor|Fiscal|Víctima|señor|señora|Dr\.|Dra\.|Abg\.|Testigo|Abogado)[\s:]*([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ\s]{8,60})',
+    r'(?:imputado|defensor|fiscal|víctima|señor|señora|dr\.|dra\.|abg\.|testigo|abogado)[\s:]*([a-záéíóúñ][a-záéíóúñ\s]{8,60})',
+    r'\b([A-ZÁÉÍÓÚÑ]{2,}(?:\s+[A-ZÁÉÍÓÚÑ]{2,}){2,4})\b',
+    r'\b([a-záéíóúñ]{2,}(?:\s+[a-záéíóúñ]{2,}){2,4})\b',
+    r'\b([A-ZÁÉÍÓÚÑ]{3,20}\s+[A-ZÁÉÍÓÚÑ]{3,20})\b',
+    r'\b([a-záéíóúñ]{3,20}\s+[a-záéíóúñ]{3,20})\b',
+    r'\b([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+(?:\s+[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+){1,4})\b',
+    r'\b([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+(?:\s+[A-ZÁÉÍÓÚÑ]{2,})+(?:\s+[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+)*)\b',
+    r'\b([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ\s]{15,45})\s+(?:compareció|declaró|manifestó|expuso|asistió|no\s+compareció)',
+    r'\b([a-záéíóúñ][a-záéíóúñ\s]{15,45})\s+(?:compareció|declaró|manifestó|expuso|asistió|no\s+compareció)',
+    r'(?:El\s+señor|La\s+señora|El\s+imputado|La\s+víctima)\s+([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ\s]{8,40})\s+(?:identificado|portador|compareció|declaró)',
+    r'(?:el\s+señor|la\s+señora|el\s+imputado|la\s+víctima)\s+([a-záéíóúñ][a-záéíóúñ\s]{8,40})\s+(?:identificado|portador|compareció|declaró)',
+)]
+
+ENTRADAS = {
+    "MAYÚSCULAS sin coma": lambda n: "PALABRA " * n,
+    "MAYÚSCULAS y coma final": lambda n: "PALABRA " * n + ", X",
+    "minúsculas sin coma": lambda n: "palabra " * n,
+    "espacios repetidos": lambda n: "Fiscal " + " " * (8 * n) + "A",
+    "roles seguidos": lambda n: "señor " * n,
+}
+
+
+def patrones_anteriores(texto: str):
+    return [coincidencia for patron in PATRONES_ANTERIORES for coincidencia in patron.findall(texto)]
+
+
+def detector(texto: str):
+    return list(buscar_nombres(texto))
+
+
+def mejor_tiempo(funcion, texto: str) -> float:
+    """Mejor tiempo (ms) de REPETICIONES ejecuciones."""
+    mejor = float("inf")
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        funcion(texto)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000
+
+
+def main():
+    """Ejecuta el benchmark e imprime los tiempos por tamaño."""
+    print("⏱️  BENCHMARK: NOMBRES CON ENTRADAS ADVERSARIAS")
+    print("=" * 60)
+    for nombre, generar in ENTRADAS.items():
+        print(f"{nombre}:")
+        for n in TAMANOS:
+            texto = generar(n)
+            nuevo = mejor_tiempo(detector, texto)
+            linea = f"  {n:5d} palabras ({len(texto):6d} car.): detector {nuevo:8.2f} ms"
+            if n <= TAMANO_MAXIMO_ANTERIOR:
+                anterior = mejor_tiempo(patrones_anteriores, texto)
+                linea += f" | patrones anteriores {anterior:9.2f} ms"
+            print(linea)
+
+
+if __name__ == "__main__":
+    main()
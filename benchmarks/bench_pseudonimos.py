@@ -0,0 +1,133 @@
+"""
+BENCHMARK - NÚMEROS FICTICIOS
+=============================
+Compara la generación de radicados, cédulas y números profesionales
+ficticios dígito por dígito con ``random.randint`` y reintentos (como se
+hacía antes) con el generador con clave de sesión del anonimizador, sobre
+cientos de identificadores. También compara la asignación de nombres
+ficticios filtrando la lista de nombres en cada persona (antes) con el
+conjunto barajado de cada ``ContextoAnonimizacion``.
+
+Uso:
+    python benchmarks/bench_pseudonimos.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from utils.anonimizador import AnonimizadorDatos
+
+CANTIDADES = (200, 1000)
+REPETICIONES = 10
+
+
+def generar_identificadores(n: int) -> dict:
+    """``n`` radicados, cédulas con prefijo, cédulas con puntos y números profesionales."""
+    aleatorio = random.Random(2025)
+    return {
+        "radicados": [
+            f"05001-60-00000-{aleatorio.randint(2015, 2025)}-{aleatorio.randint(0, 99999):05d}-00"
+            for _ in range(n)
+        ],
+        "cédulas C.C.": [
+            f"C.C. {aleatorio.randint(1, 99)}.{aleatorio.randint(0, 999):03d}.{aleatorio.randint(0, 999):03d}"
+            for _ in range(n)
+        ],
+        "cédulas sin prefijo": [
+            f"{aleatorio.randint(1, 9)}.{aleatorio.randint(0, 999):03d}.{aleatorio.randint(0, 999):03d}.{aleatorio.randint(0, 999):03d}"
+            for _ in range(n)
+        ],
+        "profesionales": [str(aleatorio.randint(1000, 99999999)) for _ in range(n)],
+    }
+
+
+# --- Generación anterior (random.randint dígito por dígito) ---------------
+
+def _digitos_distintos(parte: str) -> str:
+    nueva_parte = ''.join([str(random.randint(0, 9)) for _ in range(len(parte))])
+    while nueva_parte == parte:
+        nueva_parte = ''.join([str(random.randint(0, 9)) for _ in range(len(parte))])
+    return nueva_parte
+
+
+def radicado_anterior(radicado: str) -> str:
+    return '-'.join(
+        _digitos_distintos(parte) if parte.isdigit() else parte for parte in radicado.split('-')
+    )
+
+
+def cedula_anterior(cedula: str) -> str:
+    prefijo, _, numero = cedula.rpartition(' ')
+    nuevo = '.'.join(_digitos_distintos(parte) for parte in numero.split('.'))
+    return f"{prefijo} {nuevo}" if prefijo else nuevo
+
+
+def nombres_anteriores(nombres_ficticios: list, cantidad: int) -> list:
+    nombres_usados = []
+    for _ in range(cantidad):
+        disponibles = [n for n in nombres_ficticios if n not in nombres_usados]
+        nombres_usados.append(random.choice(disponibles))
+    return nombres_usados
+
+
+def nombres_con_contexto(anonimizador: AnonimizadorDatos, cantidad: int) -> list:
+    contexto = anonimizador.nuevo_contexto()
+    return [contexto.tomar_nombre() for _ in range(cantidad)]
+
+
+ANTERIORES = {
+    "radicados": radicado_anterior,
+    "cédulas C.C.": cedula_anterior,
+    "cédulas sin prefijo": cedula_anterior,
+    "profesionales": _digitos_distintos,
+}
+
+
+def mejor_tiempo(funcion, valores) -> float:
+    """Mejor tiempo (ms) de REPETICIONES pasadas sobre todos los valores."""
+    mejor = float("inf")
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        for valor in valores:
+            funcion(valor)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000
+
+
+def main():
+    """Ejecuta el benchmark e imprime la comparación."""
+    anonimizador = AnonimizadorDatos()
+    nuevos = {
+        "radicados": anonimizador._generar_radicado_ficticio,
+        "cédulas C.C.": anonimizador._generar_cedula_ficticia,
+        "cédulas sin prefijo": anonimizador._generar_cedula_ficticia,
+        "profesionales": anonimizador._generar_numero_profesional,
+    }
+
+    print("⏱️  BENCHMARK: NÚMEROS FICTICIOS")
+    print("=" * 60)
+    for n in CANTIDADES:
+        print(f"{n} identificadores de cada tipo:")
+        for tipo, valores in generar_identificadores(n).items():
+            anterior = mejor_tiempo(ANTERIORES[tipo], valores)
+            nuevo = mejor_tiempo(nuevos[tipo], valores)
+            print(f"  {tipo:20s} randint {anterior:7.2f} ms | con clave {nuevo:7.2f} ms "
+                  f"({anterior / nuevo:.1f}x)")
+
+    # Nombres: una solicitud con N personas (hasta agotar la lista)
+    print("Nombres ficticios por solicitud (100 solicitudes):")
+    for personas in (10, len(anonimizador.nombres_ficticios)):
+        solicitudes = range(100)
+        anterior = mejor_tiempo(lambda _: nombres_anteriores(anonimizador.nombres_ficticios, personas), solicitudes)
+        nuevo = mejor_tiempo(lambda _: nombres_con_contexto(anonimizador, personas), solicitudes)
+        print(f"  {personas:3d} personas           filtrar {anterior:7.2f} ms | contexto  {nuevo:7.2f} ms "
+              f"({anterior / nuevo:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
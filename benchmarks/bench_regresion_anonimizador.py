@@ -0,0 +1,149 @@
+"""
+BENCHMARK - REGRESIONES DEL ANONIMIZADOR
+========================================
+Mide cada etapa ``_anonimizar_*`` y ``anonimizar_texto`` completo sobre un
+texto corto, uno mediano y un dictado de 20 páginas (sintéticos, sin red),
+y compara los tiempos con una línea base guardada en JSON. Termina con
+código 1 si alguna etapa tarda más que la línea base más el umbral.
+
+La línea base depende de la máquina: se crea en la primera ejecución (o
+con ``--guardar``) y no se comparte entre equipos.
+
+Uso:
+    python benchmarks/bench_regresion_anonimizador.py            # comparar
+    python benchmarks/bench_regresion_anonimizador.py --guardar  # nueva línea base
+    python benchmarks/bench_regresion_anonimizador.py --umbral 0.5
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from benchmarks.bench_anonimizador import generar_dictado
+from utils.anonimizador import AnonimizadorDatos
+
+LINEA_BASE = Path(__file__).parent / "linea_base_anonimizador.json"
+UMBRAL = 0.25  # 25 % más lento que la línea base
+# Por debajo de esta diferencia (ms) el ruido de la medición domina
+DIFERENCIA_MINIMA_MS = 0.2
+REPETICIONES = 7
+
+# Páginas de cada texto (unos 3000 caracteres por página)
+TEXTOS = {"corto": 0.1, "mediano": 2, "20 páginas": 20}
+
+ETAPAS = {
+    "cedulas": "_anonimizar_cedulas",
+    "celulares": "_anonimizar_celulares",
+    "tarjetas": "_anonimizar_tarjetas_credito",
+    "correos": "_anonimizar_correos",
+    "direcciones": "_anonimizar_direcciones",
+    "profesionales": "_anonimizar_numeros_profesionales",
+    "radicados": "_anonimizar_radicados",
+    "nombres": "_anonimizar_nombres",
+    "juzgados": "_anonimizar_juzgados",
+    "completo": "anonimizar_texto",
+}
+
+
+def mejor_tiempo(funcion, texto: str) -> float:
+    """Mejor tiempo (ms) de REPETICIONES llamadas a ``funcion(texto)``."""
+    mejor = float("inf")
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        funcion(texto)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000
+
+
+def medir() -> dict:
+    """Tiempos (ms) por texto y etapa: ``{texto: {etapa: ms}}``."""
+    anonimizador = AnonimizadorDatos()
+    anonimizador.anonimizar_texto(generar_dictado(1))  # carga el diccionario de nombres
+    resultados = {}
+    for nombre_texto, paginas in TEXTOS.items():
+        texto = generar_dictado(paginas)
+        resultados[nombre_texto] = {
+            etapa: round(mejor_tiempo(getattr(anonimizador, metodo), texto), 4)
+            for etapa, metodo in ETAPAS.items()
+        }
+    return resultados
+
+
+def comparar(resultados: dict, linea_base: dict, umbral: float) -> list:
+    """Etapas más lentas que la línea base: ``[(texto, etapa, base_ms, actual_ms)]``."""
+    regresiones = []
+    for nombre_texto, etapas in resultados.items():
+        for etapa, actual in etapas.items():
+            base = linea_base.get(nombre_texto, {}).get(etapa)
+            if base is None:
+                continue
+            if actual > base * (1 + umbral) and actual - base > DIFERENCIA_MINIMA_MS:
+                regresiones.append((nombre_texto, etapa, base, actual))
+    return regresiones
+
+
+def guardar_linea_base(resultados: dict, ruta: Path):
+    datos = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2)
+
+
+def imprimir(resultados: dict, linea_base: dict):
+    for nombre_texto, etapas in resultados.items():
+        print(f"{nombre_texto}:")
+        for etapa, actual in etapas.items():
+            base = linea_base.get(nombre_texto, {}).get(etapa)
+            linea = f"  {etapa:14s} {actual:9.3f} ms"
+            if base:
+                linea += f" | base {base:9.3f} ms ({(actual / base - 1) * 100:+6.1f} %)"
+            print(linea)
+
+
+def main() -> int:
+    """Mide, compara con la línea base y devuelve el código de salida."""
+    argumentos = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    argumentos.add_argument("--guardar", action="store_true", help="Guardar los tiempos como nueva línea base")
+    argumentos.add_argument("--umbral", type=float, default=UMBRAL, help="Fracción de tolerancia (0.25 = 25 %%)")
+    argumentos.add_argument("--linea-base", type=Path, default=LINEA_BASE, help="Archivo JSON de la línea base")
+    opciones = argumentos.parse_args()
+
+    print("⏱️  BENCHMARK: REGRESIONES DEL ANONIMIZADOR")
+    print("=" * 60)
+    resultados = medir()
+
+    if opciones.guardar or not opciones.linea_base.exists():
+        imprimir(resultados, {})
+        guardar_linea_base(resultados, opciones.linea_base)
+        print(f"💾 Línea base guardada en {opciones.linea_base}")
+        return 0
+
+    with open(opciones.linea_base, encoding="utf-8") as f:
+        datos = json.load(f)
+    if datos.get("plataforma") != platform.platform():
+        print(f"⚠️ Advertencia: La línea base se midió en otra máquina ({datos.get('plataforma')})")
+    imprimir(resultados, datos["resultados"])
+
+    regresiones = comparar(resultados, datos["resultados"], opciones.umbral)
+    if not regresiones:
+        print(f"✅ Ninguna etapa supera la línea base en más de {opciones.umbral:.0%}")
+        return 0
+    print(f"❌ {len(regresiones)} etapa(s) más lentas que la línea base + {opciones.umbral:.0%}:")
+    for nombre_texto, etapa, base, actual in regresiones:
+        print(f"  {nombre_texto} / {etapa}: {base:.3f} ms -> {actual:.3f} ms")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
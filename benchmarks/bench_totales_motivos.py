@@ -0,0 +1,79 @@
+"""
+BENCHMARK - TOTALES DE MOTIVOS
+==============================
+Compara el conteo de motivos celda por celda (como hacía _calcular_totales)
+con ``contar_motivos`` sobre las máscaras de 8 bits de los registros (en
+lista o ya empaquetadas en bytes), para un año de audiencias y para un
+archivo grande.
+
+Uso:
+    python benchmarks/bench_totales_motivos.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from models.audiencia import ETIQUETAS_MOTIVOS, contar_motivos, mascara_motivos
+
+TAMANOS = (("un año", 5_000), ("archivo grande", 50_000))
+REPETICIONES = 20
+
+
+def generar_motivos(n: int) -> list:
+    """Columnas de motivos de ``n`` filas: un tercio no realizadas con 1 o 2 motivos."""
+    aleatorio = random.Random(2025)
+    filas = []
+    for _ in range(n):
+        motivos = [None] * 8
+        if aleatorio.random() < 1 / 3:
+            for i in aleatorio.sample(range(8), aleatorio.choice((1, 2))):
+                motivos[i] = ETIQUETAS_MOTIVOS[i]
+        filas.append(tuple(motivos))
+    return filas
+
+
+def contar_celdas(filas) -> list:
+    totales = [0] * 8
+    for motivos in filas:
+        for i in range(8):
+            if motivos[i]:
+                totales[i] += 1
+    return totales
+
+
+def mejor_tiempo(funcion, datos) -> float:
+    """Mejor tiempo (µs) de REPETICIONES ejecuciones."""
+    mejor = float("inf")
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        funcion(datos)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1e6
+
+
+def main():
+    """Ejecuta el benchmark e imprime la comparación."""
+    print("⏱️  BENCHMARK: TOTALES DE MOTIVOS")
+    print("=" * 60)
+
+    for nombre, n in TAMANOS:
+        filas = generar_motivos(n)
+        mascaras = [mascara_motivos(motivos) for motivos in filas]
+        assert contar_celdas(filas) == contar_motivos(mascaras)
+
+        celdas = mejor_tiempo(contar_celdas, filas)
+        bits = mejor_tiempo(contar_motivos, mascaras)
+        columna = mejor_tiempo(contar_motivos, bytes(mascaras))
+        print(f"{nombre} ({n:,} registros):")
+        print(f"  celda por celda:           {celdas:9.0f} µs")
+        print(f"  lista de máscaras:         {bits:9.0f} µs ({celdas / bits:.0f}x)")
+        print(f"  máscaras en bytes:         {columna:9.0f} µs ({celdas / columna:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -64,6 +64,7 @@ from pathlib import Path
 project_dir = Path(os.getcwd())
 templates_dir = project_dir / "templates"
 config_dir = project_dir / "config"
+datos_dir = project_dir / "utils" / "datos"
 
 block_cipher = None
 
@@ -76,6 +77,9 @@ a = Analysis(
         (str(templates_dir / "plantilla_audiencias.xlsx"), "templates"),
         # Incluir template de configuración
         (str(config_dir / "config_template.py"), "config"),
+        # Incluir diccionario de nombres y apellidos del anonimizador
+        (str(datos_dir / "nombres.txt"), "utils/datos"),
+        (str(datos_dir / "apellidos.txt"), "utils/datos"),
     ],
     hiddenimports=[
         'flet',
@@ -16,6 +16,11 @@ ANONYMIZE_IDS = True  # Anonimizar números de cédula/documento
 ANONYMIZE_CASE_NUMBERS = True  # Anonimizar números de radicado
 ANONYMIZE_COURTS = False  # Mantener nombres de juzgados (menos sensible)
 
+# Almacenamiento de registros
+# - "excel": cada guardado reescribe el .xlsx
+# - "sqlite": los registros se guardan en una base local y el .xlsx se genera al descargar
+STORAGE_ENGINE = "excel"
+
 # Modelos disponibles:
 # - "gpt-3.5-turbo": Más económico (~$0.002/audiencia)  
 # - "gpt-4o-mini": Más preciso (~$0.0008/audiencia) - RECOMENDADO
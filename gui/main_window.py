@@ -3,9 +3,10 @@ import traceback
 from typing import Optional
 from datetime import datetime
 
-from models.audiencia import Audiencia
+from models.audiencia import ETIQUETAS_MOTIVOS, Audiencia, parsear_fecha
 from models.excel_manager import ExcelManager
 from utils.validators import validar_todos_los_datos
+from utils.ejecutor_io import EjecutorIO
 from gestor_archivos import (
     crear_copia_plantilla,
     listar_archivos_creados,
@@ -31,6 +32,12 @@ from gui.constants import (
 )
 from gui.ia_config_dialog import mostrar_dialogo_configuracion_ia
 
+# Motor de almacenamiento de los registros
+try:
+    from config.config import STORAGE_ENGINE
+except ImportError:
+    STORAGE_ENGINE = "excel"
+
 
 class DialogoCrearArchivo:
     """Diálogo para crear un nuevo archivo con Flet."""
@@ -243,53 +250,67 @@ class VentanaSeleccionArchivo:
 
 
 class VentanaSeleccionRegistro:
-    """Ventana para seleccionar un registro para editar con Flet."""
+    """Ventana para seleccionar un registro para editar con Flet.
+
+    Solo se construyen los controles de la página visible (``TAMANO_PAGINA``
+    registros) dentro de un ListView perezoso; el filtro reduce la lista a
+    medida que se escribe y, si el texto nuevo contiene al anterior, busca
+    solo entre los resultados previos.
+    """
+
+    TAMANO_PAGINA = 50
 
     def __init__(self, page: ft.Page, registros, callback):
         self.page = page
         self.registros = registros
         self.callback = callback
         self.dialog = None
+        self.filtrados = registros
+        self._indices_filtrados = None
+        self.texto_filtro = ""
+        self.pagina = 0
+        self._textos_busqueda = None
         self._crear_dialogo()
     
     def _crear_dialogo(self):
         """Crea el diálogo de selección de registro con colores dinámicos."""
         colors = get_theme_colors()
         
-        # Lista de registros como botones
-        lista_controles = []
+        # Filtro incremental
+        self.campo_filtro = ft.TextField(
+            hint_text="Filtrar por radicado, tipo, fecha o juzgado",
+            prefix_icon=ft.Icons.SEARCH,
+            border_radius=10,
+            filled=True,
+            bgcolor=colors["surface_primary"],
+            border_color=colors["surface_border"],
+            focused_border_color=colors["primary"],
+            text_style=ft.TextStyle(size=13, color=colors["text_primary"]),
+            content_padding=ft.Padding(10, 8, 10, 8),
+            on_change=self._on_filtro_change,
+            autofocus=True,
+        )
         
-        for i, (fila_num, datos) in enumerate(self.registros):
-            # Información del registro
-            info_text = f"#{datos[0] or i+1} - {datos[1]} - {datos[2]} - {datos[3]} - {datos[4]}"
-            
-            btn_registro = ft.Container(
-                content=ft.Row(
-                    controls=[
-                        ft.Icon(ft.Icons.EDIT_DOCUMENT, size=20, color=colors["success"]),
-                        ft.Text(info_text, size=13, color=colors["text_primary"], expand=True),
-                        ft.ElevatedButton(
-                            text="Editar",
-                            on_click=lambda e, fn=fila_num, d=datos: self._on_editar_item(fn, d),
-                            style=ft.ButtonStyle(
-                                bgcolor=colors["success"],
-                                color=colors["text_on_primary"],
-                                shape=ft.RoundedRectangleBorder(radius=6),
-                                padding=ft.Padding(12, 8, 12, 8),
-                                text_style=ft.TextStyle(size=12),
-                            ),
-                        ),
-                    ],
-                    spacing=10,
-                    alignment=ft.MainAxisAlignment.START,
-                    vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                ),
-                bgcolor=colors["surface_tertiary"],
-                border=ft.border.all(1, colors["surface_border"]),
-                border_radius=8,
-                padding=ft.Padding(15, 12, 15, 12),
-            )
-            lista_controles.append(btn_registro)
+        # Lista perezosa: solo contiene la página actual
+        self.lista = ft.ListView(
+            spacing=8,
+            height=400,
+            first_item_prototype=True,
+        )
+        
+        # Paginación
+        self.texto_resumen = ft.Text(size=14, color=colors["text_secondary"])
+        self.texto_pagina = ft.Text(size=13, color=colors["text_secondary"])
+        self.btn_anterior = ft.IconButton(
+            icon=ft.Icons.CHEVRON_LEFT,
+            tooltip="Página anterior",
+            on_click=lambda e: self._ir_a_pagina(self.pagina - 1),
+        )
+        self.btn_siguiente = ft.IconButton(
+            icon=ft.Icons.CHEVRON_RIGHT,
+            tooltip="Página siguiente",
+            on_click=lambda e: self._ir_a_pagina(self.pagina + 1),
+        )
         
         # Botón cancelar
         btn_cancelar = ft.TextButton(
@@ -301,20 +322,6 @@ class VentanaSeleccionRegistro:
             ),
         )
         
-        # Contenido scrollable
-        contenido_scroll = ft.Column(
-            controls=lista_controles,
-            spacing=8,
-            scroll=ft.ScrollMode.AUTO,
-        )
-        
-        # Contenedor con altura fija para scroll
-        contenedor_lista = ft.Container(
-            content=contenido_scroll,
-            height=min(400, len(self.registros) * 70 + 50),  # Altura dinámica
-            width=600,
-        )
-        
         # Diálogo principal
         self.dialog = ft.AlertDialog(
             modal=True,
@@ -322,13 +329,14 @@ class VentanaSeleccionRegistro:
             content=ft.Container(
                 content=ft.Column(
                     controls=[
-                        ft.Text(
-                            f"Seleccione uno de los {len(self.registros)} registros disponibles para editar:",
-                            size=14,
-                            color=colors["text_secondary"],
+                        self.texto_resumen,
+                        self.campo_filtro,
+                        ft.Container(height=5),
+                        ft.Container(content=self.lista, width=600),
+                        ft.Row(
+                            controls=[self.btn_anterior, self.texto_pagina, self.btn_siguiente],
+                            alignment=ft.MainAxisAlignment.CENTER,
                         ),
-                        ft.Container(height=15),
-                        contenedor_lista,
                     ],
                     tight=True,
                     spacing=5,
@@ -340,11 +348,112 @@ class VentanaSeleccionRegistro:
             bgcolor=colors["surface_card"],
         )
         
+        self._mostrar_pagina()
+        
         # Mostrar el diálogo
         self.page.overlay.append(self.dialog)
         self.dialog.open = True
         self.page.update()
     
+    def _crear_item(self, fila_num, datos, colors):
+        """Construye el control de un registro."""
+        numero = datos[0] or fila_num - ExcelManager.FILA_INICIO_DATOS + 1
+        info_text = f"#{numero} - {datos[1]} - {datos[2]} - {datos[3]} - {datos[4]}"
+        return ft.Container(
+            content=ft.Row(
+                controls=[
+                    ft.Icon(ft.Icons.EDIT_DOCUMENT, size=20, color=colors["success"]),
+                    ft.Text(info_text, size=13, color=colors["text_primary"], expand=True),
+                    ft.ElevatedButton(
+                        text="Editar",
+                        on_click=lambda e, fn=fila_num, d=datos: self._on_editar_item(fn, d),
+                        style=ft.ButtonStyle(
+                            bgcolor=colors["success"],
+                            color=colors["text_on_primary"],
+                            shape=ft.RoundedRectangleBorder(radius=6),
+                            padding=ft.Padding(12, 8, 12, 8),
+                            text_style=ft.TextStyle(size=12),
+                        ),
+                    ),
+                ],
+                spacing=10,
+                alignment=ft.MainAxisAlignment.START,
+                vertical_alignment=ft.CrossAxisAlignment.CENTER,
+            ),
+            bgcolor=colors["surface_tertiary"],
+            border=ft.border.all(1, colors["surface_border"]),
+            border_radius=8,
+            padding=ft.Padding(15, 12, 15, 12),
+        )
+    
+    def _num_paginas(self) -> int:
+        return max(1, -(-len(self.filtrados) // self.TAMANO_PAGINA))
+    
+    def _mostrar_pagina(self):
+        """Reconstruye solo los controles de la página actual."""
+        colors = get_theme_colors()
+        inicio = self.pagina * self.TAMANO_PAGINA
+        visibles = self.filtrados[inicio:inicio + self.TAMANO_PAGINA]
+        self.lista.controls = [
+            self._crear_item(fila_num, datos, colors) for fila_num, datos in visibles
+        ]
+        
+        total = len(self.registros)
+        if self.texto_filtro:
+            self.texto_resumen.value = (
+                f"{len(self.filtrados)} de {total} registros coinciden con el filtro:"
+            )
+        else:
+            self.texto_resumen.value = (
+                f"Seleccione uno de los {total} registros disponibles para editar:"
+            )
+        self.texto_pagina.value = f"Página {self.pagina + 1} de {self._num_paginas()}"
+        self.btn_anterior.disabled = self.pagina == 0
+        self.btn_siguiente.disabled = self.pagina >= self._num_paginas() - 1
+    
+    def _ir_a_pagina(self, pagina: int):
+        """Cambia de página y actualiza solo el diálogo."""
+        self.pagina = min(max(pagina, 0), self._num_paginas() - 1)
+        self._mostrar_pagina()
+        self.dialog.update()
+    
+    def _texto_busqueda(self, indice: int) -> str:
+        """Texto en minúsculas sobre el que se filtra, calculado una sola vez."""
+        if self._textos_busqueda is None:
+            self._textos_busqueda = [None] * len(self.registros)
+        texto = self._textos_busqueda[indice]
+        if texto is None:
+            _, datos = self.registros[indice]
+            texto = " ".join(str(valor) for valor in datos[1:6] if valor).lower()
+            self._textos_busqueda[indice] = texto
+        return texto
+    
+    def _on_filtro_change(self, e):
+        """Filtra los registros a medida que se escribe."""
+        texto = (self.campo_filtro.value or "").strip().lower()
+        if texto == self.texto_filtro:
+            return
+        
+        if not texto:
+            self._indices_filtrados = None
+            self.filtrados = self.registros
+        else:
+            # Si el texto nuevo contiene al anterior, basta con buscar en los
+            # resultados previos
+            if self._indices_filtrados is not None and self.texto_filtro in texto:
+                candidatos = self._indices_filtrados
+            else:
+                candidatos = range(len(self.registros))
+            self._indices_filtrados = [
+                i for i in candidatos if texto in self._texto_busqueda(i)
+            ]
+            self.filtrados = [self.registros[i] for i in self._indices_filtrados]
+        
+        self.texto_filtro = texto
+        self.pagina = 0
+        self._mostrar_pagina()
+        self.dialog.update()
+    
     def _on_editar_item(self, fila_num, datos_completos):
         """Maneja la selección de un registro para editar."""
         self.dialog.open = False
@@ -436,6 +545,15 @@ class VentanaPrincipal:
         self.btn_guardar = None
         self.btn_actualizar = None
         self.btn_cancelar_edicion = None
+        self.entrada_buscar_radicado = None
+        self.indicador_io = None
+
+        # Cola de E/S por libro: las lecturas y escrituras del Excel no
+        # bloquean la interfaz y sus resultados vuelven a la página
+        self.ejecutor_io = EjecutorIO(
+            despachar=self.page.run_thread,
+            al_cambiar_estado=self._on_estado_io,
+        )
 
         # Lista de tipos de audiencia
         self.tipos_audiencia = [
@@ -502,10 +620,59 @@ class VentanaPrincipal:
         
         # Configurar atajos de teclado
         self.page.on_keyboard_event = self._on_keyboard_event
+
+        # Interceptar el cierre para escribir los cambios pendientes del Excel
+        try:
+            if hasattr(self.page, 'window'):
+                self.page.window.prevent_close = True
+                self.page.window.on_event = self._on_evento_ventana
+        except:
+            pass
         
         # Desactivar auto-scroll para evitar movimientos no deseados
         self.page.auto_scroll = False
 
+    def _on_evento_ventana(self, e):
+        """Guarda los cambios pendientes antes de cerrar la ventana."""
+        if e.type != ft.WindowEventType.CLOSE:
+            return
+
+        if not self.excel_manager:
+            self.page.window.destroy()
+            return
+
+        manager = self.excel_manager
+        # Sin libro activo mientras se cierra: ningún guardado o edición se
+        # puede encolar detrás del cierre
+        self.excel_manager = None
+
+        def al_cerrar(cerrado):
+            if not cerrado:
+                # La sesión sigue abierta con sus cambios: se puede reintentar
+                if self.excel_manager is None:
+                    self.excel_manager = manager
+                self._mostrar_mensaje(
+                    f"No se pudieron guardar los cambios: {manager.ultimo_error}. "
+                    "Cierre el archivo de Excel si está abierto e intente de nuevo."
+                )
+                return
+            self.page.window.destroy()
+
+        # Se encola detrás de los guardados pendientes del libro
+        self._en_segundo_plano(manager.cerrar, al_cerrar)
+
+    def _en_segundo_plano(self, operacion, al_terminar=None, al_fallar=None):
+        """Encola una operación sobre el libro actual en su cola de E/S."""
+        return self.ejecutor_io.enviar(
+            self.archivo_excel, operacion, al_terminar, al_fallar
+        )
+
+    def _on_estado_io(self, ocupado: bool):
+        """Muestra u oculta el indicador de operaciones de archivo."""
+        if self.indicador_io:
+            self.indicador_io.visible = ocupado
+            self.page.update()
+
     def _toggle_theme(self, e):
         """Alternar entre tema claro y oscuro"""
         # Cambiar el tema
@@ -574,6 +741,16 @@ class VentanaPrincipal:
             color=colors["text_primary"]
         )
 
+        # Indicador de operaciones de archivo en curso
+        self.indicador_io = ft.ProgressRing(
+            width=14,
+            height=14,
+            stroke_width=2,
+            color=colors["primary"],
+            visible=self.ejecutor_io.ocupado,
+            tooltip="Guardando...",
+        )
+
         self.archivo_actual_text = ft.Text(
             "Ningún archivo seleccionado",
             size=14,
@@ -707,6 +884,7 @@ class VentanaPrincipal:
                             controls=[
                                 ft.Icon(ft.Icons.ANALYTICS_OUTLINED, size=18, color=colors["primary"]),
                                 self.contador_registros,
+                                self.indicador_io,
                             ],
                             spacing=8,
                             alignment=ft.MainAxisAlignment.CENTER,
@@ -1171,10 +1349,7 @@ class VentanaPrincipal:
         """Campo de motivos con diseño mejorado y checkboxes optimizados con colores dinámicos."""
         colors = get_theme_colors()
         
-        motivos_labels = [
-            "Juez", "Fiscalía", "Usuario", "INPEC",
-            "Víctima", "ICBF", "Defensor Confianza", "Defensor Público",
-        ]
+        motivos_labels = ETIQUETAS_MOTIVOS
 
         self.checkboxes_motivos = []
         checkboxes_row1 = []
@@ -1450,6 +1625,23 @@ class VentanaPrincipal:
             visible=False,
         )
         
+        # Búsqueda por radicado para ir directamente a un registro
+        self.entrada_buscar_radicado = ft.TextField(
+            hint_text="Buscar radicado",
+            width=220,
+            height=36,
+            border_radius=8,
+            filled=True,
+            bgcolor=colors["surface_primary"],
+            border_color=colors["surface_border"],
+            focused_border_color=colors["primary"],
+            prefix_icon=ft.Icons.SEARCH,
+            text_style=ft.TextStyle(size=13, color=colors["text_primary"]),
+            content_padding=ft.Padding(8, 4, 8, 4),
+            tooltip="Abrir un registro por su radicado (Ctrl+F, Enter)",
+            on_submit=self._on_buscar_radicado,
+        )
+        
         # Separador visual
         separador = ft.Container(
             width=1,
@@ -1511,6 +1703,8 @@ class VentanaPrincipal:
                     # Espaciador para empujar los botones de peligro hacia la derecha
                     ft.Container(expand=True),
                     
+                    self.entrada_buscar_radicado,
+                    
                     # Grupo de peligro: Acciones destructivas
                     ft.Row(
                         controls=[
@@ -1679,10 +1873,10 @@ class VentanaPrincipal:
             
             # Si tenemos una fecha completa (8 dígitos), validar y sincronizar
             if len(valor_limpio) == 8:
-                try:
-                    fecha_obj = datetime.strptime(fecha_formateada, "%d/%m/%Y")
+                fecha_obj = parsear_fecha(fecha_formateada)
+                if fecha_obj is not None:
                     self._actualizar_campos_compatibilidad(fecha_obj)
-                except ValueError:
+                else:
                     # Fecha inválida, limpiar campos de compatibilidad
                     self._limpiar_campos_compatibilidad()
 
@@ -1762,6 +1956,10 @@ class VentanaPrincipal:
         """Edita un registro."""
         self.seleccionar_registro_para_editar()
 
+    def _on_buscar_radicado(self, e):
+        """Maneja la búsqueda de un registro por radicado."""
+        self.buscar_registro_por_radicado()
+
     def _on_eliminar_archivo(self, e):
         """Elimina un archivo."""
         self.eliminar_archivo_trabajo()
@@ -1968,6 +2166,13 @@ class VentanaPrincipal:
                 e.page.update()
                 return
                 
+        # Ctrl+F - Buscar registro por radicado
+        elif ctrl_pressed and key == "f":
+            self.entrada_buscar_radicado.focus()
+            self._mostrar_mensaje_atajo("🔎 Buscar registro por radicado (Ctrl+F)")
+            e.page.update()
+            return
+
         # Ctrl+D - Eliminar archivo
         elif ctrl_pressed and key == "d":
             self._on_eliminar_archivo(None)
@@ -2088,6 +2293,7 @@ class VentanaPrincipal:
                     [
                         ("Ctrl+L", "Limpiar formulario"),
                         ("Escape", "Cancelar edición"),
+                        ("Ctrl+F", "Buscar registro por radicado"),
                         ("Ctrl+D", "Eliminar archivo"),
                         ("Ctrl+Shift+S", "Descargar archivo"),
                     ],
@@ -2540,24 +2746,36 @@ class VentanaPrincipal:
             print("Creando objeto Audiencia...")
             audiencia = Audiencia.from_form_data(datos)
             print(f"Audiencia creada: {audiencia}")
-            
-            print("Guardando en Excel...")
-            self.excel_manager.guardar_audiencia(audiencia)
-            print("Guardado exitoso. Reordenando...")
-            
-            self.excel_manager.reordenar_y_guardar()
-            print("Reordenamiento exitoso.")
+        except Exception as e:
+            self._mostrar_mensaje(f"Error al guardar: {e}")
+            return
 
+        # Advertir antes de escribir un radicado que ya existe
+        self._verificar_duplicados(audiencia, lambda: self._guardar_audiencia(audiencia))
+
+    def _guardar_audiencia(self, audiencia: Audiencia):
+        """Encola el guardado de una audiencia nueva y reinicia el formulario al terminar."""
+        manager = self.excel_manager
+        if not manager:
+            self._mostrar_mensaje("Primero debe seleccionar un archivo")
+            return
+
+        def al_terminar(_):
+            print("Guardado y reordenamiento exitosos.")
             self._mostrar_mensaje("Registro guardado correctamente")
-            self._inicializar()  # Esto ya incluye limpiar_campos() y establecer valores por defecto
-            self.actualizar_contador_registros()
+            self._inicializar()  # Incluye limpiar_campos(), valores por defecto y el contador
             print("=== DEBUG: guardar_datos completado exitosamente ===")
 
-        except Exception as e:
+        def al_fallar(e):
             print(f"ERROR en guardar_datos: {e}")
-            traceback.print_exc()
+            traceback.print_exception(type(e), e, e.__traceback__)
             self._mostrar_mensaje(f"Error al guardar: {e}")
 
+        print("Guardando y reordenando en Excel...")
+        self._en_segundo_plano(
+            lambda: manager.guardar_y_reordenar(audiencia), al_terminar, al_fallar
+        )
+
     def actualizar_registro(self):
         """Actualiza un registro existente."""
         if not self.fila_editando:
@@ -2576,15 +2794,103 @@ class VentanaPrincipal:
 
         try:
             audiencia = Audiencia.from_form_data(datos)
-            self.excel_manager.actualizar_audiencia(self.fila_editando, audiencia)
-            self.excel_manager.reordenar_y_guardar()
+        except Exception as e:
+            self._mostrar_mensaje(f"Error al actualizar: {e}")
+            return
+
+        fila = self.fila_editando
+        self._verificar_duplicados(
+            audiencia, lambda: self._actualizar_audiencia(fila, audiencia), fila
+        )
+
+    def _actualizar_audiencia(self, fila: int, audiencia: Audiencia):
+        """Encola la escritura de los cambios del registro en edición."""
+        manager = self.excel_manager
+        if not manager:
+            self._mostrar_mensaje("No hay archivo seleccionado")
+            return
 
+        def al_terminar(_):
             self._mostrar_mensaje("Registro actualizado correctamente")
             self.desactivar_modo_edicion()
             self.actualizar_contador_registros()
 
-        except Exception as e:
-            self._mostrar_mensaje(f"Error al actualizar: {e}")
+        self._en_segundo_plano(
+            lambda: manager.actualizar_y_reordenar(fila, audiencia),
+            al_terminar,
+            lambda e: self._mostrar_mensaje(f"Error al actualizar: {e}"),
+        )
+
+    def _verificar_duplicados(self, audiencia: Audiencia, continuar, fila_propia=None):
+        """Ejecuta ``continuar`` o, si el radicado ya está en otro registro, lo confirma antes."""
+        manager = self.excel_manager
+
+        def al_buscar(filas):
+            filas = [fila for fila in filas if fila != fila_propia]
+            if not filas:
+                continuar()
+                return
+
+            numeros = ", ".join(
+                str(fila - ExcelManager.FILA_INICIO_DATOS + 1) for fila in filas
+            )
+            DialogoConfirmacion.confirmar(
+                self.page,
+                "Radicado duplicado",
+                f"El radicado {audiencia.radicado} ya existe en el registro N° {numeros}. "
+                f"¿Desea guardarlo de todos modos?",
+                continuar,
+            )
+
+        def al_fallar(e):
+            print(f"No se pudo verificar duplicados: {e}")
+            continuar()
+
+        self._en_segundo_plano(
+            lambda: manager.buscar_radicado(audiencia.radicado), al_buscar, al_fallar
+        )
+
+    def buscar_registro_por_radicado(self):
+        """Abre para edición el registro con el radicado buscado."""
+        if not self.archivo_excel or not self.excel_manager:
+            self._mostrar_mensaje("Primero debe seleccionar un archivo")
+            return
+
+        radicado = (self.entrada_buscar_radicado.value or "").strip()
+        if not radicado:
+            self._mostrar_mensaje("Escriba el radicado que desea buscar")
+            return
+
+        manager = self.excel_manager
+
+        def buscar():
+            filas = manager.buscar_radicado(radicado)
+            datos = manager.leer_registro(filas[0]) if filas else None
+            return filas, datos
+
+        def al_buscar(resultado):
+            filas, datos = resultado
+            if not filas:
+                self._mostrar_mensaje(f"No hay registros con el radicado {radicado}")
+                return
+            if datos is None:
+                self._mostrar_mensaje(f"No se pudo leer el registro del radicado {radicado}")
+                return
+
+            self.fila_editando = filas[0]
+            self.cargar_datos_para_edicion(datos)
+            self.activar_modo_edicion()
+            if len(filas) > 1:
+                self._mostrar_mensaje(
+                    f"Hay {len(filas)} registros con el radicado {radicado}; "
+                    f"se abrió el primero"
+                )
+
+        self._en_segundo_plano(
+            buscar,
+            al_buscar,
+            lambda e: self._mostrar_mensaje(f"Error al buscar el radicado: {e}"),
+        )
 
     def cancelar_edicion(self):
         """Cancela la edición."""
@@ -2699,14 +3005,46 @@ class VentanaPrincipal:
         def callback_seleccionar(nombre_archivo):
             print(f"Callback seleccionar ejecutado con archivo: '{nombre_archivo}'")
             try:
-                self.archivo_excel = seleccionar_archivo(nombre_archivo)
-                self.excel_manager = ExcelManager(self.archivo_excel)
-                self.archivo_actual_text.value = nombre_archivo
-                self._mostrar_mensaje(f"Archivo seleccionado: {nombre_archivo}")
-                self.actualizar_contador_registros()
-                self.page.update()
+                ruta = seleccionar_archivo(nombre_archivo)
             except Exception as e:
                 self._mostrar_mensaje(f"Error al seleccionar archivo: {e}")
+                return
+
+            def abrir():
+                try:
+                    self.archivo_excel = ruta
+                    self.excel_manager = ExcelManager(
+                        self.archivo_excel, modo_sesion=True, motor=STORAGE_ENGINE
+                    )
+                    self.archivo_actual_text.value = nombre_archivo
+                    self._mostrar_mensaje(f"Archivo seleccionado: {nombre_archivo}")
+                    self.actualizar_contador_registros()
+                    self.page.update()
+                except Exception as e:
+                    self._mostrar_mensaje(f"Error al seleccionar archivo: {e}")
+
+            if not self.excel_manager:
+                abrir()
+                return
+
+            # Cerrar el archivo actual después de sus guardados pendientes
+            anterior, clave_anterior = self.excel_manager, self.archivo_excel
+            # Sin libro activo hasta abrir el nuevo (ver _on_evento_ventana)
+            self.excel_manager = None
+
+            def al_cerrar(cerrado):
+                if not cerrado:
+                    if self.excel_manager is None:
+                        self.excel_manager = anterior
+                    self._mostrar_mensaje(
+                        f"No se pudieron guardar los cambios del archivo actual: "
+                        f"{anterior.ultimo_error}"
+                    )
+                    return
+                self.ejecutor_io.liberar(clave_anterior)
+                abrir()
+
+            self.ejecutor_io.enviar(clave_anterior, anterior.cerrar, al_cerrar)
 
         print("Abriendo ventana de selección...")
         VentanaSeleccionArchivo(
@@ -2722,9 +3060,9 @@ class VentanaPrincipal:
             self._mostrar_mensaje("Primero debe seleccionar un archivo")
             return
 
-        try:
-            registros = self.excel_manager.leer_registros()
+        manager = self.excel_manager
 
+        def al_leer(registros):
             if not registros:
                 self._mostrar_mensaje("No hay registros para editar en el archivo.")
                 return
@@ -2736,8 +3074,11 @@ class VentanaPrincipal:
 
             VentanaSeleccionRegistro(self.page, registros, callback_editar)
 
-        except Exception as e:
-            self._mostrar_mensaje(f"Error al leer los registros: {e}")
+        self._en_segundo_plano(
+            lambda: list(manager.iterar_registros(como_tupla=True)),
+            al_leer,
+            lambda e: self._mostrar_mensaje(f"Error al leer los registros: {e}"),
+        )
 
     def cargar_datos_para_edicion(self, fila_datos):
         """Carga los datos de una fila en el formulario para editarlos."""
@@ -2761,11 +3102,9 @@ class VentanaPrincipal:
         if len(fila_datos) > 3 and fila_datos[3] and "/" in str(fila_datos[3]):
             fecha_str = str(fila_datos[3])
             self.entrada_fecha.value = fecha_str
-            try:
-                fecha_obj = datetime.strptime(fecha_str, "%d/%m/%Y")
+            fecha_obj = parsear_fecha(fecha_str)
+            if fecha_obj is not None:
                 self._actualizar_campos_compatibilidad(fecha_obj)
-            except ValueError:
-                pass
 
         # Hora
         if len(fila_datos) > 4 and fila_datos[4] and ":" in str(fila_datos[4]):
@@ -2817,21 +3156,67 @@ class VentanaPrincipal:
             self.page, "Eliminar Archivo", archivos, callback_seleccionar
         )
 
+    def _en_cola_de_archivo(self, ruta, operacion, al_terminar=None, al_fallar=None):
+        """Encola una operación en la cola del libro ``ruta``.
+
+        Todas las operaciones de un libro usan su ruta completa como clave,
+        así nunca hay dos hilos escribiendo el mismo archivo. Si no es el
+        libro actual, su cola se libera al terminar.
+        """
+        def liberar_si_no_es_actual():
+            if ruta != self.archivo_excel:
+                self.ejecutor_io.liberar(ruta)
+
+        def terminar(resultado):
+            liberar_si_no_es_actual()
+            if al_terminar:
+                al_terminar(resultado)
+
+        def fallar(error):
+            liberar_si_no_es_actual()
+            if al_fallar:
+                al_fallar(error)
+
+        return self.ejecutor_io.enviar(ruta, operacion, terminar, fallar)
+
     def _ejecutar_eliminacion(self, nombre_archivo):
         """Ejecuta la eliminación del archivo."""
         try:
+            ruta = seleccionar_archivo(nombre_archivo)
+        except Exception as e:
+            self._mostrar_mensaje(f"No se pudo eliminar el archivo: {e}")
+            return
+
+        es_archivo_actual = self.archivo_excel == ruta
+        # Descartar la sesión antes de borrar para que no se vuelva a escribir
+        manager = self.excel_manager if es_archivo_actual else None
+        if es_archivo_actual:
+            self.excel_manager = None
+
+        def borrar():
+            if manager:
+                manager.cerrar(guardar=False)
             eliminar_archivo(nombre_archivo)
+
+        def al_borrar(_):
             self._mostrar_mensaje(f"Archivo '{nombre_archivo}' eliminado.")
 
             # Si era el archivo actual, limpiar la selección
-            if self.archivo_excel and self.archivo_excel.endswith(nombre_archivo):
+            if es_archivo_actual and self.archivo_excel == ruta:
+                self.ejecutor_io.liberar(ruta)
                 self.archivo_excel = None
                 self.excel_manager = None
                 self.archivo_actual_text.value = "Ningún archivo seleccionado"
                 self.actualizar_contador_registros()
 
-        except Exception as e:
-            self._mostrar_mensaje(f"No se pudo eliminar el archivo: {e}")
+        # Se encola detrás de las operaciones pendientes sobre el archivo
+        # (guardados, descargas), en la misma cola que ellas
+        self._en_cola_de_archivo(
+            ruta,
+            borrar,
+            al_borrar,
+            lambda e: self._mostrar_mensaje(f"No se pudo eliminar el archivo: {e}"),
+        )
 
     def descargar_archivo_trabajo(self):
         """Descarga archivo de trabajo."""
@@ -2842,11 +3227,40 @@ class VentanaPrincipal:
 
         def callback_seleccionar(nombre_archivo):
             try:
-                destino = descargar_archivo(nombre_archivo)
-                if destino:
-                    self._mostrar_mensaje(f"Archivo guardado en: {destino}")
+                ruta = seleccionar_archivo(nombre_archivo)
             except Exception as e:
                 self._mostrar_mensaje(f"No se pudo descargar el archivo: {e}")
+                return
+
+            es_archivo_actual = bool(self.excel_manager and self.archivo_excel == ruta)
+            manager_actual = self.excel_manager
+
+            def descargar():
+                # Asegurar que la copia incluya los cambios aún en memoria o,
+                # con el motor SQLite, generar el libro desde la base
+                if es_archivo_actual:
+                    if not manager_actual.exportar():
+                        raise Exception(manager_actual.ultimo_error)
+                elif STORAGE_ENGINE == "sqlite":
+                    manager = ExcelManager(ruta, motor=STORAGE_ENGINE)
+                    try:
+                        if not manager.exportar():
+                            raise Exception(manager.ultimo_error)
+                    finally:
+                        manager.cerrar(guardar=False)
+                return descargar_archivo(nombre_archivo)
+
+            def al_descargar(destino):
+                if destino:
+                    self._mostrar_mensaje(f"Archivo guardado en: {destino}")
+
+            # Se encola en la cola del archivo elegido, detrás de sus escrituras
+            self._en_cola_de_archivo(
+                ruta,
+                descargar,
+                al_descargar,
+                lambda e: self._mostrar_mensaje(f"No se pudo descargar el archivo: {e}"),
+            )
 
         VentanaSeleccionArchivo(
             self.page, "Descargar Archivo", archivos, callback_seleccionar
@@ -2856,14 +3270,18 @@ class VentanaPrincipal:
         """Actualiza el contador de registros."""
         if not self.excel_manager:
             self.contador_registros.value = "Registros: 0"
-        else:
-            try:
-                num_registros = self.excel_manager.contar_registros()
-                self.contador_registros.value = f"Registros: {num_registros}"
-            except Exception:
-                self.contador_registros.value = "Registros: ?"
+            self.page.update()
+            return
 
-        self.page.update()
+        def al_contar(num_registros):
+            self.contador_registros.value = f"Registros: {num_registros}"
+            self.page.update()
+
+        def al_fallar(e):
+            self.contador_registros.value = "Registros: ?"
+            self.page.update()
+
+        self._en_segundo_plano(self.excel_manager.contar_registros, al_contar, al_fallar)
 
     def _mostrar_mensaje(self, mensaje: str):
         """Muestra un mensaje usando AlertDialog con colores dinámicos."""
@@ -7,6 +7,7 @@ Autor: Jose David Bustamante Sánchez
 Año: 2025
 """
 
+import multiprocessing
 import sys
 import os
 from pathlib import Path
@@ -40,4 +41,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necesario en el ejecutable empaquetado para los procesos de anonimizar_lote
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,257 @@
+import sqlite3
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from .audiencia import CLAVE_INVALIDA, Audiencia, clave_orden
+
+
+class AlmacenSQLite:
+    """Almacena las audiencias de un libro en una base SQLite local.
+
+    Es el motor ``"sqlite"`` de ``ExcelManager``: cada operación es una
+    inserción o actualización indexada y el .xlsx solo se genera al exportar.
+    Los registros se entregan siempre ordenados por fecha/hora descendente
+    (las fechas inválidas al final); ante empates se conserva el orden de
+    llegada, igual que el ordenamiento estable de la hoja.
+
+    La tabla ``meta`` lleva una versión que aumenta con cada cambio y la
+    última versión exportada, para saber si el libro está desactualizado.
+
+    SQLite no sabe en qué posición del orden está un registro sin contar
+    los anteriores, así que se mantiene en memoria la lista ordenada de
+    ``(clave, -id)``: la posición de un registro es una búsqueda binaria y
+    el registro de una posición, un acceso directo.
+    """
+
+    COLUMNAS = (
+        "radicado", "tipo", "fecha", "hora", "juzgado",
+        "realizada_si", "realizada_no",
+        "motivo_1", "motivo_2", "motivo_3", "motivo_4",
+        "motivo_5", "motivo_6", "motivo_7", "motivo_8",
+        "observaciones",
+    )
+    ORDEN = "ORDER BY clave DESC, id"
+
+    def __init__(self, ruta_db: str):
+        self.ruta_db = ruta_db
+        # El acceso se serializa con el lock de ExcelManager, que puede
+        # llamarse desde el temporizador o desde atexit
+        self._conexion = sqlite3.connect(ruta_db, check_same_thread=False)
+        # (clave, -id) en orden ascendente: el orden de la hoja al revés.
+        # Se carga la primera vez que se necesita una posición
+        self._orden: Optional[List[Tuple[str, int]]] = None
+        self._crear_esquema()
+
+    def _crear_esquema(self):
+        """Crea las tablas e índices si no existen."""
+        columnas = ", ".join(f"{columna} TEXT" for columna in self.COLUMNAS)
+        with self._conexion:
+            self._conexion.execute(
+                f"CREATE TABLE IF NOT EXISTS audiencias ("
+                f"id INTEGER PRIMARY KEY, {columnas}, clave TEXT NOT NULL)"
+            )
+            self._conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_audiencias_radicado "
+                "ON audiencias (radicado)"
+            )
+            self._conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_audiencias_fecha_hora "
+                "ON audiencias (clave DESC, id)"
+            )
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS meta (nombre TEXT PRIMARY KEY, valor INTEGER)"
+            )
+            self._conexion.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('version', 0), ('version_exportada', 0)"
+            )
+
+    @staticmethod
+    def _clave(fecha, hora) -> str:
+        """Clave ordenable AAAAMMDDHHMM; vacía si la fecha u hora es inválida."""
+        clave = clave_orden(fecha, hora)
+        return str(clave) if clave != CLAVE_INVALIDA else ""
+
+    def _valores(self, datos: Sequence) -> tuple:
+        """Valores de las columnas (más la clave) a partir de una fila de datos.
+
+        Las cadenas vacías se guardan como NULL, igual que quedan en el libro.
+        """
+        valores = tuple(
+            None if valor == "" else
+            valor if valor is None or isinstance(valor, (str, int, float)) else str(valor)
+            for valor in datos
+        )
+        valores += (None,) * (len(self.COLUMNAS) - len(valores))
+        return valores + (self._clave(valores[2], valores[3]),)
+
+    def _marcar_cambio(self):
+        self._conexion.execute(
+            "UPDATE meta SET valor = valor + 1 WHERE nombre = 'version'"
+        )
+
+    def _claves_orden(self) -> List[Tuple[str, int]]:
+        if self._orden is None:
+            self._orden = sorted(
+                (clave, -id_registro)
+                for id_registro, clave in self._conexion.execute("SELECT id, clave FROM audiencias")
+            )
+        return self._orden
+
+    def _posicion(self, clave: str, id_registro: int) -> int:
+        """Posición (desde 0) en el orden: registros con clave mayor, o igual y anteriores."""
+        orden = self._claves_orden()
+        return len(orden) - bisect_right(orden, (clave, -id_registro))
+
+    def _id_en_posicion(self, indice: int) -> Optional[int]:
+        """Id del registro que ocupa la posición ``indice`` (desde 0) del orden."""
+        orden = self._claves_orden()
+        if not 0 <= indice < len(orden):
+            return None
+        return -orden[len(orden) - 1 - indice][1]
+
+    @contextmanager
+    def _cambio_en_orden(self):
+        """Transacción que, si falla, descarta el orden en memoria para recargarlo."""
+        try:
+            with self._conexion:
+                yield
+        except Exception:
+            self._orden = None
+            raise
+
+    def _quitar_del_orden(self, id_registro: int):
+        if self._orden is None:
+            return
+        clave = self._conexion.execute(
+            "SELECT clave FROM audiencias WHERE id = ?", (id_registro,)
+        ).fetchone()[0]
+        del self._orden[bisect_left(self._orden, (clave, -id_registro))]
+
+    def _insertar_filas(self, filas: Iterable[Sequence]):
+        sql = (
+            f"INSERT INTO audiencias ({', '.join(self.COLUMNAS)}, clave) "
+            f"VALUES ({', '.join('?' * (len(self.COLUMNAS) + 1))})"
+        )
+        nuevas = []
+        for datos in filas:
+            valores = self._valores(datos)
+            cursor = self._conexion.execute(sql, valores)
+            nuevas.append((valores[-1], -cursor.lastrowid))
+        if self._orden is not None:
+            # Ordenar una lista ya ordenada más unas pocas al final es lineal
+            self._orden.extend(nuevas)
+            self._orden.sort()
+
+    def importar(self, filas: Iterable[Sequence]):
+        """Carga filas de datos (sin el número) en una sola transacción.
+
+        Se usa al crear la base a partir del libro, que ya las contiene, por
+        lo que no cuenta como cambio pendiente de exportar.
+        """
+        with self._conexion:
+            self._insertar_filas(filas)
+
+    def insertar(self, audiencia: Audiencia):
+        """Inserta una audiencia."""
+        self.insertar_lote([audiencia])
+
+    def insertar_lote(self, audiencias: Iterable[Audiencia]):
+        """Inserta varias audiencias en una sola transacción."""
+        with self._cambio_en_orden():
+            self._insertar_filas(audiencia.to_excel_row() for audiencia in audiencias)
+            self._marcar_cambio()
+
+    def actualizar(self, indice: int, audiencia: Audiencia):
+        """Reemplaza la audiencia en la posición ``indice`` del orden."""
+        asignaciones = ", ".join(f"{columna} = ?" for columna in self.COLUMNAS)
+        with self._cambio_en_orden():
+            id_registro = self._id_en_posicion(indice)
+            if id_registro is None:
+                raise Exception(f"No hay un registro en la posición {indice + 1}")
+            valores = self._valores(audiencia.to_excel_row())
+            self._quitar_del_orden(id_registro)
+            self._conexion.execute(
+                f"UPDATE audiencias SET {asignaciones}, clave = ? WHERE id = ?",
+                valores + (id_registro,),
+            )
+            insort(self._orden, (valores[-1], -id_registro))
+            self._marcar_cambio()
+
+    def eliminar(self, indice: int):
+        """Elimina la audiencia en la posición ``indice`` del orden."""
+        with self._cambio_en_orden():
+            id_registro = self._id_en_posicion(indice)
+            if id_registro is None:
+                raise Exception(f"No hay un registro en la posición {indice + 1}")
+            self._quitar_del_orden(id_registro)
+            self._conexion.execute("DELETE FROM audiencias WHERE id = ?", (id_registro,))
+            self._marcar_cambio()
+
+    def posiciones(self, radicado: Optional[str]) -> List[int]:
+        """Posiciones (desde 0) de los registros con ese radicado, en orden."""
+        return sorted(
+            self._posicion(clave, id_registro)
+            for id_registro, clave in self._conexion.execute(
+                "SELECT id, clave FROM audiencias WHERE radicado = ?", (radicado,)
+            )
+        )
+
+    def leer(self, indice: int) -> Optional[tuple]:
+        """Fila de datos (sin el número) en la posición ``indice`` o None."""
+        id_registro = self._id_en_posicion(indice)
+        if id_registro is None:
+            return None
+        return self._conexion.execute(
+            f"SELECT {', '.join(self.COLUMNAS)} FROM audiencias WHERE id = ?", (id_registro,)
+        ).fetchone()
+
+    def totales(self) -> Tuple[int, int, List[int]]:
+        """(registros, audiencias realizadas, totales por motivo)."""
+        motivos = ", ".join(
+            f"COALESCE(SUM(motivo_{i} IS NOT NULL AND motivo_{i} != ''), 0)"
+            for i in range(1, 9)
+        )
+        fila = self._conexion.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(realizada_si = 'SI'), 0), {motivos} "
+            f"FROM audiencias"
+        ).fetchone()
+        return fila[0], fila[1], list(fila[2:])
+
+    def contar(self) -> int:
+        """Número de registros."""
+        return self._conexion.execute("SELECT COUNT(*) FROM audiencias").fetchone()[0]
+
+    def iterar(self) -> Iterator[tuple]:
+        """Genera las filas de datos (sin el número) en el orden de la hoja."""
+        cursor = self._conexion.execute(
+            f"SELECT {', '.join(self.COLUMNAS)} FROM audiencias {self.ORDEN}"
+        )
+        try:
+            while True:
+                lote = cursor.fetchmany(500)
+                if not lote:
+                    return
+                yield from lote
+        finally:
+            cursor.close()
+
+    def _meta(self, nombre: str) -> int:
+        return self._conexion.execute(
+            "SELECT valor FROM meta WHERE nombre = ?", (nombre,)
+        ).fetchone()[0]
+
+    @property
+    def pendiente_exportar(self) -> bool:
+        """Indica si hay cambios que el libro .xlsx aún no refleja."""
+        return self._meta("version") != self._meta("version_exportada")
+
+    def marcar_exportado(self):
+        """Registra que el libro refleja la versión actual."""
+        with self._conexion:
+            self._conexion.execute(
+                "UPDATE meta SET valor = (SELECT valor FROM meta WHERE nombre = 'version') "
+                "WHERE nombre = 'version_exportada'"
+            )
+
+    def cerrar(self):
+        self._conexion.close()
@@ -1,6 +1,91 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence
+
+FORMATO_FECHA = "%d/%m/%Y"
+FORMATO_HORA = "%H:%M"
+# Clave de las filas con fecha u hora inválida: quedan después de todas las válidas
+CLAVE_INVALIDA = -1
+ETIQUETAS_MOTIVOS = (
+    "Juez", "Fiscalía", "Usuario", "INPEC",
+    "Víctima", "ICBF", "Defensor Confianza", "Defensor Público",
+)
+
+
+NUM_MOTIVOS = len(ETIQUETAS_MOTIVOS)
+
+
+def mascara_motivos(motivos: Sequence) -> int:
+    """Máscara de 8 bits de los motivos marcados (bit ``i`` = motivo ``i``)."""
+    mascara = 0
+    for i, motivo in enumerate(motivos[:NUM_MOTIVOS]):
+        if motivo:
+            mascara |= 1 << i
+    return mascara
+
+
+def contar_motivos(mascaras: Iterable[int]) -> List[int]:
+    """Cuenta cuántos registros tienen marcado cada motivo.
+
+    Las máscaras se empaquetan en un solo entero (un byte por registro) y
+    cada total es el ``bit_count`` de ese entero filtrado por el bit del
+    motivo, sin recorrer los registros en Python.
+    """
+    empaquetadas = mascaras if isinstance(mascaras, (bytes, bytearray)) else bytes(mascaras)
+    todas = int.from_bytes(empaquetadas, "little")
+    unos = int.from_bytes(b"\x01" * len(empaquetadas), "little")
+    return [((todas >> i) & unos).bit_count() for i in range(NUM_MOTIVOS)]
+
+
+# Las fechas y horas de un libro se repiten mucho (mismos días, mismas
+# horas), así que cada texto distinto se interpreta una sola vez.
+@lru_cache(maxsize=4096)
+def parsear_fecha(texto: str) -> Optional[datetime]:
+    """Interpreta una fecha DD/MM/AAAA; None si no es válida."""
+    try:
+        return datetime.strptime(texto, FORMATO_FECHA)
+    except (ValueError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parsear_hora(texto: str) -> Optional[datetime]:
+    """Interpreta una hora HH:MM; None si no es válida."""
+    try:
+        return datetime.strptime(texto, FORMATO_HORA)
+    except (ValueError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=16384)
+def calcular_marca_tiempo(fecha: str, hora: str) -> Optional[datetime]:
+    """Fecha y hora combinadas; None si alguna no es válida."""
+    f = parsear_fecha(fecha)
+    h = parsear_hora(hora)
+    if f is None or h is None:
+        return None
+    return datetime.combine(f.date(), h.time())
+
+
+def clave_orden(fecha, hora) -> int:
+    """Clave de ordenamiento AAAAMMDDHHMM; las inválidas quedan al final."""
+    return _clave_textos(str(fecha), str(hora))
+
+
+@lru_cache(maxsize=16384)
+def _clave_textos(fecha: str, hora: str) -> int:
+    # Memorizada para que las filas con la misma fecha y hora compartan la clave
+    return _clave_marca(calcular_marca_tiempo(fecha, hora))
+
+
+def _clave_marca(marca: Optional[datetime]) -> int:
+    if marca is None:
+        return CLAVE_INVALIDA
+    return (
+        marca.year * 100000000 + marca.month * 1000000 + marca.day * 10000
+        + marca.hour * 100 + marca.minute
+    )
 
 
 @dataclass
@@ -16,6 +101,8 @@ class Audiencia:
     realizada_no: str
     motivos: List[str]
     observaciones: str
+    # Fecha y hora interpretadas una vez al crear el objeto (None si no son válidas)
+    marca_tiempo: Optional[datetime] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validaciones básicas después de crear el objeto."""
@@ -23,6 +110,17 @@ class Audiencia:
             raise ValueError("El radicado es obligatorio")
         if not self.tipo:
             raise ValueError("El tipo de audiencia es obligatorio")
+        self.marca_tiempo = calcular_marca_tiempo(str(self.fecha), str(self.hora))
+
+    @property
+    def mascara_motivos(self) -> int:
+        """Motivos marcados como máscara de 8 bits."""
+        return mascara_motivos(self.motivos)
+
+    @property
+    def clave_orden(self) -> int:
+        """Clave de ordenamiento por fecha/hora, igual a la de las filas del libro."""
+        return _clave_marca(self.marca_tiempo)
 
     @classmethod
     def from_form_data(cls, datos: dict) -> "Audiencia":
@@ -39,6 +137,20 @@ class Audiencia:
             observaciones=datos["observaciones"],
         )
 
+    def to_form_data(self) -> dict:
+        """Convierte la audiencia al diccionario que usan las validaciones del formulario."""
+        return {
+            "radicado": self.radicado,
+            "tipo": self.tipo,
+            "fecha": self.fecha,
+            "hora": self.hora,
+            "juzgado": self.juzgado,
+            "realizada_si": self.realizada_si,
+            "realizada_no": self.realizada_no,
+            "motivos": list(self.motivos),
+            "observaciones": self.observaciones,
+        }
+
     def to_excel_row(self) -> List[str]:
         """Convierte los datos a una fila de Excel."""
         row = [
@@ -56,8 +168,4 @@ class Audiencia:
 
     def validate_date(self) -> bool:
         """Valida que la fecha tenga el formato correcto."""
-        try:
-            datetime.strptime(self.fecha, "%d/%m/%Y")
-            return True
-        except ValueError:
-            return False
+        return parsear_fecha(self.fecha) is not None
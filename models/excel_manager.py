@@ -1,37 +1,128 @@
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from operator import attrgetter
 from openpyxl import load_workbook
-from datetime import datetime
-from typing import List, Tuple, Optional
-from .audiencia import Audiencia
+from typing import Dict, Iterator, List, Tuple, Optional, Sequence
+from .audiencia import Audiencia, clave_orden, contar_motivos, mascara_motivos
+from .almacen_sqlite import AlmacenSQLite
+from .registro import Registro
+from utils.validators import validar_todos_los_datos
 
 
 class ExcelManager:
-    """Gestiona las operaciones con archivos Excel."""
+    """Gestiona las operaciones con archivos Excel.
+
+    En modo sesión (``modo_sesion=True``) el libro se carga una sola vez y
+    permanece en memoria: las operaciones se aplican sobre esa copia y se
+    escriben a disco tras ``retraso_guardado`` segundos sin cambios, al
+    llamar a ``guardar_cambios``/``cerrar`` o al terminar el proceso.
+
+    Con ``ordenamiento_incremental=True`` (por defecto) ``guardar_y_reordenar``
+    y ``actualizar_y_reordenar`` ubican el registro por búsqueda binaria y
+    desplazan solo las filas afectadas, siempre que la hoja ya esté ordenada;
+    si no lo está, se hace el reordenamiento completo.
+
+    Los totales (registros, audiencias realizadas y motivos) se mantienen por
+    diferencias en cada inserción, actualización o eliminación y se guardan
+    junto al libro en un archivo oculto ``.<nombre>.totales.json`` asociado al
+    tamaño y fecha de modificación del .xlsx. Con ``verificacion_totales=True``
+    cada cambio se contrasta con un recuento completo.
+
+    Cada hoja de la plantilla admite ``CAPACIDAD_HOJA`` registros. Cuando se
+    llena, se agrega otra hoja con el mismo formato ("Hoja1 (2)", ...) y la
+    numeración continúa; los totales de todas las hojas se escriben en la
+    fila de totales de la última. El parámetro ``fila`` de la API es la
+    posición global del registro: en la primera hoja coincide con la fila de
+    Excel y en las siguientes continúa como si las hojas estuvieran apiladas
+    (la fila 111 es el primer registro de la segunda hoja).
+
+    Con ``motor="sqlite"`` los registros se guardan en una base SQLite oculta
+    junto al libro (``.<nombre>.sqlite3``, ver ``AlmacenSQLite``), creada a
+    partir del .xlsx la primera vez. La API es la misma, pero cada operación
+    es una escritura indexada y el libro solo se genera con ``exportar``
+    (por ejemplo, al descargarlo). En este motor los registros siempre están
+    ordenados, también tras ``guardar_audiencia``.
+
+    ``guardar_lote`` agrega muchas audiencias a la vez: las valida todas,
+    las inserta, reordena una sola vez y escribe el libro una sola vez.
+
+    ``buscar_radicado`` consulta un índice en memoria radicado → filas que se
+    construye una vez por archivo y se mantiene en cada inserción,
+    actualización o eliminación, sin volver a recorrer el libro.
+    """
 
     FILA_INICIO_DATOS = 11
     FILA_MAXIMA_DATOS_PARA_LIMPIAR = 110
     FILA_TOTALES = 111
+    CAPACIDAD_HOJA = FILA_MAXIMA_DATOS_PARA_LIMPIAR - FILA_INICIO_DATOS + 1
+    COLUMNA_ETIQUETA_TOTALES = 8
+    COLUMNA_RADICADO = 2
+    ULTIMA_COLUMNA_DATOS = 17
+    FILAS_VACIAS_FIN_DATOS = 5
+    RETRASO_GUARDADO_SEGUNDOS = 2.0
+    MOTORES = ("excel", "sqlite")
+
+    def __init__(
+        self,
+        archivo_path: str,
+        modo_sesion: bool = False,
+        retraso_guardado: float = RETRASO_GUARDADO_SEGUNDOS,
+        ordenamiento_incremental: bool = True,
+        verificacion_totales: bool = False,
+        motor: str = "excel",
+    ):
+        if motor not in self.MOTORES:
+            raise ValueError(f"Motor de almacenamiento desconocido: {motor}")
 
-    def __init__(self, archivo_path: str):
         self.archivo_path = archivo_path
+        self.motor = motor
+        self.modo_sesion = modo_sesion
+        self.ordenamiento_incremental = ordenamiento_incremental
+        self.verificacion_totales = verificacion_totales
+        self.retraso_guardado = retraso_guardado
+        self.ultimo_error: Optional[Exception] = None
+
+        self._wb = None
+        self._cambios_pendientes = False
+        self._temporizador: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self._totales: Optional[Tuple[int, int, List[int]]] = None
+        self._firma_totales: Optional[Tuple[int, int]] = None
+        self._conteo: Optional[Tuple[Optional[Tuple[int, int]], int]] = None
+        self._almacen: Optional[AlmacenSQLite] = None
+        self._indice: Optional[Dict[str, List[int]]] = None
+        self._radicados: List[Optional[str]] = []
+        self._firma_indice: Optional[Tuple[int, int]] = None
+
+        if modo_sesion:
+            atexit.register(self.guardar_cambios)
 
     def guardar_audiencia(self, audiencia: Audiencia) -> bool:
         """Guarda una nueva audiencia en el archivo Excel."""
         try:
-            wb = load_workbook(self.archivo_path)
-            ws = wb.active
+            with self._lock:
+                if self.motor == "sqlite":
+                    self._almacen_sqlite().insertar(audiencia)
+                    return True
 
-            if ws is None:
-                raise Exception("No se pudo acceder a la hoja de trabajo")
+                wb = self._abrir_libro()
 
-            # Encontrar la primera fila vacía
-            fila_destino = self.FILA_INICIO_DATOS
-            while ws.cell(row=fila_destino, column=2).value is not None:
-                fila_destino += 1
+                # Encontrar la primera fila vacía
+                fila_destino = self._primera_fila_vacia(wb)
+                self._totales_actuales(wb)
 
-            # Escribir los datos
-            self._escribir_fila_audiencia(ws, fila_destino, audiencia)
+                # Escribir los datos
+                self._escribir_registro(wb, fila_destino, audiencia)
+                self._sumar_aporte(1, self._aporte_audiencia(audiencia))
+                self._verificar_incremental(wb)
+                self._indice_asignar(fila_destino - self.FILA_INICIO_DATOS, audiencia.radicado)
 
-            wb.save(self.archivo_path)
+                self._persistir(wb)
             return True
 
         except PermissionError:
@@ -44,19 +135,769 @@ class ExcelManager:
     def actualizar_audiencia(self, fila: int, audiencia: Audiencia) -> bool:
         """Actualiza una audiencia existente."""
         try:
-            wb = load_workbook(self.archivo_path)
-            ws = wb.active
+            with self._lock:
+                if self.motor == "sqlite":
+                    self._almacen_sqlite().actualizar(fila - self.FILA_INICIO_DATOS, audiencia)
+                    return True
 
-            if ws is None:
-                raise Exception("No se pudo acceder a la hoja de trabajo")
+                wb = self._abrir_libro()
+                self._totales_actuales(wb)
 
-            self._escribir_fila_audiencia(ws, fila, audiencia)
-            wb.save(self.archivo_path)
+                self._sumar_aporte(-1, self._aporte_fila(wb, fila))
+                self._escribir_registro(wb, fila, audiencia)
+                self._sumar_aporte(1, self._aporte_audiencia(audiencia))
+                self._verificar_incremental(wb)
+                self._indice_asignar(fila - self.FILA_INICIO_DATOS, audiencia.radicado)
+
+                self._persistir(wb)
             return True
 
         except Exception as e:
             raise Exception(f"Error al actualizar: {e}")
 
+    def guardar_y_reordenar(self, audiencia: Audiencia) -> Tuple[int, int, List[int]]:
+        """Guarda una audiencia, reordena y calcula totales en una sola escritura.
+
+        Equivale a ``guardar_audiencia`` seguido de ``reordenar_y_guardar``,
+        pero el libro se carga y se guarda una única vez.
+        """
+        try:
+            with self._lock:
+                if self.motor == "sqlite":
+                    almacen = self._almacen_sqlite()
+                    almacen.insertar(audiencia)
+                    return almacen.totales()
+
+                wb = self._abrir_libro()
+
+                claves = self._claves_si_ordenada(wb)
+                if claves is not None:
+                    self._totales_actuales(wb)
+                    posicion = self._insertar_ordenado(wb, claves, audiencia)
+                    self._sumar_aporte(1, self._aporte_audiencia(audiencia))
+                    self._indice_insertar(posicion, audiencia.radicado)
+                    resultado = self._escribir_totales_actuales(wb)
+                else:
+                    fila_destino = self._primera_fila_vacia(wb)
+                    self._escribir_registro(wb, fila_destino, audiencia)
+                    resultado = self._reordenar_libro(wb)
+
+                self._persistir(wb)
+            return resultado
+
+        except PermissionError:
+            raise Exception(
+                "No se pudo guardar. Cierre el archivo de Excel si está abierto."
+            )
+        except Exception as e:
+            raise Exception(f"Error al guardar: {e}")
+
+    def guardar_lote(self, audiencias: Sequence[Audiencia]) -> Tuple[int, int, List[int]]:
+        """Guarda varias audiencias, reordena y calcula totales en una sola escritura.
+
+        Todas se validan con ``validar_todos_los_datos`` antes de escribir:
+        si alguna no es válida no se guarda ninguna.
+        """
+        try:
+            self._validar_lote(audiencias)
+
+            with self._lock:
+                if self.motor == "sqlite":
+                    almacen = self._almacen_sqlite()
+                    almacen.insertar_lote(audiencias)
+                    return almacen.totales()
+
+                wb = self._abrir_libro()
+                resultado = self._reordenar_libro(wb, audiencias)
+                self._persistir(wb)
+            return resultado
+
+        except PermissionError:
+            raise Exception(
+                "No se pudo guardar. Cierre el archivo de Excel si está abierto."
+            )
+        except Exception as e:
+            raise Exception(f"Error al guardar el lote: {e}")
+
+    @staticmethod
+    def _validar_lote(audiencias: Sequence[Audiencia]):
+        """Valida todas las audiencias y reporta las inválidas con su posición."""
+        errores = []
+        for i, audiencia in enumerate(audiencias, start=1):
+            valido, mensaje = validar_todos_los_datos(audiencia.to_form_data())
+            if not valido:
+                errores.append(f"registro {i} ({audiencia.radicado}): {mensaje}")
+        if errores:
+            resumen = "; ".join(errores[:5])
+            if len(errores) > 5:
+                resumen += f"; y {len(errores) - 5} más"
+            raise Exception(f"{len(errores)} registros inválidos: {resumen}")
+
+    def actualizar_y_reordenar(
+        self, fila: int, audiencia: Audiencia
+    ) -> Tuple[int, int, List[int]]:
+        """Actualiza una audiencia, reordena y calcula totales en una sola escritura."""
+        try:
+            with self._lock:
+                if self.motor == "sqlite":
+                    almacen = self._almacen_sqlite()
+                    almacen.actualizar(fila - self.FILA_INICIO_DATOS, audiencia)
+                    return almacen.totales()
+
+                wb = self._abrir_libro()
+
+                claves = self._claves_si_ordenada(wb)
+                indice = fila - self.FILA_INICIO_DATOS
+                if claves is not None and 0 <= indice < len(claves):
+                    self._totales_actuales(wb)
+                    self._sumar_aporte(-1, self._aporte_fila(wb, fila))
+                    nueva = self._reubicar_ordenado(wb, claves, indice, audiencia)
+                    self._sumar_aporte(1, self._aporte_audiencia(audiencia))
+                    self._indice_eliminar(indice)
+                    self._indice_insertar(nueva, audiencia.radicado)
+                    resultado = self._escribir_totales_actuales(wb)
+                else:
+                    self._escribir_registro(wb, fila, audiencia)
+                    resultado = self._reordenar_libro(wb)
+
+                self._persistir(wb)
+            return resultado
+
+        except PermissionError:
+            raise Exception(
+                "No se pudo guardar. Cierre el archivo de Excel si está abierto."
+            )
+        except Exception as e:
+            raise Exception(f"Error al actualizar: {e}")
+
+    def eliminar_audiencia(self, fila: int) -> Tuple[int, int, List[int]]:
+        """Elimina una audiencia subiendo solo las filas que están debajo."""
+        try:
+            with self._lock:
+                if self.motor == "sqlite":
+                    almacen = self._almacen_sqlite()
+                    almacen.eliminar(fila - self.FILA_INICIO_DATOS)
+                    return almacen.totales()
+
+                wb = self._abrir_libro()
+
+                aporte = self._aporte_fila(wb, fila)
+                if aporte is None:
+                    raise Exception(f"La fila {fila} no contiene un registro")
+
+                claves = self._claves_si_ordenada(wb)
+                if claves is not None:
+                    self._totales_actuales(wb)
+                    self._sumar_aporte(-1, aporte)
+                    ultima = self.FILA_INICIO_DATOS + len(claves) - 1
+                    for origen in range(fila + 1, ultima + 1):
+                        self._copiar_registro(wb, origen, origen - 1)
+                    ws, fila_hoja = self._ubicar(wb, ultima)
+                    for col in range(1, self.ULTIMA_COLUMNA_DATOS + 1):
+                        ws.cell(row=fila_hoja, column=col).value = None
+                    self._ajustar_paginas(wb, len(claves) - 1)
+                    self._indice_eliminar(fila - self.FILA_INICIO_DATOS)
+                    resultado = self._escribir_totales_actuales(wb)
+                else:
+                    ws, fila_hoja = self._ubicar(wb, fila)
+                    for col in range(self.COLUMNA_RADICADO, self.ULTIMA_COLUMNA_DATOS + 1):
+                        ws.cell(row=fila_hoja, column=col).value = None
+                    resultado = self._reordenar_libro(wb)
+
+                self._persistir(wb)
+            return resultado
+
+        except PermissionError:
+            raise Exception(
+                "No se pudo guardar. Cierre el archivo de Excel si está abierto."
+            )
+        except Exception as e:
+            raise Exception(f"Error al eliminar: {e}")
+
+    def verificar_totales(self) -> bool:
+        """Contrasta los totales incrementales con un recuento completo.
+
+        Si no coinciden, se adopta el recuento y se devuelve False. En el
+        motor SQLite los totales siempre se calculan en la base.
+        """
+        if self.motor == "sqlite":
+            return True
+
+        with self._libro_lectura() as wb:
+            recuento = self._calcular_totales(wb)
+            coinciden = self._totales_actuales(wb) == recuento
+            if not coinciden:
+                self._totales = recuento
+            return coinciden
+
+    def buscar_radicado(self, radicado: str) -> List[int]:
+        """Filas que contienen el radicado, en orden; vacía si no existe.
+
+        Sirve también para detectar duplicados antes de guardar.
+        """
+        try:
+            with self._lock:
+                if self.motor == "sqlite":
+                    posiciones = self._almacen_sqlite().posiciones(
+                        self._clave_radicado(radicado)
+                    )
+                    return [self.FILA_INICIO_DATOS + p for p in posiciones]
+
+                filas = self._indice_radicados().get(self._clave_radicado(radicado), [])
+                return sorted(filas)
+        except Exception as e:
+            raise Exception(f"Error al buscar el radicado: {e}")
+
+    def leer_registro(self, fila: int) -> Optional[Tuple]:
+        """Valores de una fila (como en ``iterar_registros``) o None si está vacía."""
+        try:
+            with self._lock:
+                if self.motor == "sqlite":
+                    posicion = fila - self.FILA_INICIO_DATOS
+                    datos = self._almacen_sqlite().leer(posicion)
+                    return None if datos is None else (posicion + 1,) + datos
+
+                with self._libro_lectura() as wb:
+                    ws, fila_hoja = self._ubicar(wb, fila)
+                    if ws is None:
+                        return None
+                    datos = next(ws.iter_rows(
+                        min_row=fila_hoja,
+                        max_row=fila_hoja,
+                        max_col=self.ULTIMA_COLUMNA_DATOS,
+                        values_only=True,
+                    ))
+                    return datos if datos[1] else None
+        except Exception as e:
+            raise Exception(f"Error al leer el registro: {e}")
+
+    @staticmethod
+    def archivos_asociados(archivo_path: str) -> List[str]:
+        """Rutas de los archivos auxiliares que acompañan a un libro."""
+        directorio, nombre = os.path.split(archivo_path)
+        return [
+            os.path.join(directorio, f".{nombre}.totales.json"),
+            os.path.join(directorio, f".{nombre}.sqlite3"),
+        ]
+
+    def exportar(self) -> bool:
+        """Deja el .xlsx al día con todos los registros.
+
+        En el motor Excel equivale a ``guardar_cambios``. En el motor SQLite
+        genera el libro desde la base si tiene cambios sin exportar. Devuelve
+        False si la escritura falla, con el error en ``ultimo_error``.
+        """
+        if self.motor != "sqlite":
+            return self.guardar_cambios()
+
+        with self._lock:
+            try:
+                almacen = self._almacen_sqlite()
+                if almacen.pendiente_exportar:
+                    wb = load_workbook(self.archivo_path)
+                    self._volcar_registros(
+                        wb, [Registro.desde_valores(datos) for datos in almacen.iterar()]
+                    )
+                    self._totales = almacen.totales()
+                    self._escribir_totales_actuales(wb)
+                    self._escribir_libro(wb)
+                    almacen.marcar_exportado()
+                self.ultimo_error = None
+                return True
+            except Exception as e:
+                self.ultimo_error = e
+                return False
+
+    def guardar_cambios(self) -> bool:
+        """Escribe a disco los cambios pendientes de la sesión.
+
+        Devuelve True si no quedan cambios pendientes. Si la escritura falla
+        (por ejemplo, el archivo está abierto en Excel) los cambios se
+        conservan en memoria y el error queda en ``ultimo_error``.
+        """
+        with self._lock:
+            self._cancelar_temporizador()
+            if not self._cambios_pendientes or self._wb is None:
+                return True
+            try:
+                self._escribir_libro(self._wb)
+                self._cambios_pendientes = False
+                self.ultimo_error = None
+                return True
+            except Exception as e:
+                self.ultimo_error = e
+                return False
+
+    def cerrar(self, guardar: bool = True) -> bool:
+        """Termina la sesión, guardando o descartando los cambios pendientes.
+
+        Si ``guardar`` es True y la escritura falla, la sesión sigue abierta
+        con sus cambios en memoria y se devuelve False.
+        """
+        with self._lock:
+            if guardar and not self.guardar_cambios():
+                return False
+            self._cancelar_temporizador()
+            if self._cambios_pendientes:
+                # Los cambios descartados ya estaban en los totales y el índice
+                self._totales = None
+                self._indice = None
+            self._cambios_pendientes = False
+            self._wb = None
+            if self._almacen is not None:
+                self._almacen.cerrar()
+                self._almacen = None
+        if self.modo_sesion:
+            atexit.unregister(self.guardar_cambios)
+        return True
+
+    @property
+    def tiene_cambios_pendientes(self) -> bool:
+        """Indica si hay cambios en memoria que aún no están en disco."""
+        return self._cambios_pendientes
+
+    def _almacen_sqlite(self) -> AlmacenSQLite:
+        """Abre la base del motor SQLite, creándola desde el libro si no existe."""
+        if self._almacen is not None:
+            return self._almacen
+
+        ruta = self.archivos_asociados(self.archivo_path)[1]
+        if not os.path.exists(ruta):
+            # Se importa en un archivo aparte para no dejar una base a medias
+            temporal = f"{ruta}.tmp"
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            almacen = AlmacenSQLite(temporal)
+            try:
+                almacen.importar(
+                    datos[1:] for _, datos in self._iterar_libro(como_tupla=True)
+                )
+            finally:
+                almacen.cerrar()
+            os.replace(temporal, ruta)
+
+        self._almacen = AlmacenSQLite(ruta)
+        return self._almacen
+
+    def _abrir_libro(self):
+        """Carga el libro para escritura, reutilizándolo en modo sesión."""
+        if self.modo_sesion and self._wb is not None:
+            return self._wb
+
+        self._validar_datos_en_memoria()
+        wb = load_workbook(self.archivo_path)
+
+        if not wb.worksheets:
+            raise Exception("No se pudo acceder a la hoja de trabajo")
+
+        if self.modo_sesion:
+            self._wb = wb
+        return wb
+
+    @contextmanager
+    def _libro_lectura(self):
+        """Entrega el libro para lectura: el de la sesión o una carga read-only."""
+        if self.modo_sesion:
+            with self._lock:
+                yield self._abrir_libro()
+            return
+
+        self._validar_datos_en_memoria()
+        wb = load_workbook(self.archivo_path, read_only=True)
+        try:
+            if not wb.worksheets:
+                raise Exception("No se pudo acceder a la hoja de trabajo")
+            yield wb
+        finally:
+            wb.close()
+
+    def _ubicar(self, wb, fila: int, crear: bool = False):
+        """Traduce una fila global a (hoja, fila en la hoja).
+
+        Con ``crear=True`` agrega las hojas que falten; si no, devuelve
+        (None, None) cuando la hoja no existe.
+        """
+        indice = fila - self.FILA_INICIO_DATOS
+        if indice < 0:
+            raise Exception(f"La fila {fila} está fuera del área de datos")
+
+        pagina, desplazamiento = divmod(indice, self.CAPACIDAD_HOJA)
+        if pagina >= len(wb.worksheets):
+            if not crear:
+                return None, None
+            while pagina >= len(wb.worksheets):
+                self._agregar_pagina(wb)
+        return wb.worksheets[pagina], self.FILA_INICIO_DATOS + desplazamiento
+
+    def _agregar_pagina(self, wb):
+        """Agrega una hoja con el formato de la primera y el área de datos vacía."""
+        base = wb.worksheets[0]
+        nueva = wb.copy_worksheet(base)
+        nueva.title = f"{base.title} ({len(wb.worksheets)})"
+        self._limpiar_area_datos(nueva)
+        return nueva
+
+    def _ajustar_paginas(self, wb, num_registros: int):
+        """Deja exactamente las hojas necesarias para ``num_registros`` registros."""
+        necesarias = max(1, -(-num_registros // self.CAPACIDAD_HOJA))
+        while len(wb.worksheets) < necesarias:
+            self._agregar_pagina(wb)
+        while len(wb.worksheets) > necesarias:
+            wb.remove(wb.worksheets[-1])
+
+    def _valores_datos(self, wb, min_col: int = 1, max_col: int = ULTIMA_COLUMNA_DATOS):
+        """Genera (fila global, valores) del área de datos de todas las hojas."""
+        for pagina, ws in enumerate(wb.worksheets):
+            filas = ws.iter_rows(
+                min_row=self.FILA_INICIO_DATOS,
+                max_row=self.FILA_MAXIMA_DATOS_PARA_LIMPIAR,
+                min_col=min_col,
+                max_col=max_col,
+                values_only=True,
+            )
+            inicio = self.FILA_INICIO_DATOS + pagina * self.CAPACIDAD_HOJA
+            yield from enumerate(filas, start=inicio)
+
+    def _persistir(self, wb):
+        """Guarda el libro, o lo marca como pendiente en modo sesión."""
+        if not self.modo_sesion:
+            self._escribir_libro(wb)
+            return
+
+        self._cambios_pendientes = True
+        self._cancelar_temporizador()
+        self._temporizador = threading.Timer(self.retraso_guardado, self.guardar_cambios)
+        self._temporizador.daemon = True
+        self._temporizador.start()
+
+    def _cancelar_temporizador(self):
+        """Cancela el guardado diferido programado, si existe."""
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+
+    def _escribir_libro(self, wb):
+        """Guarda el libro de forma atómica (archivo temporal + reemplazo).
+
+        Si el proceso se interrumpe durante la escritura, el archivo original
+        queda intacto en lugar de un .xlsx truncado.
+        """
+        directorio = os.path.dirname(os.path.abspath(self.archivo_path))
+        fd, temporal = tempfile.mkstemp(suffix=".xlsx.tmp", dir=directorio)
+        os.close(fd)
+        try:
+            if os.path.exists(self.archivo_path):
+                shutil.copymode(self.archivo_path, temporal)
+            wb.save(temporal)
+            os.replace(temporal, self.archivo_path)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+        self._guardar_totales_persistidos()
+        self._firma_indice = self._firma_totales
+
+    def _firma_archivo(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, tamaño) del libro, o None si no existe."""
+        try:
+            estado = os.stat(self.archivo_path)
+        except OSError:
+            return None
+        return estado.st_mtime_ns, estado.st_size
+
+    def _validar_datos_en_memoria(self):
+        """Descarta los totales y el índice en memoria si el libro cambió fuera del gestor."""
+        firma = self._firma_archivo()
+        if self._totales is not None and self._firma_totales != firma:
+            self._totales = None
+        if self._indice is not None and self._firma_indice != firma:
+            self._indice = None
+
+    def _leer_totales_persistidos(self) -> Optional[Tuple[int, int, List[int]]]:
+        """Lee los totales guardados si corresponden a la versión actual del libro."""
+        ruta = self.archivos_asociados(self.archivo_path)[0]
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+            if tuple(datos["firma"]) != self._firma_archivo():
+                return None
+            totales = (
+                int(datos["num_registros"]),
+                int(datos["total_si"]),
+                [int(t) for t in datos["totales_motivos"]],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        self._firma_totales = self._firma_archivo()
+        return totales
+
+    def _guardar_totales_persistidos(self):
+        """Guarda los totales en memoria asociados a la versión recién escrita."""
+        firma = self._firma_archivo()
+        self._firma_totales = firma
+        if self._totales is None or firma is None:
+            return
+
+        num_registros, total_si, totales_motivos = self._totales
+        ruta = self.archivos_asociados(self.archivo_path)[0]
+        temporal = f"{ruta}.tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "firma": list(firma),
+                        "num_registros": num_registros,
+                        "total_si": total_si,
+                        "totales_motivos": totales_motivos,
+                    },
+                    f,
+                )
+            os.replace(temporal, ruta)
+        except OSError:
+            # Los totales se pueden recalcular; no impiden el guardado del libro
+            pass
+
+    def _primera_fila_vacia(self, wb) -> int:
+        """Devuelve la primera fila global sin radicado (puede estar en una hoja nueva)."""
+        fila_destino = self.FILA_INICIO_DATOS
+        for fila_destino, (radicado,) in self._valores_datos(
+            wb, self.COLUMNA_RADICADO, self.COLUMNA_RADICADO
+        ):
+            if radicado is None:
+                return fila_destino
+        return fila_destino + 1
+
+    # Las fechas y horas se interpretan una sola vez por texto distinto
+    _clave_orden = staticmethod(clave_orden)
+
+    def _claves_si_ordenada(self, wb) -> Optional[List[tuple]]:
+        """Devuelve las claves de orden de la hoja si ya está ordenada y compacta.
+
+        Solo lee valores (número, radicado, fecha y hora) de todas las hojas;
+        devuelve None si el modo incremental está desactivado o si el libro
+        necesita un reordenamiento completo (huecos, numeración u orden
+        incorrectos).
+        """
+        if not self.ordenamiento_incremental:
+            return None
+
+        claves = []
+        fin_datos = False
+        for _, row in self._valores_datos(wb, max_col=5):
+            if not row[1]:
+                fin_datos = True
+                continue
+            if fin_datos or row[0] != len(claves) + 1:
+                return None
+            clave = self._clave_orden(row[3], row[4])
+            if claves and clave > claves[-1]:
+                return None
+            claves.append(clave)
+        return claves
+
+    @staticmethod
+    def _buscar_posicion(claves: List[tuple], clave: tuple) -> int:
+        """Búsqueda binaria de la posición de inserción en orden descendente.
+
+        Ante claves iguales el registro queda después de los existentes,
+        igual que el ordenamiento estable completo.
+        """
+        inicio, fin = 0, len(claves)
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            if claves[medio] >= clave:
+                inicio = medio + 1
+            else:
+                fin = medio
+        return inicio
+
+    def _copiar_registro(self, wb, origen: int, destino: int):
+        """Copia los valores de datos (sin el número) de una fila global a otra."""
+        ws_origen, fila_origen = self._ubicar(wb, origen)
+        ws_destino, fila_destino = self._ubicar(wb, destino, crear=True)
+        for col in range(self.COLUMNA_RADICADO, self.ULTIMA_COLUMNA_DATOS + 1):
+            ws_destino.cell(row=fila_destino, column=col).value = \
+                ws_origen.cell(row=fila_origen, column=col).value
+
+    def _insertar_ordenado(self, wb, claves: List[tuple], audiencia: Audiencia):
+        """Inserta la audiencia en su posición desplazando solo las filas siguientes."""
+        n = len(claves)
+        ws_final, fila_final = self._ubicar(wb, self.FILA_INICIO_DATOS + n, crear=True)
+
+        posicion = self._buscar_posicion(claves, audiencia.clave_orden)
+        for indice in range(n - 1, posicion - 1, -1):
+            fila = self.FILA_INICIO_DATOS + indice
+            self._copiar_registro(wb, fila, fila + 1)
+
+        self._escribir_registro(wb, self.FILA_INICIO_DATOS + posicion, audiencia)
+        ws_final.cell(row=fila_final, column=1).value = n + 1
+        return posicion
+
+    def _reubicar_ordenado(
+        self, wb, claves: List[tuple], indice: int, audiencia: Audiencia
+    ):
+        """Actualiza el registro en ``indice`` moviendo solo las filas intermedias."""
+        restantes = claves[:indice] + claves[indice + 1:]
+        clave = audiencia.clave_orden
+
+        # Entre claves iguales se conserva la posición relativa original,
+        # como haría el ordenamiento estable completo.
+        inicio, fin = 0, len(restantes)
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            if restantes[medio] > clave or (restantes[medio] == clave and medio < indice):
+                inicio = medio + 1
+            else:
+                fin = medio
+        nueva = inicio
+
+        if nueva < indice:
+            for i in range(indice - 1, nueva - 1, -1):
+                fila = self.FILA_INICIO_DATOS + i
+                self._copiar_registro(wb, fila, fila + 1)
+        elif nueva > indice:
+            for i in range(indice + 1, nueva + 1):
+                fila = self.FILA_INICIO_DATOS + i
+                self._copiar_registro(wb, fila, fila - 1)
+
+        self._escribir_registro(wb, self.FILA_INICIO_DATOS + nueva, audiencia)
+        return nueva
+
+    @staticmethod
+    def _clave_radicado(radicado) -> Optional[str]:
+        """Radicado normalizado para el índice (None si está vacío)."""
+        if radicado is None:
+            return None
+        return str(radicado).strip() or None
+
+    def _indice_radicados(self) -> Dict[str, List[int]]:
+        """Índice radicado → filas, construido una vez por versión del archivo."""
+        if not (self.modo_sesion and self._wb is not None):
+            self._validar_datos_en_memoria()
+        if self._indice is None:
+            with self._libro_lectura() as wb:
+                radicados = [
+                    self._clave_radicado(radicado)
+                    for _, (radicado,) in self._valores_datos(
+                        wb, self.COLUMNA_RADICADO, self.COLUMNA_RADICADO
+                    )
+                ]
+            while radicados and radicados[-1] is None:
+                radicados.pop()
+            indice: Dict[str, List[int]] = {}
+            for posicion, radicado in enumerate(radicados):
+                if radicado is not None:
+                    indice.setdefault(radicado, []).append(self.FILA_INICIO_DATOS + posicion)
+            self._radicados = radicados
+            self._indice = indice
+            self._firma_indice = self._firma_archivo()
+        return self._indice
+
+    def _indice_asignar(self, posicion: int, radicado: Optional[str]):
+        """Pone ``radicado`` en una posición del índice, reemplazando el anterior."""
+        if self._indice is None:
+            return
+        while len(self._radicados) <= posicion:
+            self._radicados.append(None)
+
+        fila = self.FILA_INICIO_DATOS + posicion
+        anterior = self._radicados[posicion]
+        if anterior is not None:
+            filas = self._indice[anterior]
+            filas.remove(fila)
+            if not filas:
+                del self._indice[anterior]
+
+        clave = self._clave_radicado(radicado)
+        self._radicados[posicion] = clave
+        if clave is not None:
+            self._indice.setdefault(clave, []).append(fila)
+
+    def _desplazar_indice(self, desde: int, delta: int):
+        """Mueve ``delta`` filas las entradas del índice a partir de una posición."""
+        for posicion in range(desde, len(self._radicados)):
+            radicado = self._radicados[posicion]
+            if radicado is not None:
+                filas = self._indice[radicado]
+                fila = self.FILA_INICIO_DATOS + posicion
+                filas[filas.index(fila)] = fila + delta
+
+    def _indice_insertar(self, posicion: int, radicado: str):
+        """Refleja en el índice un registro insertado que desplaza los siguientes."""
+        if self._indice is None:
+            return
+        self._desplazar_indice(posicion, 1)
+        self._radicados.insert(posicion, None)
+        self._indice_asignar(posicion, radicado)
+
+    def _indice_eliminar(self, posicion: int):
+        """Refleja en el índice un registro eliminado que sube los siguientes."""
+        if self._indice is None:
+            return
+        self._indice_asignar(posicion, None)
+        self._desplazar_indice(posicion + 1, -1)
+        del self._radicados[posicion]
+
+    def _totales_actuales(self, wb) -> Tuple[int, int, List[int]]:
+        """Totales vigentes: en memoria, persistidos o por recuento completo."""
+        if self._totales is None:
+            self._totales = self._leer_totales_persistidos() or self._calcular_totales(wb)
+        return self._totales
+
+    @staticmethod
+    def _aporte(realizada_si, motivos) -> Tuple[int, int]:
+        """Aporte de un registro a los totales: (realizada SI, máscara de motivos)."""
+        return 1 if realizada_si == "SI" else 0, mascara_motivos(motivos)
+
+    def _aporte_audiencia(self, audiencia: Audiencia) -> Tuple[int, int]:
+        """Aporte de una audiencia a los totales."""
+        return 1 if audiencia.realizada_si == "SI" else 0, audiencia.mascara_motivos
+
+    def _aporte_fila(self, wb, fila: int) -> Optional[Tuple[int, int]]:
+        """Aporte a los totales del registro escrito en una fila (None si está vacía)."""
+        ws, fila_hoja = self._ubicar(wb, fila)
+        if ws is None or not ws.cell(row=fila_hoja, column=self.COLUMNA_RADICADO).value:
+            return None
+        return self._aporte(
+            ws.cell(row=fila_hoja, column=7).value,
+            [ws.cell(row=fila_hoja, column=9 + i).value for i in range(8)],
+        )
+
+    def _sumar_aporte(self, signo: int, aporte: Optional[Tuple[int, int]]):
+        """Aplica (signo=1) o retira (signo=-1) un aporte de los totales en memoria."""
+        if aporte is None:
+            return
+        num_registros, total_si, totales_motivos = self._totales
+        si, mascara = aporte
+        self._totales = (
+            num_registros + signo,
+            total_si + signo * si,
+            [t + signo * (mascara >> i & 1) for i, t in enumerate(totales_motivos)],
+        )
+
+    def _escribir_totales_actuales(self, wb) -> Tuple[int, int, List[int]]:
+        """Escribe en el libro los totales en memoria y los devuelve."""
+        self._verificar_incremental(wb)
+        num_registros, total_si, totales_motivos = self._totales
+        self._escribir_totales(wb, total_si, totales_motivos)
+        return num_registros, total_si, list(totales_motivos)
+
+    def _verificar_incremental(self, wb):
+        """En modo verificación, compara los totales incrementales con un recuento."""
+        if not self.verificacion_totales:
+            return
+        recuento = self._calcular_totales(wb)
+        if recuento != self._totales:
+            esperado = self._totales
+            self._totales = recuento
+            raise Exception(
+                f"Totales incrementales inconsistentes: {esperado} != {recuento}"
+            )
+
+    def _escribir_registro(self, wb, fila: int, audiencia: Audiencia):
+        """Escribe una audiencia en una fila global, creando la hoja si hace falta."""
+        ws, fila_hoja = self._ubicar(wb, fila, crear=True)
+        self._escribir_fila_audiencia(ws, fila_hoja, audiencia)
+
     def _escribir_fila_audiencia(self, ws, fila: int, audiencia: Audiencia):
         """Escribe los datos de una audiencia en una fila específica."""
         ws.cell(row=fila, column=2, value=audiencia.radicado)
@@ -75,104 +916,207 @@ class ExcelManager:
     def leer_registros(self) -> List[Tuple[int, List]]:
         """Lee todos los registros del archivo."""
         try:
-            wb = load_workbook(self.archivo_path, read_only=True)
-            ws = wb.active
+            return [(fila, list(datos)) for fila, datos in self.iterar_registros()]
+        except Exception as e:
+            raise Exception(f"Error al leer registros: {e}")
 
-            if ws is None:
-                raise Exception("No se pudo acceder a la hoja de trabajo")
+    def iterar_registros(self, como_tupla: bool = False) -> Iterator[Tuple[int, Sequence]]:
+        """Genera (fila, valores) recorriendo la hoja en streaming.
 
-            registros = []
-            for fila_num in range(self.FILA_INICIO_DATOS, ws.max_row + 1):
-                datos_fila = [cell.value for cell in ws[fila_num]]
-                if datos_fila[1]:  # Si hay radicado
-                    registros.append((fila_num, datos_fila))
+        Usa ``iter_rows(values_only=True)`` sin materializar celdas, recorre
+        todas las hojas en orden y se detiene tras ``FILAS_VACIAS_FIN_DATOS``
+        filas seguidas sin radicado. Con ``como_tupla=True`` entrega los
+        valores como tupla, sin copiarlos a una lista. En el motor SQLite las
+        filas salen de la base con el número y la fila que tendrían en el libro.
+        """
+        if self.motor == "sqlite":
+            with self._lock:
+                almacen = self._almacen_sqlite()
+            for numero, datos in enumerate(almacen.iterar(), start=1):
+                valores = (numero,) + datos
+                yield (self.FILA_INICIO_DATOS + numero - 1,
+                       valores if como_tupla else list(valores))
+            return
 
-            return registros
+        yield from self._iterar_libro(como_tupla)
 
-        except Exception as e:
-            raise Exception(f"Error al leer registros: {e}")
+    def _iterar_libro(self, como_tupla: bool) -> Iterator[Tuple[int, Sequence]]:
+        """Recorre los registros del libro .xlsx (o el de la sesión)."""
+        if self.modo_sesion:
+            with self._lock:
+                wb = self._abrir_libro()
+            yield from self._filas_con_radicado(wb, como_tupla)
+            return
+
+        wb = load_workbook(self.archivo_path, read_only=True)
+        try:
+            if not wb.worksheets:
+                raise Exception("No se pudo acceder a la hoja de trabajo")
+            yield from self._filas_con_radicado(wb, como_tupla)
+        finally:
+            wb.close()
+
+    def _filas_con_radicado(self, wb, como_tupla: bool) -> Iterator[Tuple[int, Sequence]]:
+        """Recorre el área de datos y entrega solo las filas con radicado."""
+        vacias = 0
+        for fila_num, datos in self._valores_datos(wb):
+            if not datos[1]:  # Si no hay radicado
+                vacias += 1
+                if vacias >= self.FILAS_VACIAS_FIN_DATOS:
+                    return
+                continue
+            vacias = 0
+            yield fila_num, (datos if como_tupla else list(datos))
 
     def reordenar_y_guardar(self) -> Tuple[int, int, List[int]]:
         """Reordena todos los registros por fecha/hora y calcula totales."""
         try:
-            wb = load_workbook(self.archivo_path)
-            ws = wb.active
+            with self._lock:
+                if self.motor == "sqlite":
+                    # La base entrega los registros siempre ordenados
+                    return self._almacen_sqlite().totales()
 
-            if ws is None:
-                raise Exception("No se pudo acceder a la hoja de trabajo")
+                wb = self._abrir_libro()
+                resultado = self._reordenar_libro(wb)
+                self._persistir(wb)
+            return resultado
 
-            # Leer y ordenar datos
-            datos_tabla = []
-            for row in ws.iter_rows(
-                min_row=self.FILA_INICIO_DATOS, max_row=ws.max_row, values_only=True
-            ):
-                if not row or not row[1]:  # Si no hay radicado
-                    continue
-                try:
-                    f = datetime.strptime(str(row[3]), "%d/%m/%Y")
-                    h = datetime.strptime(str(row[4]), "%H:%M")
-                    datos_tabla.append((f, h, list(row)))
-                except (ValueError, TypeError):
-                    continue
-
-            datos_tabla.sort(key=lambda x: (x[0], x[1]), reverse=True)
-
-            # Limpiar área de datos
-            self._limpiar_area_datos(ws)
+        except Exception as e:
+            raise Exception(f"Error al reordenar: {e}")
 
-            # Escribir datos ordenados
-            for idx, (_, _, fila_datos) in enumerate(datos_tabla, start=1):
-                ws.cell(row=self.FILA_INICIO_DATOS + idx - 1, column=1, value=idx)
-                for col, val in enumerate(fila_datos[1:], start=2):
-                    ws.cell(row=self.FILA_INICIO_DATOS + idx - 1, column=col, value=val)
+    def _reordenar_libro(
+        self, wb, nuevas: Sequence[Audiencia] = ()
+    ) -> Tuple[int, int, List[int]]:
+        """Reordena en memoria todas las hojas por fecha/hora y escribe los totales.
 
-            # Calcular y escribir totales
-            num_registros, total_si, totales_motivos = self._calcular_totales(ws)
-            self._escribir_totales(ws, total_si, totales_motivos)
+        ``nuevas`` son audiencias que se agregan después de las existentes
+        antes de ordenar.
+        """
+        # Leer y ordenar datos; las filas con fecha u hora inválida quedan al final
+        registros = self._registros_libro(wb)
+        registros.extend(Registro.desde_audiencia(audiencia) for audiencia in nuevas)
+        registros.sort(key=attrgetter("clave"), reverse=True)
 
-            wb.save(self.archivo_path)
-            return num_registros, total_si, totales_motivos
+        self._volcar_registros(wb, registros)
 
-        except Exception as e:
-            raise Exception(f"Error al reordenar: {e}")
+        # Las filas cambiaron de lugar: el índice se reconstruye al consultarlo
+        self._indice = None
+
+        # Calcular y escribir totales
+        self._totales = self._totales_registros(registros)
+        return self._escribir_totales_actuales(wb)
+
+    def _registros_libro(self, wb) -> List[Registro]:
+        """Lee en forma compacta todas las filas con radicado del libro."""
+        return [
+            Registro.desde_valores(row)
+            for _, row in self._valores_datos(wb, self.COLUMNA_RADICADO)
+            if row and row[0]
+        ]
+
+    def _volcar_registros(self, wb, registros: Sequence[Registro]):
+        """Reescribe el área de datos de todas las hojas con ``registros``."""
+        # Limpiar área de datos y dejar solo las hojas necesarias
+        for ws in wb.worksheets:
+            self._limpiar_area_datos(ws)
+        self._ajustar_paginas(wb, len(registros))
+
+        # Escribir datos numerados
+        for idx, registro in enumerate(registros, start=1):
+            ws, fila = self._ubicar(wb, self.FILA_INICIO_DATOS + idx - 1)
+            ws.cell(row=fila, column=1, value=idx)
+            for col, val in enumerate(registro.valores(), start=2):
+                ws.cell(row=fila, column=col, value=val)
 
     def _limpiar_area_datos(self, ws):
         """Limpia el área de datos en la hoja."""
+        # ws.cell(..., value=None) no modifica la celda, hay que asignar .value
         for i in range(self.FILA_INICIO_DATOS, self.FILA_MAXIMA_DATOS_PARA_LIMPIAR + 1):
             for j in range(1, 21):
-                ws.cell(row=i, column=j, value=None)
+                ws.cell(row=i, column=j).value = None
+
+    @staticmethod
+    def _totales_registros(registros: Sequence[Registro]) -> Tuple[int, int, List[int]]:
+        """Calcula los totales a partir de registros ya leídos."""
+        total_si = sum(1 for registro in registros if registro.realizada_si == "SI")
+        totales_motivos = contar_motivos(registro.motivos for registro in registros)
+        return len(registros), total_si, totales_motivos
 
-    def _calcular_totales(self, ws) -> Tuple[int, int, List[int]]:
-        """Calcula los totales de la hoja."""
-        totales_motivos = [0] * 8
+    def _calcular_totales(self, wb) -> Tuple[int, int, List[int]]:
+        """Calcula los totales de todas las hojas del libro."""
+        mascaras = []
         total_si = 0
-        num_registros = 0
 
-        for fila in range(
-            self.FILA_INICIO_DATOS, self.FILA_MAXIMA_DATOS_PARA_LIMPIAR + 1
-        ):
-            if ws.cell(row=fila, column=2).value:  # Si hay radicado
-                num_registros += 1
-                if ws.cell(row=fila, column=7).value == "SI":
+        for _, row in self._valores_datos(wb, self.COLUMNA_RADICADO, 16):
+            if row[0]:  # Si hay radicado
+                if row[5] == "SI":
                     total_si += 1
-                for i in range(8):
-                    if ws.cell(row=fila, column=9 + i).value:
-                        totales_motivos[i] += 1
+                mascaras.append(mascara_motivos(row[7:15]))
 
-        return num_registros, total_si, totales_motivos
+        return len(mascaras), total_si, contar_motivos(mascaras)
 
-    def _escribir_totales(self, ws, total_si: int, totales_motivos: List[int]):
-        """Escribe los totales en la hoja."""
+    def _escribir_totales(self, wb, total_si: int, totales_motivos: List[int]):
+        """Escribe los totales del libro en la última hoja.
+
+        Las hojas anteriores muestran "CONTINÚA" en lugar de totales.
+        """
+        paginas = wb.worksheets
+        for ws in paginas[:-1]:
+            ws.cell(row=self.FILA_TOTALES, column=self.COLUMNA_ETIQUETA_TOTALES).value = "CONTINÚA"
+            ws.cell(row=self.FILA_TOTALES, column=7).value = None
+            for i in range(8):
+                ws.cell(row=self.FILA_TOTALES, column=9 + i).value = None
+
+        ws = paginas[-1]
+        ws.cell(row=self.FILA_TOTALES, column=self.COLUMNA_ETIQUETA_TOTALES).value = "TOTAL:"
         ws.cell(row=self.FILA_TOTALES, column=7, value=total_si)
         for i, total in enumerate(totales_motivos):
             ws.cell(row=self.FILA_TOTALES, column=9 + i, value=total)
 
     def contar_registros(self) -> int:
-        """Cuenta el número de registros en el archivo."""
+        """Cuenta el número de registros en el archivo.
+
+        Usa, en orden: el libro de la sesión, los totales en memoria o
+        persistidos de la versión actual del archivo, el último conteo de esa
+        versión y, solo si nada de eso sirve, un recorrido de la columna B.
+        """
         try:
-            wb = load_workbook(self.archivo_path, read_only=True)
-            ws = wb.active
-            num_registros, _, _ = self._calcular_totales(ws)
-            return num_registros
+            with self._lock:
+                if self.motor == "sqlite":
+                    return self._almacen_sqlite().contar()
+
+                if self.modo_sesion and self._wb is not None:
+                    num_registros, _, _ = self._totales_actuales(self._wb)
+                    return num_registros
+
+                firma = self._firma_archivo()
+                if self._totales is not None and self._firma_totales == firma:
+                    return self._totales[0]
+
+                totales = self._leer_totales_persistidos()
+                if totales is not None:
+                    self._totales = totales
+                    return totales[0]
+
+                if self._conteo is not None and self._conteo[0] == firma:
+                    return self._conteo[1]
+
+                num_registros = self._contar_columna_radicado()
+                self._conteo = (firma, num_registros)
+                return num_registros
         except Exception:
             return 0
+
+    def _contar_columna_radicado(self) -> int:
+        """Cuenta los radicados leyendo en streaming solo la columna B de cada hoja."""
+        wb = load_workbook(self.archivo_path, read_only=True)
+        try:
+            return sum(
+                1
+                for _, (radicado,) in self._valores_datos(
+                    wb, self.COLUMNA_RADICADO, self.COLUMNA_RADICADO
+                )
+                if radicado
+            )
+        finally:
+            wb.close()
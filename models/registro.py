@@ -0,0 +1,79 @@
+import sys
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+from .audiencia import ETIQUETAS_MOTIVOS, Audiencia, clave_orden, mascara_motivos
+
+
+def _compartir(valor):
+    """Comparte una sola copia de los textos que se repiten entre filas."""
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+@dataclass(slots=True)
+class Registro:
+    """Fila de datos de un libro en forma compacta, para trabajar en memoria.
+
+    Se usa al reordenar y al volcar registros: en lugar de la lista de
+    celdas y la tupla de fechas de cada fila, guarda la clave de orden como
+    entero y los motivos como máscara de bits (bit ``i`` = motivo ``i``
+    marcado). Los textos que se repiten (tipo, fecha, hora, juzgado, SI/NO)
+    se comparten entre registros.
+
+    Los motivos se escriben con ``ETIQUETAS_MOTIVOS``; solo si la fila trae
+    otros textos se conservan en ``etiquetas`` para no perderlos.
+    """
+
+    radicado: str
+    tipo: Optional[str]
+    fecha: Optional[str]
+    hora: Optional[str]
+    juzgado: Optional[str]
+    realizada_si: Optional[str]
+    realizada_no: Optional[str]
+    motivos: int
+    observaciones: Optional[str]
+    clave: int
+    etiquetas: Optional[Tuple] = None
+
+    @classmethod
+    def desde_valores(cls, valores: Sequence) -> "Registro":
+        """Crea el registro a partir de los valores de las columnas 2 a 17."""
+        valores = tuple(valores) + (None,) * (16 - len(valores))
+        radicado, tipo, fecha, hora, juzgado, si, no = valores[:7]
+        motivos = valores[7:15]
+
+        mascara = mascara_motivos(motivos)
+        etiquetas = None
+        if any(motivo and motivo != etiqueta
+               for motivo, etiqueta in zip(motivos, ETIQUETAS_MOTIVOS)):
+            etiquetas = tuple(motivos)
+
+        return cls(
+            radicado,
+            _compartir(tipo),
+            _compartir(fecha),
+            _compartir(hora),
+            _compartir(juzgado),
+            _compartir(si),
+            _compartir(no),
+            mascara,
+            valores[15],
+            clave_orden(fecha, hora),
+            etiquetas,
+        )
+
+    @classmethod
+    def desde_audiencia(cls, audiencia: Audiencia) -> "Registro":
+        """Crea el registro de una audiencia (las cadenas vacías quedan como celdas vacías)."""
+        return cls.desde_valores([valor or None for valor in audiencia.to_excel_row()])
+
+    def valores(self) -> tuple:
+        """Valores de las columnas 2 a 17, listos para escribir en la hoja."""
+        etiquetas = self.etiquetas or ETIQUETAS_MOTIVOS
+        return (
+            self.radicado, self.tipo, self.fecha, self.hora, self.juzgado,
+            self.realizada_si, self.realizada_no,
+            *(etiquetas[i] if self.motivos >> i & 1 else None for i in range(8)),
+            self.observaciones,
+        )
@@ -0,0 +1,188 @@
+"""
+PRUEBAS DEL ANONIMIZADOR
+========================
+Verifica que los datos sensibles no lleguen al texto anonimizado.
+"""
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from utils.anonimizador import (
+    AnonimizadorDatos,
+    CacheAnonimizacion,
+    MINIMO_TEXTOS_PARALELO,
+    anonimizador,
+    anonimizar_lote,
+    anonimizar_para_ia,
+    limpiar_cache_anonimizacion,
+    restaurar_datos_ia,
+)
+
+DICTADO = (
+    "El imputado RODRÍGUEZ VILLA, CARLOS ANDRÉS identificado con C.C. 1.234.567.890 "
+    "compareció. Celular: 300 123 4567, correo carlos.rodriguez@email.com. "
+    "Dirección: Carrera 15 #45-67, Medellín. Radicado 05001-60-00000-2024-00789-00. "
+    "Se volvió a llamar al 300 123 4567 sin respuesta."
+)
+SENSIBLES = [
+    "RODRÍGUEZ VILLA, CARLOS ANDRÉS",
+    "1.234.567.890",
+    "300 123 4567",
+    "carlos.rodriguez@email.com",
+    "05001-60-00000-2024-00789-00",
+]
+
+
+def test_datos_sensibles_no_quedan_en_el_texto():
+    texto, mapeo = anonimizar_para_ia(DICTADO)
+
+    for dato in SENSIBLES:
+        assert dato not in texto
+    for dato in SENSIBLES[1:]:
+        assert any(dato in original for original in mapeo.values())
+
+
+def test_cada_fragmento_se_reemplaza_una_sola_vez():
+    texto, mapeo = anonimizar_para_ia(DICTADO)
+
+    # Ninguna etapa reemplaza los valores ficticios que puso otra
+    for ficticio, original in mapeo.items():
+        assert ficticio in texto
+        assert original in DICTADO
+
+
+def test_restaurar_recupera_todos_los_datos():
+    texto, mapeo = anonimizar_para_ia(DICTADO)
+    respuesta = {"observaciones": texto, "radicado": texto[:11], "motivos": ["x"]}
+
+    restaurados = restaurar_datos_ia(respuesta, mapeo)
+
+    assert restaurados["observaciones"] == DICTADO
+    assert restaurados["radicado"] == DICTADO[:11]
+    assert restaurados["motivos"] == ["x"]
+
+
+def test_reintento_devuelve_el_mismo_resultado_guardado():
+    cache = CacheAnonimizacion(capacidad=2)
+    cache.guardar("dictado 1", "anonimo 1", {"X": "a"})
+    cache.guardar("dictado 2", "anonimo 2", {"Y": "b"})
+
+    texto, mapeo = cache.obtener("dictado 1")
+    assert (texto, mapeo) == ("anonimo 1", {"X": "a"})
+    mapeo["Z"] = "c"  # Modificar la copia no cambia lo guardado
+    assert cache.obtener("dictado 1")[1] == {"X": "a"}
+
+    # "dictado 2" es el menos usado y sale al llenarse
+    cache.guardar("dictado 3", "anonimo 3", {})
+    assert cache.obtener("dictado 2") is None
+    assert len(cache) == 2
+
+    cache.limpiar()
+    assert cache.obtener("dictado 1") is None
+
+
+def test_anonimizar_para_ia_usa_la_cache():
+    limpiar_cache_anonimizacion()
+    primero = anonimizar_para_ia(DICTADO)
+    assert anonimizar_para_ia(DICTADO) == primero
+
+
+def test_numeros_ficticios_estables_y_con_el_mismo_formato():
+    anonimizador = AnonimizadorDatos()
+    radicado = "05001-60-00000-2024-00789-00"
+    cedula = "C.C. 1.234.567.890"
+
+    ficticio = anonimizador._generar_radicado_ficticio(radicado)
+    assert ficticio == anonimizador._generar_radicado_ficticio(radicado)
+    assert ficticio != AnonimizadorDatos()._generar_radicado_ficticio(radicado)
+    assert [c.isdigit() for c in ficticio] == [c.isdigit() for c in radicado]
+    assert all(a != b for a, b in zip(ficticio, radicado) if b.isdigit())
+
+    ficticia = anonimizador._generar_cedula_ficticia(cedula)
+    assert ficticia.startswith("C.C. ") and ficticia.count(".") == cedula.count(".")
+    assert ficticia != cedula
+
+
+def test_lote_en_procesos_devuelve_un_mapeo_por_documento():
+    textos = [f"{DICTADO} Nota {i}." for i in range(MINIMO_TEXTOS_PARALELO)]
+    resultados = anonimizar_lote(textos, max_procesos=2)
+
+    assert len(resultados) == len(textos)
+    for texto, (texto_anonimo, mapeo) in zip(textos, resultados):
+        assert texto_anonimo.endswith(texto[-8:])  # mismo orden de entrada
+        assert "1.234.567.890" not in texto_anonimo
+        assert restaurar_datos_ia({"texto": texto_anonimo}, mapeo)["texto"] == texto
+    # Los procesos usan la clave de la sesión: mismos números ficticios
+    def cedula_ficticia(mapeo):
+        return next(ficticio for ficticio, original in mapeo.items() if "1.234.567.890" in original)
+
+    _, mapeo_local = anonimizador.anonimizar_texto(textos[0])
+    assert cedula_ficticia(resultados[0][1]) == cedula_ficticia(mapeo_local)
+
+
+def test_contexto_por_solicitud():
+    anonimizador = AnonimizadorDatos()
+    voz, texto = anonimizador.nuevo_contexto(), anonimizador.nuevo_contexto()
+
+    _, mapeo_voz = anonimizador.anonimizar_texto(DICTADO, voz)
+    _, mapeo_texto = anonimizador.anonimizar_texto("Firmó el Dr. PÉREZ.", texto)
+    assert "PÉREZ" not in mapeo_voz.values()
+    assert set(mapeo_texto.values()) == {"PÉREZ"}
+
+    # Los textos de una misma solicitud comparten valores ficticios y mapeo
+    segundo, mapeo_total = anonimizador.anonimizar_texto(f"Llamar al 300 123 4567. {DICTADO}", voz)
+    assert mapeo_total == mapeo_voz
+    assert restaurar_datos_ia({"texto": segundo}, mapeo_total)["texto"].startswith("Llamar al 300 123 4567.")
+
+    # Cada nombre del conjunto se entrega una sola vez por contexto
+    contexto = anonimizador.nuevo_contexto()
+    nombres = [contexto.tomar_nombre() for _ in anonimizador.nombres_ficticios]
+    assert sorted(nombres) == sorted(anonimizador.nombres_ficticios)
+    assert contexto.tomar_nombre().startswith("PERSONA_")
+
+
+def test_encabezado_del_juzgado_no_oculta_radicado_ni_tipo():
+    documento = (
+        "JUZGADO TERCERO PENAL MUNICIPAL\n"
+        "Radicado: 05001-60-00000-2024-00789-00\n"
+        "Audiencia de legalización de captura el 15/09/2024."
+    )
+    anonimizador = AnonimizadorDatos()
+    for anonimizar_juzgados in (False, True):
+        anonimizador.anonimizar_juzgados = anonimizar_juzgados
+        texto, mapeo = anonimizador.anonimizar_texto(documento)
+        lineas = texto.split("\n")
+
+        assert len(lineas) == 3
+        # Por defecto (ANONYMIZE_COURTS = False) el juzgado se conserva
+        assert (lineas[0] == "JUZGADO TERCERO PENAL MUNICIPAL") != anonimizar_juzgados
+        assert lineas[1].startswith("Radicado: ")
+        assert mapeo[lineas[1][len("Radicado: "):]] == "05001-60-00000-2024-00789-00"
+        assert lineas[2] == "Audiencia de legalización de captura el 15/09/2024."
+        restaurado = restaurar_datos_ia({"juzgado": lineas[0]}, mapeo)["juzgado"]
+        assert restaurado == "JUZGADO TERCERO PENAL MUNICIPAL"
+
+
+def test_juzgado_no_tapa_los_datos_que_contiene():
+    anonimizador = AnonimizadorDatos()
+    anonimizador.anonimizar_juzgados = True
+    texto, mapeo = anonimizador.anonimizar_texto(
+        "Ante el JUZGADO TERCERO PENAL radicado 05001-60-00000-2024-00789-00 hoy."
+    )
+    assert "05001-60-00000-2024-00789-00" in mapeo.values()
+    assert not any("radicado" in original for original in mapeo.values())
+    assert restaurar_datos_ia({"texto": texto}, mapeo)["texto"].endswith("2024-00789-00 hoy.")
+
+
+def test_dos_datos_con_el_mismo_ficticio_se_restauran_bien():
+    # Con esta clave T.P. 1077 y T.P. 1116 reciben el mismo primer valor ficticio
+    anonimizador = AnonimizadorDatos(b"k" * 32)
+    assert anonimizador._generar_numero_profesional("1077") == anonimizador._generar_numero_profesional("1116")
+
+    texto = "El abogado con T.P. 1077 y la abogada con T.P. 1116 asistieron."
+    texto_anonimo, mapeo = anonimizador.anonimizar_texto(texto)
+    assert sorted(mapeo.values()) == ["1077", "1116"]
+    assert restaurar_datos_ia({"texto": texto_anonimo}, mapeo)["texto"] == texto
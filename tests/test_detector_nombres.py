@@ -0,0 +1,70 @@
+"""
+PRUEBAS DEL DETECTOR DE NOMBRES
+===============================
+Verifica los formatos de nombre reconocidos y el tiempo lineal.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from utils.detector_nombres import buscar_nombres, clave_palabra, diccionario_nombres
+
+
+def nombres(texto):
+    return [texto[inicio:fin] for inicio, fin in buscar_nombres(texto)]
+
+
+def test_formatos_de_nombre():
+    assert nombres("El imputado RODRÍGUEZ VILLA, CARLOS ANDRÉS compareció") == [
+        "RODRÍGUEZ VILLA, CARLOS ANDRÉS"
+    ]
+    assert nombres("La víctima gonzález torres, maría helena no asistió") == [
+        "gonzález torres, maría helena"
+    ]
+    assert nombres("La defensora Ana Patricia HERNÁNDEZ declaró") == ["Ana Patricia HERNÁNDEZ"]
+    assert nombres("Juan de la Cruz Pérez declaró.") == ["Juan de la Cruz Pérez"]
+    # Un solo apellido se acepta después de un rol
+    assert nombres("Firmó el Dr. PÉREZ.") == ["PÉREZ"]
+    assert nombres("Firmó el acta GALLARDO.") == []
+
+
+def test_instituciones_y_frases_no_son_nombres():
+    assert nombres("Ante el JUZGADO PRIMERO PENAL DEL CIRCUITO DE MEDELLÍN.") == []
+    assert nombres("identificado con C.C. 1.234.567.890") == []
+    assert nombres("CARLOS PÉREZ, maría gómez y Luis RUIZ") == [
+        "CARLOS PÉREZ", "maría gómez", "Luis RUIZ"
+    ]
+
+
+def test_nombres_junto_a_instituciones_se_detectan():
+    assert nombres("Preside la Juez Isabel Torres Gómez.") == ["Isabel Torres Gómez"]
+    assert nombres("JUEZ ISABEL TORRES GÓMEZ") == ["ISABEL TORRES GÓMEZ"]
+    assert nombres("Fiscal 23 Seccional ISABEL TORRES compareció") == ["ISABEL TORRES"]
+    assert nombres("Sala Penal JORGE DÍAZ intervino") == ["JORGE DÍAZ"]
+    # La institución completa, con sus conectores, sigue sin ser un nombre
+    assert nombres("Juzgado Primero Penal del Circuito de Medellín") == []
+
+
+def test_diccionario_de_nombres():
+    conocidos = diccionario_nombres()
+    assert diccionario_nombres() is conocidos  # se carga una sola vez
+    assert clave_palabra("Rodríguez") in conocidos
+    assert clave_palabra("rodriguez") == clave_palabra("RODRÍGUEZ")
+    # Frases con forma de nombre pero sin nombres conocidos
+    assert nombres("cédula de ciudadanía número") == []
+    assert nombres("La SENTENCIA CONDENATORIA quedó en firme.") == []
+    # Sin tilde también se reconoce; un apellido conocido en MAYÚSCULAS basta
+    assert nombres("llamó a maria gomez") == ["maria gomez"]
+    assert nombres("Firmó el acta PÉREZ.") == ["PÉREZ"]
+
+
+def test_tiempo_lineal_con_entradas_adversarias():
+    # Con los patrones anteriores 2000 palabras tardaban varios segundos
+    for texto in ("PALABRA " * 20000 + ", X", "palabra " * 20000, "señor " * 20000):
+        inicio = time.perf_counter()
+        list(buscar_nombres(texto))
+        assert time.perf_counter() - inicio < 1
@@ -0,0 +1,122 @@
+"""
+PRUEBAS DEL EJECUTOR DE E/S
+===========================
+Verifica el orden por libro, la entrega de callbacks y el estado de ocupado.
+"""
+import sys
+import threading
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from utils.ejecutor_io import EjecutorIO
+
+
+def test_operaciones_de_un_libro_en_orden_y_fuera_del_hilo_llamador():
+    ejecutor = EjecutorIO()
+    orden = []
+    hilos = set()
+
+    def operacion(i):
+        hilos.add(threading.current_thread().name)
+        orden.append(i)
+        return i
+
+    futuros = [ejecutor.enviar("a.xlsx", lambda i=i: operacion(i)) for i in range(20)]
+    assert [f.result(timeout=5) for f in futuros] == list(range(20))
+    assert orden == list(range(20))
+    assert threading.current_thread().name not in hilos
+    ejecutor.cerrar()
+
+
+def test_callbacks_y_estado_pasan_por_despachar():
+    despachados = []
+    terminado = threading.Event()
+
+    def despachar(funcion, *args):
+        despachados.append(funcion.__name__)
+        funcion(*args)
+
+    estados = []
+    resultados = []
+    errores = []
+
+    def al_cambiar_estado(ocupado):
+        estados.append(ocupado)
+        if not ocupado:
+            terminado.set()
+
+    def al_terminar(resultado):
+        resultados.append(resultado)
+
+    def al_fallar(error):
+        errores.append(str(error))
+
+    def fallar():
+        raise Exception("libro bloqueado")
+
+    ejecutor = EjecutorIO(despachar=despachar, al_cambiar_estado=al_cambiar_estado)
+    bloqueo = threading.Event()
+    ejecutor.enviar("a.xlsx", lambda: bloqueo.wait(5) and 7, al_terminar)
+    ejecutor.enviar("a.xlsx", fallar, al_terminar, al_fallar)
+    assert ejecutor.ocupado
+
+    bloqueo.set()
+    assert terminado.wait(5)
+    ejecutor.cerrar()
+
+    assert resultados == [7]
+    assert errores == ["libro bloqueado"]
+    assert estados == [True, False]
+    assert not ejecutor.ocupado
+    assert "al_terminar" in despachados and "al_fallar" in despachados
+
+
+def test_liberar_no_deja_dos_colas_sobre_el_mismo_libro():
+    ejecutor = EjecutorIO()
+    bloqueo = threading.Event()
+    orden = []
+
+    def vieja():
+        bloqueo.wait(5)
+        orden.append("vieja")
+
+    ejecutor.enviar("a.xlsx", vieja)
+    ejecutor.liberar("a.xlsx")
+    # La cola nueva del mismo libro espera a que la anterior termine
+    nueva = ejecutor.enviar("a.xlsx", lambda: orden.append("nueva"))
+    assert not nueva.done()
+
+    bloqueo.set()
+    nueva.result(timeout=5)
+    assert orden == ["vieja", "nueva"]
+    ejecutor.cerrar()
+
+
+def test_liberar_justo_despues_de_buscar_la_cola_no_pierde_el_envio():
+    ejecutor = EjecutorIO()
+    ejecutor.enviar("a.xlsx", lambda: None).result(timeout=5)
+    lock = ejecutor._lock
+
+    class LockQueLibera:
+        """Simula otro hilo que llama a liberar apenas enviar suelta el lock."""
+        pendiente = True
+
+        def __enter__(self):
+            lock.acquire()
+
+        def __exit__(self, *_):
+            lock.release()
+            if LockQueLibera.pendiente:
+                LockQueLibera.pendiente = False
+                ejecutor.liberar("a.xlsx")
+
+    ejecutor._lock = LockQueLibera()
+    futuro = ejecutor.enviar("a.xlsx", lambda: 7)
+    ejecutor._lock = lock
+
+    assert futuro.result(timeout=5) == 7
+    ejecutor.cerrar()
+    assert not ejecutor.ocupado
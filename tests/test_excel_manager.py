@@ -0,0 +1,519 @@
+"""
+PRUEBAS DEL GESTOR DE EXCEL
+===========================
+Verifica guardado, ordenamiento y totales sobre copias temporales de la plantilla.
+"""
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+from openpyxl.workbook.workbook import Workbook
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from models.audiencia import CLAVE_INVALIDA, Audiencia
+from models.almacen_sqlite import AlmacenSQLite
+from models.excel_manager import ExcelManager
+
+PLANTILLA = proyecto_root / "templates" / "plantilla_audiencias.xlsx"
+
+
+def crear_audiencia(radicado: str, fecha: str, hora: str, realizada: bool = True,
+                    motivos=None) -> Audiencia:
+    """Crea una audiencia de prueba con valores por defecto."""
+    motivos = motivos or [""] * 8
+    return Audiencia(
+        radicado=radicado,
+        tipo="Audiencia preliminar",
+        fecha=fecha,
+        hora=hora,
+        juzgado="Juzgado de prueba",
+        realizada_si="SI" if realizada else "",
+        realizada_no="" if realizada else "NO",
+        motivos=motivos,
+        observaciones="",
+    )
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    """Copia la plantilla a un directorio temporal."""
+    destino = tmp_path / "audiencias.xlsx"
+    shutil.copy2(PLANTILLA, destino)
+    return str(destino)
+
+
+def leer_columna(archivo_path: str, columna: int, filas: int):
+    """Lee los primeros valores de una columna del área de datos."""
+    ws = load_workbook(archivo_path).active
+    return [
+        ws.cell(row=ExcelManager.FILA_INICIO_DATOS + i, column=columna).value
+        for i in range(filas)
+    ]
+
+
+def test_guardar_y_reordenar_una_sola_escritura(archivo, monkeypatch):
+    """Cada guardado debe escribir el libro exactamente una vez."""
+    manager = ExcelManager(archivo)
+    guardados = []
+    save_original = Workbook.save
+
+    def save_contado(self, filename):
+        guardados.append(filename)
+        return save_original(self, filename)
+
+    monkeypatch.setattr(Workbook, "save", save_contado)
+
+    manager.guardar_y_reordenar(crear_audiencia("R-1", "01/02/2025", "08:00"))
+    manager.guardar_y_reordenar(crear_audiencia("R-2", "03/02/2025", "08:00"))
+    num, total_si, totales = manager.guardar_y_reordenar(
+        crear_audiencia("R-3", "02/02/2025", "09:30", realizada=False,
+                        motivos=["Juez"] + [""] * 7)
+    )
+
+    assert len(guardados) == 3
+    assert (num, total_si) == (3, 2)
+    assert totales == [1, 0, 0, 0, 0, 0, 0, 0]
+    assert leer_columna(archivo, 2, 3) == ["R-2", "R-3", "R-1"]
+    assert leer_columna(archivo, 1, 3) == [1, 2, 3]
+
+
+def test_actualizar_y_reordenar(archivo):
+    """La actualización reubica el registro según su nueva fecha."""
+    manager = ExcelManager(archivo)
+    manager.guardar_y_reordenar(crear_audiencia("R-1", "01/02/2025", "08:00"))
+    manager.guardar_y_reordenar(crear_audiencia("R-2", "03/02/2025", "08:00"))
+
+    # R-2 está en la primera fila; se mueve a una fecha anterior
+    fila_r2 = ExcelManager.FILA_INICIO_DATOS
+    manager.actualizar_y_reordenar(
+        fila_r2, crear_audiencia("R-2", "01/01/2025", "08:00")
+    )
+
+    assert leer_columna(archivo, 2, 2) == ["R-1", "R-2"]
+
+
+def test_ordenamiento_incremental_equivale_al_completo(tmp_path):
+    """Insertar y actualizar por búsqueda binaria deja la misma hoja que reordenar todo."""
+    archivos = []
+    for incremental in (True, False):
+        destino = tmp_path / f"incremental_{incremental}.xlsx"
+        shutil.copy2(PLANTILLA, destino)
+        manager = ExcelManager(str(destino), ordenamiento_incremental=incremental)
+        for i in range(12):
+            motivos = ["Juez" if i % 4 == 0 else ""] + [""] * 7
+            manager.guardar_y_reordenar(crear_audiencia(
+                f"R-{i}", f"{(i * 7) % 28 + 1:02d}/0{i % 3 + 1}/2025",
+                f"{8 + i % 2:02d}:00", realizada=i % 4 != 0, motivos=motivos,
+            ))
+        # Empates de fecha/hora con registros existentes
+        manager.guardar_y_reordenar(crear_audiencia("R-T", "01/01/2025", "08:00"))
+        fila = ExcelManager.FILA_INICIO_DATOS
+        manager.actualizar_y_reordenar(fila + 1, crear_audiencia("R-U", "01/01/2025", "08:00"))
+        manager.actualizar_y_reordenar(fila + 2, crear_audiencia("R-X", "15/01/2024", "10:00"))
+        manager.actualizar_y_reordenar(fila + 9, crear_audiencia("R-Y", "28/12/2025", "10:00"))
+        archivos.append(str(destino))
+
+    hojas = [load_workbook(a).active for a in archivos]
+    for fila in range(ExcelManager.FILA_INICIO_DATOS, ExcelManager.FILA_TOTALES + 1):
+        for col in range(2, 18):
+            assert hojas[0].cell(row=fila, column=col).value == \
+                hojas[1].cell(row=fila, column=col).value, (fila, col)
+
+
+def test_totales_incrementales(archivo):
+    """Los totales por diferencias coinciden con el recuento completo."""
+    manager = ExcelManager(archivo, verificacion_totales=True)
+    juez = ["Juez"] + [""] * 7
+    manager.guardar_y_reordenar(crear_audiencia("R-1", "01/02/2025", "08:00"))
+    manager.guardar_y_reordenar(crear_audiencia("R-2", "03/02/2025", "08:00", False, juez))
+    manager.guardar_y_reordenar(crear_audiencia("R-3", "02/02/2025", "08:00", False, juez))
+
+    fila = ExcelManager.FILA_INICIO_DATOS
+    manager.actualizar_y_reordenar(fila, crear_audiencia("R-2", "03/02/2025", "08:00"))
+    assert manager.eliminar_audiencia(fila + 1) == (2, 2, [0] * 8)
+    assert leer_columna(archivo, 2, 3) == ["R-2", "R-1", None]
+    assert manager.verificar_totales()
+
+    # Un gestor nuevo reutiliza los totales persistidos sin recontar
+    otro = ExcelManager(archivo)
+    otro._calcular_totales = None
+    assert otro.contar_registros() == 2
+
+
+def test_totales_se_recalculan_si_el_libro_cambia_fuera(archivo):
+    """Si el .xlsx se modifica externamente, los totales guardados se ignoran."""
+    manager = ExcelManager(archivo)
+    manager.guardar_y_reordenar(crear_audiencia("R-1", "01/02/2025", "08:00"))
+
+    wb = load_workbook(archivo)
+    wb.active.cell(row=ExcelManager.FILA_INICIO_DATOS + 1, column=2, value="EXTERNO")
+    wb.save(archivo)
+
+    assert manager.contar_registros() == 2
+    assert ExcelManager(archivo).contar_registros() == 2
+
+
+def test_contar_registros_sin_cargar_el_libro(archivo, monkeypatch):
+    """El contador usa la caché de la versión actual y, si falta, solo la columna B."""
+    import models.excel_manager as modulo
+
+    manager = ExcelManager(archivo)
+    manager.guardar_y_reordenar(crear_audiencia("R-1", "01/02/2025", "08:00"))
+    manager.guardar_y_reordenar(crear_audiencia("R-2", "03/02/2025", "08:00"))
+
+    cargas = []
+    load_original = modulo.load_workbook
+
+    def load_contado(*args, **kwargs):
+        cargas.append(kwargs)
+        return load_original(*args, **kwargs)
+
+    monkeypatch.setattr(modulo, "load_workbook", load_contado)
+
+    assert manager.contar_registros() == 2
+    assert ExcelManager(archivo).contar_registros() == 2
+    assert cargas == []
+
+    # Sin totales persistidos: recorrido en streaming de la columna B, una vez
+    for asociado in ExcelManager.archivos_asociados(archivo):
+        Path(asociado).unlink(missing_ok=True)
+    nuevo = ExcelManager(archivo)
+    assert nuevo.contar_registros() == 2
+    assert nuevo.contar_registros() == 2
+    assert cargas == [{"read_only": True}]
+
+
+def test_iterar_registros_en_streaming(archivo):
+    """El lector entrega las filas con radicado y se detiene en el bloque vacío."""
+    manager = ExcelManager(archivo)
+    manager.guardar_y_reordenar(crear_audiencia("R-1", "01/02/2025", "08:00"))
+    manager.guardar_y_reordenar(crear_audiencia("R-2", "03/02/2025", "08:00"))
+
+    # Un registro aislado más allá del bloque de filas vacías no se alcanza
+    wb = load_workbook(archivo)
+    wb.active.cell(row=ExcelManager.FILA_INICIO_DATOS + 50, column=2, value="LEJANO")
+    wb.save(archivo)
+
+    registros = list(manager.iterar_registros(como_tupla=True))
+    assert [(fila, datos[1]) for fila, datos in registros] == [(11, "R-2"), (12, "R-1")]
+    assert isinstance(registros[0][1], tuple)
+    assert len(registros[0][1]) == ExcelManager.ULTIMA_COLUMNA_DATOS
+
+    leidos = manager.leer_registros()
+    assert leidos[0] == (11, list(registros[0][1]))
+
+
+def test_modo_sesion_guarda_de_forma_diferida(archivo):
+    """En modo sesión los cambios llegan a disco solo al vaciar la sesión."""
+    manager = ExcelManager(archivo, modo_sesion=True, retraso_guardado=60)
+    manager.guardar_y_reordenar(crear_audiencia("R-1", "01/02/2025", "08:00"))
+    manager.guardar_y_reordenar(crear_audiencia("R-2", "03/02/2025", "08:00"))
+
+    assert manager.tiene_cambios_pendientes
+    assert manager.contar_registros() == 2
+    assert leer_columna(archivo, 2, 1) == [None]
+
+    assert manager.cerrar()
+    assert not manager.tiene_cambios_pendientes
+    assert leer_columna(archivo, 2, 2) == ["R-2", "R-1"]
+    # La escritura atómica no deja archivos temporales
+    assert sorted(p.name for p in Path(archivo).parent.iterdir()) == [
+        ".audiencias.xlsx.totales.json", "audiencias.xlsx",
+    ]
+
+
+def test_modo_sesion_temporizador(archivo):
+    """El temporizador escribe los cambios tras el retraso configurado."""
+    manager = ExcelManager(archivo, modo_sesion=True, retraso_guardado=0.05)
+    manager.guardar_y_reordenar(crear_audiencia("R-1", "01/02/2025", "08:00"))
+    limite = time.monotonic() + 5
+    while manager.tiene_cambios_pendientes and time.monotonic() < limite:
+        time.sleep(0.01)
+
+    assert not manager.tiene_cambios_pendientes
+    assert leer_columna(archivo, 2, 1) == ["R-1"]
+    manager.cerrar()
+
+
+def test_registros_pasan_a_hojas_adicionales(archivo):
+    """Más de 100 registros continúan en otra hoja con los totales agregados."""
+    manager = ExcelManager(archivo, modo_sesion=True, retraso_guardado=60,
+                           verificacion_totales=True)
+    juez = ["Juez"] + [""] * 7
+    for i in range(105):
+        manager.guardar_y_reordenar(crear_audiencia(
+            f"R-{i}", f"{i % 28 + 1:02d}/{i // 28 + 1:02d}/2025", "08:00",
+            realizada=i % 5 != 0, motivos=juez if i % 5 == 0 else None,
+        ))
+    # Eliminar y editar cruzando el límite entre hojas
+    manager.eliminar_audiencia(ExcelManager.FILA_INICIO_DATOS + 99)
+    manager.actualizar_y_reordenar(
+        ExcelManager.FILA_INICIO_DATOS + 102, crear_audiencia("R-NUEVO", "31/12/2025", "23:00")
+    )
+    assert manager.cerrar()
+
+    wb = load_workbook(archivo)
+    assert wb.sheetnames == ["Hoja1", "Hoja1 (2)"]
+    primera, segunda = wb.worksheets
+    fila_ultima = ExcelManager.FILA_MAXIMA_DATOS_PARA_LIMPIAR
+    assert primera.cell(row=ExcelManager.FILA_INICIO_DATOS, column=2).value == "R-NUEVO"
+    assert primera.cell(row=fila_ultima, column=1).value == 100
+    assert [segunda.cell(row=ExcelManager.FILA_INICIO_DATOS + i, column=1).value
+            for i in range(5)] == [101, 102, 103, 104, None]
+
+    # Totales en la última hoja; la primera solo indica que continúa
+    assert primera.cell(row=ExcelManager.FILA_TOTALES, column=7).value is None
+    assert primera.cell(row=ExcelManager.FILA_TOTALES, column=8).value == "CONTINÚA"
+    num, total_si, totales = ExcelManager(archivo)._calcular_totales(wb)
+    assert num == 104
+    assert segunda.cell(row=ExcelManager.FILA_TOTALES, column=7).value == total_si
+    assert segunda.cell(row=ExcelManager.FILA_TOTALES, column=9).value == totales[0]
+
+    otro = ExcelManager(archivo)
+    assert otro.verificar_totales()
+    for asociado in ExcelManager.archivos_asociados(archivo):
+        Path(asociado).unlink(missing_ok=True)
+    assert ExcelManager(archivo).contar_registros() == 104
+    filas = [fila for fila, _ in otro.iterar_registros(como_tupla=True)]
+    assert filas == list(range(ExcelManager.FILA_INICIO_DATOS, ExcelManager.FILA_INICIO_DATOS + 104))
+
+    # Al quedar 100 registros o menos sobra la segunda hoja
+    for _ in range(4):
+        otro.eliminar_audiencia(ExcelManager.FILA_INICIO_DATOS)
+    assert load_workbook(archivo).sheetnames == ["Hoja1"]
+    assert load_workbook(archivo).active.cell(row=ExcelManager.FILA_TOTALES, column=8).value == "TOTAL:"
+
+
+def test_motor_sqlite_exporta_el_mismo_libro(tmp_path):
+    """El motor SQLite genera al exportar el mismo libro que el motor Excel."""
+    archivos = []
+    for motor in ("excel", "sqlite"):
+        destino = tmp_path / f"{motor}.xlsx"
+        shutil.copy2(PLANTILLA, destino)
+        manager = ExcelManager(str(destino), motor=motor)
+        # Un registro previo en el libro se importa al crear la base
+        manager_excel = ExcelManager(str(destino))
+        manager_excel.guardar_y_reordenar(crear_audiencia("R-PREVIO", "10/01/2025", "08:00"))
+        for i in range(12):
+            motivos = ["Juez" if i % 4 == 0 else ""] + [""] * 7
+            manager.guardar_y_reordenar(crear_audiencia(
+                f"R-{i}", f"{(i * 7) % 28 + 1:02d}/0{i % 3 + 1}/2025",
+                "08:00", realizada=i % 4 != 0, motivos=motivos,
+            ))
+        fila = ExcelManager.FILA_INICIO_DATOS
+        manager.actualizar_y_reordenar(fila + 2, crear_audiencia("R-X", "15/01/2024", "10:00"))
+        resultado = manager.eliminar_audiencia(fila + 4)
+        assert manager.exportar()
+        archivos.append((str(destino), resultado, manager.contar_registros(),
+                         list(manager.iterar_registros(como_tupla=True))))
+        manager.cerrar()
+
+    (excel, res_excel, n_excel, reg_excel), (sqlite, res_sqlite, n_sqlite, reg_sqlite) = archivos
+    assert res_sqlite == res_excel
+    assert n_sqlite == n_excel == 12
+    assert reg_sqlite == reg_excel
+    hojas = [load_workbook(a).active for a in (excel, sqlite)]
+    for fila in range(ExcelManager.FILA_INICIO_DATOS, ExcelManager.FILA_TOTALES + 1):
+        for col in range(2, 18):
+            assert hojas[0].cell(row=fila, column=col).value == \
+                hojas[1].cell(row=fila, column=col).value, (fila, col)
+
+
+def test_motor_sqlite_solo_escribe_el_libro_al_exportar(archivo, monkeypatch):
+    """Con el motor SQLite el .xlsx no se reescribe hasta exportar."""
+    guardados = []
+    save_original = Workbook.save
+
+    def save_contado(self, filename):
+        guardados.append(filename)
+        return save_original(self, filename)
+
+    monkeypatch.setattr(Workbook, "save", save_contado)
+
+    manager = ExcelManager(archivo, motor="sqlite")
+    for i in range(3):
+        manager.guardar_audiencia(crear_audiencia(f"R-{i}", f"0{i + 1}/02/2025", "08:00"))
+    assert guardados == []
+    assert leer_columna(archivo, 2, 1) == [None]
+    manager.cerrar()
+
+    # Otro gestor encuentra los registros en la base y exporta una sola vez
+    otro = ExcelManager(archivo, motor="sqlite")
+    assert otro.contar_registros() == 3
+    assert otro.exportar() and otro.exportar()
+    assert len(guardados) == 1
+    assert leer_columna(archivo, 2, 3) == ["R-2", "R-1", "R-0"]
+    otro.cerrar()
+
+
+@pytest.mark.parametrize("motor", ["excel", "sqlite"])
+def test_indice_de_radicados(archivo, monkeypatch, motor):
+    """El índice sigue a cada cambio sin releer el libro y detecta duplicados."""
+    import models.excel_manager as modulo
+
+    manager = ExcelManager(archivo, motor=motor)
+    for i in range(6):
+        manager.guardar_y_reordenar(crear_audiencia(f"R-{i}", f"0{i + 1}/02/2025", "08:00"))
+    # Se construye una vez; a partir de aquí no se vuelve a cargar el libro
+    assert manager.buscar_radicado("R-0") == [16]
+
+    cargas = []
+    load_original = modulo.load_workbook
+    monkeypatch.setattr(modulo, "load_workbook",
+                        lambda *a, **k: cargas.append(k) or load_original(*a, **k))
+
+    fila = ExcelManager.FILA_INICIO_DATOS
+    manager.guardar_y_reordenar(crear_audiencia("R-2", "15/02/2025", "08:00"))
+    manager.actualizar_y_reordenar(fila + 3, crear_audiencia("R-9", "01/01/2025", "08:00"))
+    manager.eliminar_audiencia(fila + 1)
+    cargas_mutaciones = len(cargas)
+
+    assert manager.buscar_radicado("R-2") == [11, 13]
+    assert manager.buscar_radicado(" R-9 ") == [16]
+    assert manager.buscar_radicado("R-5") == []
+    assert manager.buscar_radicado("NO-EXISTE") == []
+    if motor == "excel":
+        assert len(cargas) == cargas_mutaciones
+    assert manager.leer_registro(13)[1] == "R-2"
+    assert manager.leer_registro(20) is None
+
+    # El índice mantenido coincide con uno construido desde cero
+    nuevo = ExcelManager(archivo, motor=motor)
+    for _, datos in nuevo.iterar_registros(como_tupla=True):
+        assert manager.buscar_radicado(datos[1]) == nuevo.buscar_radicado(datos[1])
+    manager.cerrar()
+    nuevo.cerrar()
+
+
+def test_indice_se_invalida_si_el_libro_cambia_fuera(archivo):
+    """Un cambio externo en el libro obliga a reconstruir el índice."""
+    manager = ExcelManager(archivo)
+    manager.guardar_y_reordenar(crear_audiencia("R-1", "01/02/2025", "08:00"))
+    assert manager.buscar_radicado("R-1") == [11]
+
+    wb = load_workbook(archivo)
+    wb.active.cell(row=ExcelManager.FILA_INICIO_DATOS + 1, column=2, value="EXTERNO")
+    wb.save(archivo)
+
+    assert manager.buscar_radicado("EXTERNO") == [12]
+
+
+@pytest.mark.parametrize("motor", ["excel", "sqlite"])
+def test_guardar_lote_valida_ordena_y_escribe_una_vez(archivo, monkeypatch, motor):
+    """El lote se valida completo, se ordena una vez y el libro se escribe una vez."""
+    manager = ExcelManager(archivo, motor=motor)
+    manager.guardar_y_reordenar(crear_audiencia("R-0", "02/02/2025", "08:00"))
+
+    invalido = crear_audiencia("R-X", "31/02/2025", "08:00")
+    with pytest.raises(Exception, match="registro 2 \\(R-X\\)"):
+        manager.guardar_lote([crear_audiencia("R-9", "01/02/2025", "08:00"), invalido])
+    assert manager.contar_registros() == 1
+
+    guardados = []
+    save_original = Workbook.save
+
+    def save_contado(self, filename):
+        guardados.append(filename)
+        return save_original(self, filename)
+
+    monkeypatch.setattr(Workbook, "save", save_contado)
+
+    lote = [
+        crear_audiencia(f"L-{i}", f"{i % 28 + 1:02d}/03/2025", "10:00", realizada=i % 2 == 0,
+                        motivos=None if i % 2 == 0 else ["", "Fiscal"] + [""] * 6)
+        for i in range(150)
+    ]
+    num, total_si, totales = manager.guardar_lote(lote)
+    manager.exportar()
+
+    assert len(guardados) == 1
+    assert (num, total_si) == (151, 76)
+    assert totales == [0, 75, 0, 0, 0, 0, 0, 0]
+
+    registros = list(manager.iterar_registros())
+    assert len(registros) == 151
+    claves = [ExcelManager._clave_orden(datos[3], datos[4]) for _, datos in registros]
+    assert claves == sorted(claves, reverse=True)
+    assert registros[-1][1][1] == "R-0"
+    manager.cerrar()
+
+
+def test_fechas_se_interpretan_una_vez(archivo):
+    """Reordenar de nuevo reutiliza las fechas ya interpretadas."""
+    from models.audiencia import calcular_marca_tiempo
+
+    audiencia = crear_audiencia("R-1", "01/02/2025", "08:00")
+    assert audiencia.clave_orden == ExcelManager._clave_orden("01/02/2025", "08:00")
+    assert crear_audiencia("R-2", "31/02/2025", "08:00").clave_orden == CLAVE_INVALIDA
+
+    manager = ExcelManager(archivo)
+    manager.guardar_lote([
+        crear_audiencia(f"R-{i}", f"{i % 5 + 1:02d}/02/2025", "08:00") for i in range(30)
+    ])
+    manager.reordenar_y_guardar()
+    fallos = calcular_marca_tiempo.cache_info().misses
+    manager.reordenar_y_guardar()
+    assert calcular_marca_tiempo.cache_info().misses == fallos
+
+
+def test_registro_compacto_conserva_los_valores():
+    """Registro guarda los motivos como máscara sin perder textos no estándar."""
+    from models.registro import Registro
+
+    valores = ("R-1", "Juicio oral", "01/02/2025", "08:00", "Juzgado", None, "NO",
+               "Juez", None, None, "INPEC", None, None, None, None, "Obs")
+    registro = Registro.desde_valores(valores)
+    assert registro.valores() == valores
+    assert registro.motivos == 0b1001
+    assert registro.etiquetas is None
+    assert registro.clave == ExcelManager._clave_orden("01/02/2025", "08:00")
+
+    otros = valores[:7] + ("", "Fiscal") + (None,) * 6 + (None,)
+    assert Registro.desde_valores(otros).valores()[8] == "Fiscal"
+
+
+def test_contar_motivos_por_mascara():
+    """Los totales por máscara coinciden con el conteo celda por celda."""
+    from models.audiencia import contar_motivos, mascara_motivos
+
+    filas = [[""] * 8 for _ in range(300)]
+    for n, fila in enumerate(filas):
+        for i in range(8):
+            if (n * 7 + i) % (i + 2) == 0:
+                fila[i] = "x"
+    esperado = [sum(1 for fila in filas if fila[i]) for i in range(8)]
+
+    mascaras = [mascara_motivos(fila) for fila in filas]
+    assert contar_motivos(mascaras) == esperado
+    assert contar_motivos(bytes(mascaras)) == esperado
+    assert contar_motivos([]) == [0] * 8
+    assert crear_audiencia("R", "01/02/2025", "08:00",
+                           motivos=["", "Fiscalía", "", "INPEC"] + [""] * 4).mascara_motivos == 0b1010
+
+
+def test_almacen_sqlite_posiciones_siguen_el_orden(tmp_path):
+    """Posiciones y lecturas por posición coinciden con el orden de la hoja."""
+    almacen = AlmacenSQLite(str(tmp_path / "audiencias.db"))
+    almacen.insertar_lote(
+        crear_audiencia(f"R-{i % 5}", f"{i % 28 + 1:02d}/0{i % 3 + 1}/2025", "08:00")
+        for i in range(40)
+    )
+    almacen.insertar(crear_audiencia("R-0", "fecha inválida", "08:00"))
+    almacen.actualizar(3, crear_audiencia("R-9", "01/01/2026", "09:00"))
+    almacen.eliminar(10)
+
+    filas = list(almacen.iterar())
+    assert [almacen.leer(i) for i in range(len(filas))] == filas
+    assert almacen.leer(len(filas)) is None
+    for radicado in ("R-0", "R-4", "R-9"):
+        assert almacen.posiciones(radicado) == [
+            i for i, fila in enumerate(filas) if fila[0] == radicado
+        ]
+    assert almacen.posiciones("R-9") == [0]
+    almacen.cerrar()
@@ -0,0 +1,73 @@
+"""
+PRUEBAS DEL IMPORTADOR
+======================
+Verifica la lectura de audiencias desde CSV y JSON y su importación en lote.
+"""
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path
+proyecto_root = Path(__file__).parent.parent
+sys.path.insert(0, str(proyecto_root))
+
+from models.excel_manager import ExcelManager
+from utils.importador import importar_audiencias, leer_audiencias, main
+
+PLANTILLA = proyecto_root / "templates" / "plantilla_audiencias.xlsx"
+
+
+def test_importar_csv_y_json(tmp_path):
+    archivo = tmp_path / "audiencias.xlsx"
+    shutil.copy2(PLANTILLA, archivo)
+
+    csv_path = tmp_path / "audiencias.csv"
+    csv_path.write_text(
+        "radicado;tipo;fecha;hora;juzgado;realizada_si;realizada_no;motivo_1;motivo_2;observaciones\n"
+        "C-1;Audiencia preliminar;01/03/2025;08:00;Juzgado 1;SI;;;;\n"
+        "C-2;Audiencia preliminar;02/03/2025;09:00;Juzgado 1;;NO;;Fiscal;Aplazada\n",
+        encoding="utf-8",
+    )
+    json_path = tmp_path / "audiencias.json"
+    json_path.write_text(json.dumps([{
+        "radicado": "J-1", "tipo": "Juicio oral", "fecha": "03/03/2025", "hora": "10:00",
+        "juzgado": "Juzgado 2", "realizada_si": "", "realizada_no": "NO",
+        "motivos": ["Juez"],
+    }]), encoding="utf-8")
+
+    audiencias = leer_audiencias(str(csv_path))
+    assert [a.radicado for a in audiencias] == ["C-1", "C-2"]
+    assert audiencias[1].motivos == ["", "Fiscal"] + [""] * 6
+    assert audiencias[1].observaciones == "Aplazada"
+
+    manager = ExcelManager(str(archivo))
+    importar_audiencias(manager, str(csv_path))
+    num, total_si, totales = importar_audiencias(manager, str(json_path))
+
+    assert (num, total_si) == (3, 1)
+    assert totales == [1, 1, 0, 0, 0, 0, 0, 0]
+    assert [datos[1] for _, datos in manager.iterar_registros()] == ["J-1", "C-2", "C-1"]
+
+    with pytest.raises(Exception, match="Formato no soportado"):
+        leer_audiencias(str(tmp_path / "audiencias.txt"))
+
+
+def test_importar_desde_la_linea_de_comandos(tmp_path, capsys):
+    archivo = tmp_path / "audiencias.xlsx"
+    shutil.copy2(PLANTILLA, archivo)
+    csv_path = tmp_path / "audiencias.csv"
+    csv_path.write_text(
+        "radicado,tipo,fecha,hora,juzgado,realizada_si,realizada_no\n"
+        "C-1,Audiencia preliminar,01/03/2025,08:00,Juzgado 1,SI,\n",
+        encoding="utf-8",
+    )
+
+    assert main([str(archivo), str(csv_path)]) == 0
+    assert "1 registros" in capsys.readouterr().out
+    assert [datos[1] for _, datos in ExcelManager(str(archivo)).iterar_registros()] == ["C-1"]
+
+    assert main([str(archivo), str(tmp_path / "audiencias.txt")]) == 1
+    assert "Formato no soportado" in capsys.readouterr().out
@@ -3,23 +3,286 @@ Módulo de anonimización de datos para uso seguro con OpenAI Free Tier.
 Protege información sensible en textos judiciales antes del procesamiento de IA.
 """
 
+import hashlib
+import os
 import re
 import random
-from typing import Dict, Tuple
+import secrets
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from utils.detector_nombres import buscar_nombres
+
+try:
+    from config.config import ANONYMIZE_COURTS
+except ImportError:
+    ANONYMIZE_COURTS = False  # Mantener nombres de juzgados (menos sensible)
+
+
+def _compilar(patrones: Iterable[str], flags: int = 0) -> List["re.Pattern"]:
+    return [re.compile(patron, flags) for patron in patrones]
+
+
+# Patrones compilados una sola vez al importar el módulo. Si el patrón tiene
+# grupos, el dato a reemplazar va del primer grupo al último.
+
+# Patrones de radicados colombianos
+PATRONES_RADICADOS = _compilar([
+    r'\b\d{5}-\d{2}-\d{5}-\d{4}-\d{5}-\d{2}\b',  # 11001-60-00000-2024-00000-00
+    r'\b\d{11,20}\b',  # Números largos de radicado
+    r'\b\d{4}-\d{6}-\d{2}\b',  # 2024-000000-00
+])
+
+# Patrones para números de celular colombianos
+PATRONES_CELULARES = _compilar([
+    r'\b(?:cel|celular|móvil|teléfono)[\s:]*([3][0-9]{2}[\s-]?[0-9]{3}[\s-]?[0-9]{4})\b',  # cel: 300 123 4567
+    r'\b([3][0-9]{2}[\s-]?[0-9]{3}[\s-]?[0-9]{4})\b',  # 300 123 4567 directo
+    r'\b([3][0-9]{9})\b',  # 3001234567 sin espacios
+    r'\+57[\s-]?([3][0-9]{2})[\s-]?([0-9]{3})[\s-]?([0-9]{4})',  # +57 300 123 4567
+    r'\b([3][0-9]{2})\.([0-9]{3})\.([0-9]{4})\b',  # 300.123.4567 con puntos
+    r'\(57\)\s+([3][0-9]{2})\s+([0-9]{3})\s+([0-9]{4})',  # (57) 300 123 4567
+], re.IGNORECASE)
+
+# Patrones para tarjetas de crédito (Visa, MasterCard, American Express)
+PATRONES_TARJETAS = _compilar([
+    r'\b(?:tarjeta|card|visa|mastercard|amex)[\s:]*([4-6][0-9]{3}[\s-]?[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4})\b',  # Con etiqueta 16 dígitos
+    r'\b(?:tarjeta|card|amex|american\s+express)[\s:]*([3][0-9]{3}[\s-]?[0-9]{6}[\s-]?[0-9]{5})\b',  # Amex 15 dígitos
+    r'\b([4-6][0-9]{3}[\s-]?[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4})\b',  # Solo número 16 dígitos
+    r'\b([3][0-9]{3}[\s-]?[0-9]{6}[\s-]?[0-9]{5})\b',  # Solo número Amex 15 dígitos
+    r'\b([4-6][0-9]{15})\b',  # Sin espacios ni guiones 16 dígitos
+    r'\b([3][0-9]{14})\b',  # Sin espacios ni guiones Amex 15 dígitos
+    r'terminada\s+en\s+(\d{4})',  # Terminada en 1234
+], re.IGNORECASE)
+
+# Patrón para correos electrónicos
+PATRONES_CORREOS = _compilar([
+    r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b',
+])
+
+# Patrones para direcciones colombianas
+PATRONES_DIRECCIONES = _compilar([
+    r'(?:dirección|dir\.|domicilio)[\s:]*([A-Za-z0-9\s#\-,]{15,80})',  # Con etiqueta
+    r'\b(?:calle|carrera|avenida|av\.|cr\.|cl\.)[\s]+[0-9A-Za-z\s#\-]{10,50}',  # Formato típico colombiano
+    r'\b[A-Za-z]+[\s]+[0-9]+[\s]*#[0-9\-]+[A-Za-z0-9\s]*',  # Carrera 15 #45-67
+], re.IGNORECASE)
+
+# Patrones para números profesionales
+PATRONES_PROFESIONALES = _compilar([
+    r'Tarjeta\s+Profesional:\s*(\d{4,8})',  # Tarjeta Profesional: 123456
+    r'T\.P\.?\s*(\d{4,8})',  # T.P. 123456
+    r'Registro:\s*(\d{4,8})',  # Registro: 123456
+])
+
+# Patrones más específicos y completos para cédulas
+PATRONES_CEDULAS = _compilar([
+    r'C\.C\.\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})',  # C.C. 1.234.567.890
+    r'T\.I\.\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})',  # T.I. 1.098.765.432
+    r'Cédula(?:\s+de\s+Ciudadanía)?:\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})',  # Cédula: 1.234.567.890
+    r'Documento:\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})',  # Documento: 11.222.333
+    r'NIT:\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})(?:-\d)?',  # NIT: 900.123.456-7
+    r'RUT:\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})(?:-\d)?',  # RUT: 12.345.678-9
+    r'Pasaporte:\s*[A-Z]{2}\d{6,9}',  # Pasaporte: AB1234567
+    r'\b\d{1,3}(?:\.\d{3}){2,3}\b',  # Números con puntos (1.234.567.890 o 11.222.333)
+    r'\b\d{8,12}\b(?!\s*[:]\s*\d)',  # Números largos sin puntos (evitar horas)
+    r'C\.C\.\s*\d{8,12}',  # C.C. sin puntos
+    r'T\.I\.\s*\d{8,12}',  # T.I. sin puntos
+])
+
+# Patrón para juzgados específicos (todo el nombre, no solo la palabra
+# inicial). No pasa de la línea: el encabezado del juzgado suele ir seguido
+# del radicado y del tipo de audiencia, que la IA necesita ver.
+PATRONES_JUZGADOS = _compilar([
+    r'(?:JUZGADO|TRIBUNAL|FISCALÍA)[^\.\n]{10,100}',
+], re.IGNORECASE)
+
+# Intentos para que dos datos distintos no reciban el mismo valor ficticio
+INTENTOS_FICTICIO_UNICO = 10
+
+# Con menos textos que esto, abrir procesos cuesta más de lo que ahorra
+MINIMO_TEXTOS_PARALELO = 32
+
+_DIGITOS = "0123456789"
+
+# Para cada byte del flujo de la clave, a qué dígito pasa cada dígito
+# (desplazamiento de 1 a 9, nunca queda igual). Los demás caracteres no
+# están en la tabla y se conservan.
+_DIGITO_DESPLAZADO = [
+    {_DIGITOS[d]: _DIGITOS[(d + 1 + byte % 9) % 10] for d in range(10)}
+    for byte in range(256)
+]
+
+_PASAPORTE = re.compile(r'[A-Z]{2}\d{6,9}')
+_NO_DIGITOS = re.compile(r'[^\d]')
+_PALABRA = re.compile(r'\w+')
+
+
+def _valor_coincidencia(coincidencia: "re.Match") -> Tuple[int, int]:
+    """Posición (inicio, fin) del dato dentro de una coincidencia."""
+    grupos = coincidencia.re.groups
+    if not grupos:
+        return coincidencia.span()
+    return coincidencia.start(1), coincidencia.end(grupos)
+
+
+def _indice_palabras(texto: str) -> Dict[str, List[int]]:
+    """Posiciones donde empieza cada palabra del texto."""
+    indice: Dict[str, List[int]] = {}
+    for palabra in _PALABRA.finditer(texto):
+        indice.setdefault(palabra.group(), []).append(palabra.start())
+    return indice
+
+
+def _apariciones(texto: str, buscado: str, indice: Dict[str, List[int]]) -> List[int]:
+    """Posiciones de ``buscado`` en el texto, sin recorrer todo el texto.
+
+    Se toma la palabra interior de ``buscado`` (con separadores a ambos
+    lados, así en el texto es una palabra completa) que menos se repite en
+    el índice y solo se comparan las posiciones donde aparece. Si no tiene
+    palabras interiores se busca en todo el texto.
+    """
+    interiores = [
+        (palabra.start(), indice.get(palabra.group(), ()))
+        for palabra in _PALABRA.finditer(buscado)
+        if palabra.start() > 0 and palabra.end() < len(buscado)
+    ]
+    if not interiores:
+        apariciones = []
+        inicio = texto.find(buscado)
+        while inicio != -1:
+            apariciones.append(inicio)
+            inicio = texto.find(buscado, inicio + len(buscado))
+        return apariciones
+
+    desplazamiento, posiciones = min(interiores, key=lambda palabra: len(palabra[1]))
+    return [
+        posicion - desplazamiento for posicion in posiciones
+        if posicion >= desplazamiento
+        and texto.startswith(buscado, posicion - desplazamiento)
+    ]
+
+
+def _indice_buscados(buscados: Iterable[str]) -> Tuple[Dict[str, List[Tuple[int, str]]], List[str]]:
+    """Índice de textos a buscar por su primera palabra interior.
+
+    Devuelve ``{palabra: [(desplazamiento, buscado), ...]}`` y la lista de
+    los textos sin palabras interiores, que se buscan recorriendo el texto.
+    """
+    por_palabra: Dict[str, List[Tuple[int, str]]] = {}
+    sin_palabras = []
+    for buscado in buscados:
+        for palabra in _PALABRA.finditer(buscado):
+            if palabra.start() > 0 and palabra.end() < len(buscado):
+                por_palabra.setdefault(palabra.group(), []).append((palabra.start(), buscado))
+                break
+        else:
+            sin_palabras.append(buscado)
+    return por_palabra, sin_palabras
+
+
+def _reemplazar_todos(texto: str, reemplazos: Dict[str, str], indice=None) -> str:
+    """Reemplaza cada clave de ``reemplazos`` por su valor en una sola pasada.
+
+    El texto se recorre palabra por palabra y solo se comparan las claves
+    indexadas por esa palabra, así el costo depende del largo del texto y
+    no de cuántas claves haya. ``indice`` es el de ``_indice_buscados`` y
+    puede reutilizarse entre textos. Donde dos claves se solapan gana la
+    que empieza antes y, entre esas, la más larga.
+    """
+    por_palabra, sin_palabras = indice or _indice_buscados(reemplazos)
+    candidatos = []
+    for palabra in _PALABRA.finditer(texto):
+        for desplazamiento, buscado in por_palabra.get(palabra.group(), ()):
+            inicio = palabra.start() - desplazamiento
+            if inicio >= 0 and texto.startswith(buscado, inicio):
+                candidatos.append((inicio, -len(buscado), buscado))
+    for buscado in sin_palabras:
+        inicio = texto.find(buscado)
+        while inicio != -1:
+            candidatos.append((inicio, -len(buscado), buscado))
+            inicio = texto.find(buscado, inicio + len(buscado))
+    candidatos.sort()
+
+    partes = []
+    posicion = 0
+    for inicio, menos_longitud, buscado in candidatos:
+        if inicio < posicion:
+            continue
+        partes.append(texto[posicion:inicio])
+        partes.append(reemplazos[buscado])
+        posicion = inicio - menos_longitud
+    partes.append(texto[posicion:])
+    return "".join(partes)
+
+
+class Categoria(NamedTuple):
+    """Tipo de dato sensible: cómo se detecta y cómo se genera su ficticio."""
+    nombre: str
+    patrones: List["re.Pattern"]
+    # generar(original, intento): cada intento da un valor distinto
+    generar: Callable[[str, int], str]
+    es_valido: Optional[Callable[[str], bool]] = None
+    # Detector propio en lugar de patrones: devuelve posiciones (inicio, fin)
+    buscar: Optional[Callable[[str], Iterable[Tuple[int, int]]]] = None
+
+    def tramos(self, texto: str) -> Iterator[Tuple[int, int]]:
+        """Posiciones (inicio, fin) de los datos de esta categoría en el texto."""
+        if self.buscar is not None:
+            yield from self.buscar(texto)
+            return
+        for patron in self.patrones:
+            for coincidencia in patron.finditer(texto):
+                yield _valor_coincidencia(coincidencia)
+
+
+class ContextoAnonimizacion:
+    """Estado de una solicitud de anonimización (uno o varios textos).
+
+    Guarda el mapeo de la solicitud y los nombres ficticios que aún puede
+    asignar. Cada solicitud tiene su propio contexto, así que dos solicitudes
+    simultáneas (voz y texto, o los documentos de un lote) no comparten
+    valores ni mapeos. Un mismo contexto no debe usarse desde dos hilos.
+    """
+
+    def __init__(self, nombres_ficticios: Iterable[str]):
+        self.mapeo_reverso: Dict[str, str] = {}
+        # (categoría, original) -> ficticio: el mismo dato recibe el mismo
+        # valor en todos los textos de la solicitud
+        self.ficticios: Dict[Tuple[str, str], str] = {}
+        self._nombres_libres = list(nombres_ficticios)
+
+    def tomar_nombre(self) -> str:
+        """Nombre ficticio que aún no se usó en esta solicitud, en tiempo constante.
+
+        Es un barajado de Fisher-Yates hecho de a un paso: se elige un nombre
+        libre al azar, se cambia por el último y se saca de la lista.
+        """
+        libres = self._nombres_libres
+        if not libres:
+            # Generar nombre adicional si se agotan
+            return f"PERSONA_{random.randint(100, 999)} APELLIDO_{random.randint(100, 999)}"
+        posicion = random.randrange(len(libres))
+        libres[posicion], libres[-1] = libres[-1], libres[posicion]
+        return libres.pop()
 
 
 class AnonimizadorDatos:
-    """Anonimiza datos sensibles en textos judiciales para uso seguro con IA."""
+    """Anonimiza datos sensibles en textos judiciales para uso seguro con IA.
+
+    La instancia solo guarda configuración (listas de valores ficticios y la
+    clave de la sesión); el estado de cada texto vive dentro de la llamada a
+    ``anonimizar_texto`` o en el ``ContextoAnonimizacion`` de cada
+    solicitud. Por eso una misma instancia se puede usar desde varios hilos
+    a la vez.
+    """
     
-    def __init__(self):
-        self.mapeo_nombres = {}
-        self.mapeo_radicados = {}
-        self.mapeo_cedulas = {}
-        self.mapeo_juzgados = {}
-        self.mapeo_celulares = {}
-        self.mapeo_tarjetas = {}
-        self.mapeo_correos = {}
-        self.mapeo_direcciones = {}
+    def __init__(self, clave_sesion: Optional[bytes] = None):
+        # Clave de la sesión para los números ficticios: el mismo dato
+        # recibe el mismo valor ficticio mientras dure el proceso (o en
+        # todos los procesos que reciban la misma clave)
+        self._clave_sesion = clave_sesion or secrets.token_bytes(32)
         
         # Nombres ficticios EXPANDIDOS para máxima variedad y seguridad
         self.nombres_ficticios = [
@@ -85,318 +348,251 @@ class AnonimizadorDatos:
         
         # Dominios de correo ficticios
         self.dominios_correo = ["ejemplo.com", "demo.org", "muestra.net", "ficticio.co", "prueba.edu"]
+
+        # Los juzgados solo se reemplazan si la configuración lo pide
+        self.anonimizar_juzgados = ANONYMIZE_COURTS
     
-    def anonimizar_texto(self, texto: str) -> Tuple[str, Dict]:
+    def nuevo_contexto(self) -> ContextoAnonimizacion:
+        """Contexto vacío para una solicitud nueva."""
+        return ContextoAnonimizacion(self.nombres_ficticios)
+
+    def anonimizar_texto(
+        self, texto: str, contexto: Optional[ContextoAnonimizacion] = None
+    ) -> Tuple[str, Dict]:
         """
         Anonimiza un texto judicial manteniendo la estructura legal.
         
         Args:
             texto: Texto original con datos sensibles
+            contexto: Contexto de la solicitud, para anonimizar varios textos
+                con los mismos valores ficticios (por defecto, uno nuevo)
             
         Returns:
             Tuple[str, Dict]: (texto_anonimizado, mapeo_reverso)
         """
-        texto_anonimo = texto
-        mapeo_reverso = {}
-        
-        # 1. Anonimizar números de cédula/documento (PRIMERO para evitar conflictos)
-        texto_anonimo, mapeo_cedulas = self._anonimizar_cedulas(texto_anonimo)
-        mapeo_reverso.update(mapeo_cedulas)
-        
-        # 2. Anonimizar números de celular
-        texto_anonimo, mapeo_celulares = self._anonimizar_celulares(texto_anonimo)
-        mapeo_reverso.update(mapeo_celulares)
-        
-        # 3. Anonimizar tarjetas de crédito
-        texto_anonimo, mapeo_tarjetas = self._anonimizar_tarjetas_credito(texto_anonimo)
-        mapeo_reverso.update(mapeo_tarjetas)
-        
-        # 4. Anonimizar correos electrónicos
-        texto_anonimo, mapeo_correos = self._anonimizar_correos(texto_anonimo)
-        mapeo_reverso.update(mapeo_correos)
-        
-        # 5. Anonimizar direcciones
-        texto_anonimo, mapeo_direcciones = self._anonimizar_direcciones(texto_anonimo)
-        mapeo_reverso.update(mapeo_direcciones)
-        
-        # 6. Anonimizar números profesionales (tarjetas profesionales, etc.)
-        texto_anonimo, mapeo_profesionales = self._anonimizar_numeros_profesionales(texto_anonimo)
-        mapeo_reverso.update(mapeo_profesionales)
-        
-        # 7. Anonimizar radicados
-        texto_anonimo, mapeo_radicados = self._anonimizar_radicados(texto_anonimo)
-        mapeo_reverso.update(mapeo_radicados)
-        
-        # 8. Anonimizar nombres de personas (ÚLTIMO para evitar conflictos)
-        texto_anonimo, mapeo_nombres = self._anonimizar_nombres(texto_anonimo)
-        mapeo_reverso.update(mapeo_nombres)
-        
-        # 9. Anonimizar juzgados específicos
-        texto_anonimo, mapeo_juzgados = self._anonimizar_juzgados(texto_anonimo)
-        mapeo_reverso.update(mapeo_juzgados)
-        
-        return texto_anonimo, mapeo_reverso
-    
+        # Todas las categorías se buscan sobre el texto original y cada
+        # fragmento se asigna a una sola, en este orden de prioridad: cédulas
+        # (primero para evitar conflictos), celulares, tarjetas, correos,
+        # direcciones, números profesionales, radicados, nombres (último para
+        # evitar conflictos) y juzgados (si ANONYMIZE_COURTS está activo).
+        # Así ninguna etapa vuelve a buscar
+        # sobre los valores ficticios que puso otra.
+        contexto = contexto or self.nuevo_contexto()
+        return self._anonimizar_categorias(texto, self._categorias(contexto), contexto)
+
+    def _categorias(self, contexto: ContextoAnonimizacion) -> List[Categoria]:
+        """Categorías de datos sensibles, de mayor a menor prioridad."""
+        categorias = [
+            self._categoria_cedulas(),
+            self._categoria_celulares(),
+            self._categoria_tarjetas(),
+            self._categoria_correos(),
+            self._categoria_direcciones(),
+            self._categoria_profesionales(),
+            self._categoria_radicados(),
+            self._categoria_nombres(contexto),
+        ]
+        if self.anonimizar_juzgados:
+            categorias.append(self._categoria_juzgados())
+        return categorias
+
+    def _anonimizar_categorias(
+        self,
+        texto: str,
+        categorias: List[Categoria],
+        contexto: Optional[ContextoAnonimizacion] = None,
+    ) -> Tuple[str, Dict]:
+        """Reemplaza los datos de ``categorias`` armando el texto en una sola pasada.
+
+        Se reúnen los fragmentos detectados por cada categoría (y las demás
+        apariciones de cada dato, que se reemplazan igual aunque no estén en
+        un contexto reconocible), se descartan los que se solapan con uno de
+        mayor prioridad y el resultado se une de una vez. Devuelve una copia
+        del mapeo acumulado en ``contexto``.
+        """
+        contexto = contexto or self.nuevo_contexto()
+        indice = _indice_palabras(texto)
+        candidatos = []
+        for prioridad, categoria in enumerate(categorias):
+            for original, inicios in self._detectar(texto, categoria).items():
+                inicios.update(_apariciones(texto, original, indice))
+                fin = len(original)
+                candidatos.extend(
+                    (prioridad, inicio, -(inicio + fin), original) for inicio in inicios
+                )
+
+        tramos = self._resolver_solapes(candidatos)
+
+        partes = []
+        mapeo_reverso = contexto.mapeo_reverso
+        ficticios = contexto.ficticios
+        posicion = 0
+        for inicio, fin, prioridad, original in tramos:
+            categoria = categorias[prioridad]
+            clave = (categoria.nombre, original)
+            ficticio = ficticios.get(clave)
+            if ficticio is None:
+                ficticio = ficticios[clave] = self._generar_unico(
+                    categoria.generar, original, mapeo_reverso
+                )
+                mapeo_reverso[ficticio] = original
+            partes.append(texto[posicion:inicio])
+            partes.append(ficticio)
+            posicion = fin
+        partes.append(texto[posicion:])
+        return "".join(partes), dict(mapeo_reverso)
+
+    @staticmethod
+    def _generar_unico(generar: Callable[[str, int], str], original: str, usados: Dict) -> str:
+        """Genera un ficticio que no esté asignado a otro dato, para poder restaurarlo.
+
+        Los generadores con clave son deterministas: el número de intento
+        forma parte de lo que se deriva, así un reintento da otro valor. Si
+        la categoría tiene pocos valores posibles (juzgados) se acepta la
+        repetición después de unos intentos.
+        """
+        ficticio = generar(original, 0)
+        for intento in range(1, INTENTOS_FICTICIO_UNICO + 1):
+            if ficticio not in usados:
+                break
+            ficticio = generar(original, intento)
+        return ficticio
+
+    @staticmethod
+    def _detectar(texto: str, categoria: Categoria) -> Dict[str, set]:
+        """Datos distintos de una categoría y las posiciones donde se detectaron."""
+        originales: Dict[str, set] = {}
+        descartados = set()
+        for inicio, fin in categoria.tramos(texto):
+            fragmento = texto[inicio:fin]
+            original = fragmento.strip()
+            if not original or original in descartados:
+                continue
+            inicios = originales.get(original)
+            if inicios is None:
+                if categoria.es_valido and not categoria.es_valido(original):
+                    descartados.add(original)
+                    continue
+                inicios = originales[original] = set()
+            inicios.add(inicio + len(fragmento) - len(fragmento.lstrip()))
+        return originales
+
+    @staticmethod
+    def _resolver_solapes(candidatos: list) -> List[tuple]:
+        """Elige fragmentos que no se solapen, por prioridad y luego por posición.
+
+        Los candidatos son ``(prioridad, inicio, -fin, original)``; a igual
+        prioridad gana el que empieza antes y, entre esos, el más largo. Un
+        fragmento que se solapa con uno ya elegido se descarta: un juzgado
+        nunca tapa el radicado o la cédula que contiene. Los
+        elegidos se guardan ordenados por posición, así cada verificación es
+        una búsqueda binaria. Devuelve ``(inicio, fin, prioridad, original)``
+        ordenados por posición.
+        """
+        candidatos.sort()
+        inicios: List[int] = []
+        fines: List[int] = []
+        elegidos: List[tuple] = []
+        for prioridad, inicio, menos_fin, original in candidatos:
+            fin = -menos_fin
+            # Elegidos que se solapan con [inicio, fin): índices desde el
+            # primero que termina después de inicio hasta el último que
+            # empieza antes de fin.
+            desde = bisect_right(fines, inicio)
+            hasta = bisect_left(inicios, fin)
+            if desde < hasta:
+                continue
+            inicios.insert(desde, inicio)
+            fines.insert(desde, fin)
+            elegidos.insert(desde, (inicio, fin, prioridad, original))
+        return elegidos
+
+    def _categoria_radicados(self) -> Categoria:
+        return Categoria("radicados", PATRONES_RADICADOS, self._generar_radicado_ficticio)
+
+    def _categoria_celulares(self) -> Categoria:
+        return Categoria(
+            "celulares",
+            PATRONES_CELULARES,
+            self._generar_celular_ficticio,
+            lambda numero: len(numero) >= 10,
+        )
+
+    def _categoria_tarjetas(self) -> Categoria:
+        return Categoria(
+            "tarjetas",
+            PATRONES_TARJETAS,
+            self._generar_tarjeta_ficticia,
+            lambda tarjeta: len(tarjeta.replace(' ', '').replace('-', '')) >= 4,
+        )
+
+    def _categoria_correos(self) -> Categoria:
+        return Categoria("correos", PATRONES_CORREOS, self._generar_correo_ficticio)
+
+    def _categoria_direcciones(self) -> Categoria:
+        return Categoria(
+            "direcciones",
+            PATRONES_DIRECCIONES,
+            self._generar_direccion_ficticia,
+            lambda direccion: len(direccion) > 10,
+        )
+
+    def _categoria_profesionales(self) -> Categoria:
+        return Categoria("profesionales", PATRONES_PROFESIONALES, self._generar_numero_profesional)
+
+    def _categoria_nombres(self, contexto: ContextoAnonimizacion) -> Categoria:
+        # Dentro de una misma solicitud cada persona recibe un nombre ficticio distinto
+        return Categoria(
+            "nombres", [], lambda _nombre, _intento: contexto.tomar_nombre(), buscar=buscar_nombres
+        )
+
+    def _categoria_cedulas(self) -> Categoria:
+        return Categoria("cedulas", PATRONES_CEDULAS, self._generar_cedula_ficticia)
+
+    def _categoria_juzgados(self) -> Categoria:
+        return Categoria(
+            "juzgados",
+            PATRONES_JUZGADOS,
+            lambda _juzgado, _intento: random.choice(self.juzgados_ficticios),
+            lambda juzgado: len(juzgado) > 20,  # Solo juzgados específicos largos
+        )
+
     def _anonimizar_radicados(self, texto: str) -> Tuple[str, Dict]:
         """Anonimiza números de radicado manteniendo el formato."""
-        mapeo = {}
-        
-        # Patrones de radicados colombianos
-        patrones = [
-            r'\b\d{5}-\d{2}-\d{5}-\d{4}-\d{5}-\d{2}\b',  # 11001-60-00000-2024-00000-00
-            r'\b\d{11,20}\b',  # Números largos de radicado
-            r'\b\d{4}-\d{6}-\d{2}\b',  # 2024-000000-00
-        ]
-        
-        for patron in patrones:
-            matches = re.findall(patron, texto)
-            for match in matches:
-                if match not in mapeo:
-                    # Generar radicado ficticio con mismo formato
-                    radicado_ficticio = self._generar_radicado_ficticio(match)
-                    mapeo[radicado_ficticio] = match
-                    texto = texto.replace(match, radicado_ficticio)
-        
-        return texto, mapeo
-    
+        return self._anonimizar_categorias(texto, [self._categoria_radicados()])
+
     def _anonimizar_celulares(self, texto: str) -> Tuple[str, Dict]:
         """Anonimiza números de celular."""
-        mapeo = {}
-        
-        # Patrones para números de celular colombianos
-        patrones_celulares = [
-            r'\b(?:cel|celular|móvil|teléfono)[\s:]*([3][0-9]{2}[\s-]?[0-9]{3}[\s-]?[0-9]{4})\b',  # cel: 300 123 4567
-            r'\b([3][0-9]{2}[\s-]?[0-9]{3}[\s-]?[0-9]{4})\b',  # 300 123 4567 directo
-            r'\b([3][0-9]{9})\b',  # 3001234567 sin espacios
-            r'\+57[\s-]?([3][0-9]{2})[\s-]?([0-9]{3})[\s-]?([0-9]{4})',  # +57 300 123 4567
-            r'\b([3][0-9]{2})\.([0-9]{3})\.([0-9]{4})\b',  # 300.123.4567 con puntos
-            r'\(57\)\s+([3][0-9]{2})\s+([0-9]{3})\s+([0-9]{4})',  # (57) 300 123 4567
-        ]
-        
-        for patron in patrones_celulares:
-            matches = re.findall(patron, texto, re.IGNORECASE)
-            for match in matches:
-                # Si es una tupla (grupo capturado), reconstruir
-                if isinstance(match, tuple):
-                    numero_original = ''.join(match)
-                else:
-                    numero_original = match
-                
-                if numero_original not in mapeo and len(numero_original) >= 10:
-                    # Generar celular ficticio
-                    celular_ficticio = self._generar_celular_ficticio(numero_original)
-                    mapeo[celular_ficticio] = numero_original
-                    texto = texto.replace(numero_original, celular_ficticio)
-        
-        return texto, mapeo
-    
+        return self._anonimizar_categorias(texto, [self._categoria_celulares()])
+
     def _anonimizar_tarjetas_credito(self, texto: str) -> Tuple[str, Dict]:
         """Anonimiza números de tarjetas de crédito."""
-        mapeo = {}
-        
-        # Patrones para tarjetas de crédito (Visa, MasterCard, American Express)
-        patrones_tarjetas = [
-            r'\b(?:tarjeta|card|visa|mastercard|amex)[\s:]*([4-6][0-9]{3}[\s-]?[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4})\b',  # Con etiqueta 16 dígitos
-            r'\b(?:tarjeta|card|amex|american\s+express)[\s:]*([3][0-9]{3}[\s-]?[0-9]{6}[\s-]?[0-9]{5})\b',  # Amex 15 dígitos
-            r'\b([4-6][0-9]{3}[\s-]?[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4})\b',  # Solo número 16 dígitos
-            r'\b([3][0-9]{3}[\s-]?[0-9]{6}[\s-]?[0-9]{5})\b',  # Solo número Amex 15 dígitos
-            r'\b([4-6][0-9]{15})\b',  # Sin espacios ni guiones 16 dígitos
-            r'\b([3][0-9]{14})\b',  # Sin espacios ni guiones Amex 15 dígitos
-            r'terminada\s+en\s+(\d{4})',  # Terminada en 1234
-        ]
-        
-        for patron in patrones_tarjetas:
-            matches = re.findall(patron, texto, re.IGNORECASE)
-            for match in matches:
-                if match not in mapeo and len(match.replace(' ', '').replace('-', '')) >= 4:
-                    # Generar tarjeta ficticia
-                    tarjeta_ficticia = self._generar_tarjeta_ficticia(match)
-                    mapeo[tarjeta_ficticia] = match
-                    texto = texto.replace(match, tarjeta_ficticia)
-        
-        return texto, mapeo
-    
+        return self._anonimizar_categorias(texto, [self._categoria_tarjetas()])
+
     def _anonimizar_correos(self, texto: str) -> Tuple[str, Dict]:
         """Anonimiza direcciones de correo electrónico."""
-        mapeo = {}
-        
-        # Patrón para correos electrónicos
-        patron_correos = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-        
-        matches = re.findall(patron_correos, texto)
-        for match in matches:
-            if match not in mapeo:
-                # Generar correo ficticio
-                correo_ficticio = self._generar_correo_ficticio(match)
-                mapeo[correo_ficticio] = match
-                texto = texto.replace(match, correo_ficticio)
-        
-        return texto, mapeo
-    
+        return self._anonimizar_categorias(texto, [self._categoria_correos()])
+
     def _anonimizar_direcciones(self, texto: str) -> Tuple[str, Dict]:
         """Anonimiza direcciones físicas."""
-        mapeo = {}
-        
-        # Patrones para direcciones colombianas
-        patrones_direcciones = [
-            r'(?:dirección|dir\.|domicilio)[\s:]*([A-Za-z0-9\s#\-,]{15,80})',  # Con etiqueta
-            r'\b(?:calle|carrera|avenida|av\.|cr\.|cl\.)[\s]+[0-9A-Za-z\s#\-]{10,50}',  # Formato típico colombiano
-            r'\b[A-Za-z]+[\s]+[0-9]+[\s]*#[0-9\-]+[A-Za-z0-9\s]*',  # Carrera 15 #45-67
-        ]
-        
-        for patron in patrones_direcciones:
-            matches = re.findall(patron, texto, re.IGNORECASE)
-            for match in matches:
-                if len(match) > 10 and match not in mapeo:
-                    # Generar dirección ficticia
-                    direccion_ficticia = self._generar_direccion_ficticia(match)
-                    mapeo[direccion_ficticia] = match
-                    texto = texto.replace(match, direccion_ficticia)
-        
-        return texto, mapeo
-    
+        return self._anonimizar_categorias(texto, [self._categoria_direcciones()])
+
     def _anonimizar_numeros_profesionales(self, texto: str) -> Tuple[str, Dict]:
         """Anonimiza números de tarjetas profesionales y similares."""
-        mapeo = {}
-        
-        # Patrones para números profesionales
-        patrones_profesionales = [
-            r'Tarjeta\s+Profesional:\s*(\d{4,8})',  # Tarjeta Profesional: 123456
-            r'T\.P\.?\s*(\d{4,8})',  # T.P. 123456
-            r'Registro:\s*(\d{4,8})',  # Registro: 123456
-        ]
-        
-        for patron in patrones_profesionales:
-            matches = re.findall(patron, texto)
-            for match in matches:
-                if match not in mapeo:
-                    # Generar número profesional ficticio
-                    numero_ficticio = ''.join([str(random.randint(0, 9)) for _ in range(len(match))])
-                    # Asegurar que no sea igual
-                    while numero_ficticio == match:
-                        numero_ficticio = ''.join([str(random.randint(0, 9)) for _ in range(len(match))])
-                    
-                    mapeo[numero_ficticio] = match
-                    texto = texto.replace(match, numero_ficticio)
-        
-        return texto, mapeo
-    
+        return self._anonimizar_categorias(texto, [self._categoria_profesionales()])
+
     def _anonimizar_nombres(self, texto: str) -> Tuple[str, Dict]:
         """Anonimiza nombres de personas con MÁXIMA SEGURIDAD - todos los formatos."""
-        mapeo = {}
-        
-        # Patrones EXHAUSTIVOS para máxima detección de nombres
-        patrones_nombres = [
-            # 1. APELLIDO, NOMBRE (formato judicial típico) - MAYÚSCULAS
-            r'([A-ZÁÉÍÓÚÑ]+(?:\s+[A-ZÁÉÍÓÚÑ]+)*,\s*[A-ZÁÉÍÓÚÑ]+(?:\s+[A-ZÁÉÍÓÚÑ]+)*)',
-            
-            # 2. APELLIDO, NOMBRE (formato judicial) - minúsculas
-            r'([a-záéíóúñ]+(?:\s+[a-záéíóúñ]+)*,\s*[a-záéíóúñ]+(?:\s+[a-záéíóúñ]+)*)',
-            
-            # 3. APELLIDO, NOMBRE (formato judicial) - Mixto
-            r'([A-Za-záéíóúñÁÉÍÓÚÑ]+(?:\s+[A-Za-záéíóúñÁÉÍÓÚÑ]+)*,\s*[A-Za-záéíóúñÁÉÍÓÚÑ]+(?:\s+[A-Za-záéíóúñÁÉÍÓÚÑ]+)*)',
-            
-            # 4. Después de roles específicos - MAYÚSCULAS
-            r'(?:Imputado|Defensor|Fiscal|Víctima|señor|señora|Dr\.|Dra\.|Abg\.|Testigo|Abogado)[\s:]*([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ\s]{8,60})',
-            
-            # 5. Después de roles específicos - minúsculas
-            r'(?:imputado|defensor|fiscal|víctima|señor|señora|dr\.|dra\.|abg\.|testigo|abogado)[\s:]*([a-záéíóúñ][a-záéíóúñ\s]{8,60})',
-            
-            # 6. Nombres completos 3-5 palabras MAYÚSCULAS
-            r'\b([A-ZÁÉÍÓÚÑ]{2,}(?:\s+[A-ZÁÉÍÓÚÑ]{2,}){2,4})\b',
-            
-            # 7. Nombres completos 3-5 palabras minúsculas  
-            r'\b([a-záéíóúñ]{2,}(?:\s+[a-záéíóúñ]{2,}){2,4})\b',
-            
-            # 8. Solo nombre y apellido - MAYÚSCULAS (más restrictivo)
-            r'\b([A-ZÁÉÍÓÚÑ]{3,20}\s+[A-ZÁÉÍÓÚÑ]{3,20})\b',
-            
-            # 9. Solo nombre y apellido - minúsculas
-            r'\b([a-záéíóúñ]{3,20}\s+[a-záéíóúñ]{3,20})\b',
-            
-            # 10. Formato Título (Primera letra mayúscula)
-            r'\b([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+(?:\s+[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+){1,4})\b',
-            
-            # 11. Formato mixto (Juan PÉREZ García)
-            r'\b([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+(?:\s+[A-ZÁÉÍÓÚÑ]{2,})+(?:\s+[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+)*)\b',
-            
-            # 12. En contextos legales específicos - MAYÚSCULAS
-            r'\b([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ\s]{15,45})\s+(?:compareció|declaró|manifestó|expuso|asistió|no\s+compareció)',
-            
-            # 13. En contextos legales específicos - minúsculas
-            r'\b([a-záéíóúñ][a-záéíóúñ\s]{15,45})\s+(?:compareció|declaró|manifestó|expuso|asistió|no\s+compareció)',
-            
-            # 14. Patrones "El señor/La señora" + NOMBRE
-            r'(?:El\s+señor|La\s+señora|El\s+imputado|La\s+víctima)\s+([A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ\s]{8,40})\s+(?:identificado|portador|compareció|declaró)',
-            
-            # 15. Patrones "el señor/la señora" + nombre (minúsculas)
-            r'(?:el\s+señor|la\s+señora|el\s+imputado|la\s+víctima)\s+([a-záéíóúñ][a-záéíóúñ\s]{8,40})\s+(?:identificado|portador|compareció|declaró)',
-        ]
-        
-        nombres_usados = []
-        
-        for patron in patrones_nombres:
-            matches = re.findall(patron, texto)
-            for match in matches:
-                # Si el patrón captura grupos, tomar el primer grupo
-                if isinstance(match, tuple):
-                    match = match[0] if match[0] else match[1] if len(match) > 1 else ""
-                
-                match = match.strip()
-                if match and self._es_nombre_persona(match) and match not in mapeo:
-                    # Asignar nombre ficticio
-                    nombre_ficticio = self._obtener_nombre_ficticio(nombres_usados)
-                    nombres_usados.append(nombre_ficticio)
-                    mapeo[nombre_ficticio] = match
-                    texto = texto.replace(match, nombre_ficticio)
-        
-        return texto, mapeo
-    
+        contexto = self.nuevo_contexto()
+        return self._anonimizar_categorias(texto, [self._categoria_nombres(contexto)], contexto)
+
     def _anonimizar_cedulas(self, texto: str) -> Tuple[str, Dict]:
         """Anonimiza números de cédula o documento."""
-        mapeo = {}
-        
-        # Patrones más específicos y completos para cédulas
-        patrones_cedula = [
-            r'C\.C\.\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})',  # C.C. 1.234.567.890
-            r'T\.I\.\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})',  # T.I. 1.098.765.432
-            r'Cédula(?:\s+de\s+Ciudadanía)?:\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})',  # Cédula: 1.234.567.890
-            r'Documento:\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})',  # Documento: 11.222.333
-            r'NIT:\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})(?:-\d)?',  # NIT: 900.123.456-7
-            r'RUT:\s*\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})(?:-\d)?',  # RUT: 12.345.678-9
-            r'Pasaporte:\s*[A-Z]{2}\d{6,9}',  # Pasaporte: AB1234567
-            r'\b\d{1,3}(?:\.\d{3}){2,3}\b',  # Números con puntos (1.234.567.890 o 11.222.333)
-            r'\b\d{8,12}\b(?!\s*[:]\s*\d)',  # Números largos sin puntos (evitar horas)
-            r'C\.C\.\s*\d{8,12}',  # C.C. sin puntos
-            r'T\.I\.\s*\d{8,12}',  # T.I. sin puntos
-        ]
-        
-        for patron in patrones_cedula:
-            matches = re.findall(patron, texto)
-            for match in matches:
-                if match not in mapeo:
-                    # Generar cédula ficticia
-                    cedula_ficticia = self._generar_cedula_ficticia(match)
-                    mapeo[cedula_ficticia] = match
-                    texto = texto.replace(match, cedula_ficticia)
-        
-        return texto, mapeo
-    
+        return self._anonimizar_categorias(texto, [self._categoria_cedulas()])
+
     def _anonimizar_juzgados(self, texto: str) -> Tuple[str, Dict]:
         """Anonimiza nombres específicos de juzgados."""
-        mapeo = {}
-        
-        # Patrones para juzgados específicos
-        patron_juzgado = r'(JUZGADO|TRIBUNAL|FISCALÍA)[^\.]{10,100}'
-        
-        matches = re.findall(patron_juzgado, texto, re.IGNORECASE)
-        for match in matches:
-            if match not in mapeo and len(match) > 20:  # Solo juzgados específicos largos
-                juzgado_ficticio = random.choice(self.juzgados_ficticios)
-                mapeo[juzgado_ficticio] = match
-                texto = texto.replace(match, juzgado_ficticio)
-        
-        return texto, mapeo
+        return self._anonimizar_categorias(texto, [self._categoria_juzgados()])
     
     def desaronimizar_datos(self, datos_ia: Dict, mapeo_reverso: Dict) -> Dict:
         """
@@ -410,104 +606,84 @@ class AnonimizadorDatos:
             Dict: Datos con información real restaurada
         """
         datos_reales = datos_ia.copy()
-        
-        # Revertir en todos los campos de texto
+        if not mapeo_reverso:
+            return datos_reales
+
+        # Revertir en todos los campos de texto. Los valores ficticios se
+        # indexan una vez y cada campo se recorre una sola vez
+        indice = _indice_buscados(mapeo_reverso)
         for campo, valor in datos_reales.items():
             if isinstance(valor, str):
-                for anonimo, real in mapeo_reverso.items():
-                    datos_reales[campo] = valor.replace(anonimo, real)
-        
+                datos_reales[campo] = _reemplazar_todos(valor, mapeo_reverso, indice)
+
         return datos_reales
-    
-    def _generar_radicado_ficticio(self, radicado_original: str) -> str:
+
+    def _flujo_clave(self, valor: str, longitud: int) -> bytes:
+        """``longitud`` bytes pseudoaleatorios derivados de ``valor`` con la clave de sesión.
+
+        Usa BLAKE2b con clave (un MAC, como HMAC) en modo contador: el mismo
+        valor da siempre los mismos bytes durante la sesión y sin la clave
+        no se pueden relacionar con el original.
+        """
+        mensaje = valor.encode("utf-8")
+        flujo = b""
+        contador = 0
+        while len(flujo) < longitud:
+            flujo += hashlib.blake2b(
+                contador.to_bytes(4, "big") + mensaje, key=self._clave_sesion
+            ).digest()
+            contador += 1
+        return flujo[:longitud]
+
+    def _cambiar_digitos(self, valor: str, contexto: str, intento: int = 0) -> str:
+        """Cambia cada dígito de ``valor`` conservando letras, puntos y guiones.
+
+        Cada dígito se desplaza entre 1 y 9 posiciones según el byte del
+        flujo de la clave en su posición, así el resultado nunca coincide
+        con el original y se calcula de una vez. ``contexto`` separa los
+        tipos de dato (el mismo número como cédula y como radicado da
+        valores ficticios distintos) e ``intento`` da otro valor para el
+        mismo dato cuando el primero ya estaba asignado a otro.
+        """
+        flujo = self._flujo_clave(f"{contexto}:{intento}:{valor}", len(valor))
+        return "".join([
+            _DIGITO_DESPLAZADO[byte].get(caracter, caracter)
+            for caracter, byte in zip(valor, flujo)
+        ])
+
+    def _generar_numero_profesional(self, numero_original: str, intento: int = 0) -> str:
+        """Genera un número profesional ficticio de la misma longitud."""
+        return self._cambiar_digitos(numero_original, "profesional", intento)
+
+    def _generar_radicado_ficticio(self, radicado_original: str, intento: int = 0) -> str:
         """Genera un radicado ficticio con el mismo formato."""
-        # Mantener formato pero cambiar números
-        if '-' in radicado_original:
-            partes = radicado_original.split('-')
-            nuevas_partes = []
-            for parte in partes:
-                if parte.isdigit():
-                    nueva_parte = ''.join([str(random.randint(0, 9)) for _ in range(len(parte))])
-                    # Asegurar que no sea igual al original
-                    while nueva_parte == parte:
-                        nueva_parte = ''.join([str(random.randint(0, 9)) for _ in range(len(parte))])
-                    nuevas_partes.append(nueva_parte)
-                else:
-                    nuevas_partes.append(parte)
-            return '-'.join(nuevas_partes)
-        else:
-            # Número sin guiones
-            return ''.join([str(random.randint(0, 9)) for _ in range(len(radicado_original))])
-    
-    def _obtener_nombre_ficticio(self, nombres_usados: list) -> str:
-        """Obtiene un nombre ficticio no usado."""
-        disponibles = [n for n in self.nombres_ficticios if n not in nombres_usados]
-        if disponibles:
-            return random.choice(disponibles)
-        else:
-            # Generar nombre adicional si se agotan
-            return f"PERSONA_{random.randint(100, 999)} APELLIDO_{random.randint(100, 999)}"
-    
-    def _generar_cedula_ficticia(self, cedula_original: str) -> str:
-        """Genera una cédula ficticia manteniendo el formato."""
-        
-        # Caso especial: Pasaporte
-        if 'Pasaporte:' in cedula_original or re.match(r'[A-Z]{2}\d{6,9}', cedula_original):
-            letras = ''.join([chr(random.randint(65, 90)) for _ in range(2)])  # AA-ZZ
-            numeros = ''.join([str(random.randint(0, 9)) for _ in range(7)])
-            return f"{letras}{numeros}"
-        
-        # Si contiene prefijo (C.C., T.I., etc.)
-        if any(prefijo in cedula_original for prefijo in ['C.C.', 'T.I.', 'Cédula', 'Documento', 'NIT:', 'RUT:']):
-            # Extraer solo los números con puntos
-            numeros_con_puntos = re.search(r'\d{1,3}(?:\.\d{3})*(?:\.\d{1,3})', cedula_original)
-            if numeros_con_puntos:
-                numeros_originales = numeros_con_puntos.group()
-                nueva_cedula = self._generar_numeros_con_formato(numeros_originales)
-                return cedula_original.replace(numeros_originales, nueva_cedula)
-        
-        # Si es solo números con puntos
-        if '.' in cedula_original and cedula_original.replace('.', '').replace('-', '').isdigit():
-            return self._generar_numeros_con_formato(cedula_original)
-        
-        # Si es solo números sin formato
-        if cedula_original.replace('-', '').isdigit():
-            nueva_cedula = ''.join([str(random.randint(0, 9)) for _ in range(len(cedula_original.replace('-', '')))])
-            # Asegurar que no sea igual
-            while nueva_cedula == cedula_original.replace('-', ''):
-                nueva_cedula = ''.join([str(random.randint(0, 9)) for _ in range(len(cedula_original.replace('-', '')))])
-            
-            # Restaurar guiones si existían
-            if '-' in cedula_original:
-                pos_guion = cedula_original.rfind('-')
-                return nueva_cedula[:pos_guion] + '-' + nueva_cedula[pos_guion:]
-            return nueva_cedula
-        
-        return cedula_original
+        return self._cambiar_digitos(radicado_original, "radicado", intento)
     
-    def _generar_numeros_con_formato(self, numeros_con_puntos: str) -> str:
-        """Genera números ficticios manteniendo el formato con puntos."""
-        partes = numeros_con_puntos.split('.')
-        nuevas_partes = []
-        
-        for parte in partes:
-            nueva_parte = ''.join([str(random.randint(0, 9)) for _ in range(len(parte))])
-            # Evitar que sea igual
-            while nueva_parte == parte:
-                nueva_parte = ''.join([str(random.randint(0, 9)) for _ in range(len(parte))])
-            nuevas_partes.append(nueva_parte)
-        
-        return '.'.join(nuevas_partes)
+    def _generar_cedula_ficticia(self, cedula_original: str, intento: int = 0) -> str:
+        """Genera una cédula ficticia manteniendo el formato (prefijo, puntos y guiones)."""
+        pasaporte = _PASAPORTE.search(cedula_original)
+        if pasaporte is None:
+            return self._cambiar_digitos(cedula_original, "cedula", intento)
+
+        # Pasaporte: también se cambian las dos letras
+        codigo = pasaporte.group()
+        flujo = self._flujo_clave(f"pasaporte:{intento}:{codigo}", 2)
+        letras = "".join(
+            chr(65 + (ord(letra) - 65 + 1 + byte % 25) % 26) for letra, byte in zip(codigo, flujo)
+        )
+        nuevo_codigo = letras + self._cambiar_digitos(codigo[2:], "pasaporte", intento)
+        return cedula_original.replace(codigo, nuevo_codigo)
     
-    def _generar_celular_ficticio(self, celular_original: str) -> str:
+    def _generar_celular_ficticio(self, celular_original: str, intento: int = 0) -> str:
         """Genera un número de celular ficticio manteniendo el formato."""
         # Limpiar el número (solo dígitos)
-        solo_digitos = re.sub(r'[^\d]', '', celular_original)
+        solo_digitos = _NO_DIGITOS.sub('', celular_original)
         
         if len(solo_digitos) >= 10:
             # Generar con prefijo colombiano ficticio
-            prefijo = random.choice(self.prefijos_celular)
-            resto = ''.join([str(random.randint(0, 9)) for _ in range(7)])
+            flujo = self._flujo_clave(f"celular:{intento}:{solo_digitos}", 8)
+            prefijo = self.prefijos_celular[flujo[0] % len(self.prefijos_celular)]
+            resto = "".join(_DIGITOS[byte % 10] for byte in flujo[1:])
             nuevo_numero = prefijo + resto
             
             # Mantener el formato original (espacios, guiones)
@@ -519,22 +695,21 @@ class AnonimizadorDatos:
                 return nuevo_numero
         else:
             # Si es muy corto, generar similar
-            return ''.join([str(random.randint(0, 9)) for _ in range(len(solo_digitos))])
+            return self._cambiar_digitos(solo_digitos, "celular", intento)
     
-    def _generar_tarjeta_ficticia(self, tarjeta_original: str) -> str:
+    def _generar_tarjeta_ficticia(self, tarjeta_original: str, intento: int = 0) -> str:
         """Genera un número de tarjeta de crédito ficticio."""
         # Limpiar (solo dígitos)
-        solo_digitos = re.sub(r'[^\d]', '', tarjeta_original)
+        solo_digitos = _NO_DIGITOS.sub('', tarjeta_original)
         
         # Caso especial: "terminada en XXXX"
         if len(solo_digitos) == 4:
-            return str(random.randint(1000, 9999))
+            return self._cambiar_digitos(solo_digitos, "tarjeta", intento)
         
         # Generar según longitud (15 para Amex, 16 para otros)
         if len(solo_digitos) == 15:  # American Express
             primer_digito = '3'
-            resto = ''.join([str(random.randint(0, 9)) for _ in range(14)])
-            nueva_tarjeta = primer_digito + resto
+            nueva_tarjeta = primer_digito + self._cambiar_digitos(solo_digitos[1:], "tarjeta", intento)
             
             # Mantener formato original
             if ' ' in tarjeta_original or '-' in tarjeta_original:
@@ -545,8 +720,7 @@ class AnonimizadorDatos:
                 
         elif len(solo_digitos) == 16:  # Visa, MasterCard, etc.
             primer_digito = solo_digitos[0] if solo_digitos[0] in '456' else '4'  # 4=Visa, 5=MasterCard, 6=Discover
-            resto = ''.join([str(random.randint(0, 9)) for _ in range(15)])
-            nueva_tarjeta = primer_digito + resto
+            nueva_tarjeta = primer_digito + self._cambiar_digitos(solo_digitos[1:], "tarjeta", intento)
             
             # Mantener formato original
             if ' ' in tarjeta_original or '-' in tarjeta_original:
@@ -556,10 +730,10 @@ class AnonimizadorDatos:
                 return nueva_tarjeta
         else:
             # Longitud no estándar, generar de la misma longitud
-            return ''.join([str(random.randint(0, 9)) for _ in range(len(solo_digitos))])
+            return self._cambiar_digitos(solo_digitos, "tarjeta", intento)
     
-    def _generar_correo_ficticio(self, correo_original: str) -> str:
-        """Genera un correo electrónico ficticio."""
+    def _generar_correo_ficticio(self, correo_original: str, intento: int = 0) -> str:
+        """Genera un correo electrónico ficticio (aleatorio: ``intento`` no se usa)."""
         try:
             usuario, dominio = correo_original.split('@')
             # Generar usuario ficticio de longitud similar
@@ -569,8 +743,8 @@ class AnonimizadorDatos:
         except:
             return f"usuario{random.randint(100, 999)}@ejemplo.com"
     
-    def _generar_direccion_ficticia(self, direccion_original: str) -> str:
-        """Genera una dirección ficticia manteniendo el formato."""
+    def _generar_direccion_ficticia(self, direccion_original: str, intento: int = 0) -> str:
+        """Genera una dirección ficticia manteniendo el formato (aleatoria: ``intento`` no se usa)."""
         # Direcciones ficticias típicas colombianas
         calles = ["Carrera", "Calle", "Avenida", "Diagonal", "Transversal"]
         numeros_principales = [random.randint(10, 150) for _ in range(5)]
@@ -581,55 +755,71 @@ class AnonimizadorDatos:
         num_secundario = random.choice(numeros_secundarios)
         
         return f"{calle} {num_principal} #{num_secundario}"
-    
-    def _es_nombre_persona(self, texto: str) -> bool:
-        """Determina si un texto parece ser un nombre de persona."""
-        # Filtrar instituciones obvias
-        instituciones = ['JUZGADO', 'TRIBUNAL', 'FISCALÍA', 'MINISTERIO', 'DEFENSORÍA', 
-                        'POLICÍA', 'INPEC', 'ICBF', 'AUDIENCIA', 'SALA', 'PENAL',
-                        'CIRCUITO', 'MUNICIPAL', 'COLOMBIA', 'BOGOTÁ', 'MEDELLÍN',
-                        'CALI', 'BARRANQUILLA', 'NACIONAL', 'DISTRITO']
-        
-        texto_upper = texto.upper().strip()
-        
-        for inst in instituciones:
-            if inst in texto_upper:
-                return False
-        
-        # Filtrar si contiene números (no es nombre de persona)
-        if re.search(r'\d', texto):
-            return False
-        
-        # Debe ser entre 2-5 palabras (aumentado para nombres completos)
-        palabras = texto_upper.split()
-        if len(palabras) < 2 or len(palabras) > 5:
-            return False
-        
-        # Filtrar palabras muy cortas o muy largas
-        for palabra in palabras:
-            if len(palabra) < 2 or len(palabra) > 15:
-                return False
-        
-        # Cada palabra debe empezar con letra
-        for palabra in palabras:
-            if not palabra[0].isalpha():
-                return False
-        
-        # Verificar que no sean solo conectores
-        conectores = ['DE', 'DEL', 'LA', 'LAS', 'LOS', 'Y', 'E']
-        if all(palabra in conectores for palabra in palabras):
-            return False
-        
-        return True
+
+
+class CacheAnonimizacion:
+    """Últimos textos anonimizados, para reintentos con el mismo dictado.
+
+    Si se vuelve a procesar el mismo texto (por ejemplo tras un error de
+    OpenAI) se devuelve el mismo texto anonimizado y el mismo mapeo, sin
+    repetir la búsqueda y con los mismos valores ficticios.
+
+    La clave es un hash con clave secreta del texto, generada al iniciar el
+    proceso: el texto original no se guarda como clave y el hash no sirve
+    para comprobar textos fuera de esta ejecución. Todo queda solo en
+    memoria, se descartan los menos usados al pasar de ``capacidad`` y
+    ``limpiar`` borra todo.
+    """
+
+    def __init__(self, capacidad: int = 32):
+        self.capacidad = capacidad
+        self._clave = secrets.token_bytes(32)
+        self._entradas: "OrderedDict[bytes, Tuple[str, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def _hash(self, texto: str) -> bytes:
+        return hashlib.blake2b(texto.encode("utf-8"), key=self._clave).digest()
+
+    def obtener(self, texto: str) -> Optional[Tuple[str, Dict]]:
+        """Resultado guardado para ``texto`` o ``None``. El mapeo es una copia."""
+        clave = self._hash(texto)
+        with self._lock:
+            resultado = self._entradas.get(clave)
+            if resultado is None:
+                return None
+            self._entradas.move_to_end(clave)
+        texto_anonimo, mapeo_reverso = resultado
+        return texto_anonimo, dict(mapeo_reverso)
+
+    def guardar(self, texto: str, texto_anonimo: str, mapeo_reverso: Dict):
+        """Guarda una copia del resultado, descartando el menos usado si está llena."""
+        clave = self._hash(texto)
+        with self._lock:
+            self._entradas[clave] = (texto_anonimo, dict(mapeo_reverso))
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+
+    def limpiar(self):
+        """Borra todos los resultados guardados."""
+        with self._lock:
+            self._entradas.clear()
 
 
 # Instancia global
 anonimizador = AnonimizadorDatos()
+cache_anonimizacion = CacheAnonimizacion()
 
 
 def anonimizar_para_ia(texto: str) -> Tuple[str, Dict]:
     """
     Función de conveniencia para anonimizar texto antes de enviarlo a IA.
+
+    Si el mismo texto se anonimizó hace poco se devuelve el resultado
+    guardado (ver ``CacheAnonimizacion``).
     
     Args:
         texto: Texto original
@@ -637,9 +827,66 @@ def anonimizar_para_ia(texto: str) -> Tuple[str, Dict]:
     Returns:
         Tuple[str, Dict]: (texto_anonimizado, mapeo_reverso)
     """
+    resultado = cache_anonimizacion.obtener(texto)
+    if resultado is not None:
+        return resultado
+
+    texto_anonimo, mapeo_reverso = anonimizador.anonimizar_texto(texto)
+    cache_anonimizacion.guardar(texto, texto_anonimo, mapeo_reverso)
+    return texto_anonimo, mapeo_reverso
+
+
+def _iniciar_proceso_anonimizacion(clave_sesion: bytes):
+    """Prepara el anonimizador de un proceso del lote con la clave del proceso principal."""
+    global anonimizador
+    anonimizador = AnonimizadorDatos(clave_sesion)
+
+
+def _anonimizar_en_proceso(texto: str) -> Tuple[str, Dict]:
     return anonimizador.anonimizar_texto(texto)
 
 
+def anonimizar_lote(textos: Iterable[str], max_procesos: Optional[int] = None) -> List[Tuple[str, Dict]]:
+    """
+    Anonimiza muchos documentos repartiéndolos entre varios procesos.
+
+    Cada documento se anonimiza por separado y recibe su propio mapeo. Los
+    procesos usan la clave de la sesión actual, así que un mismo número
+    recibe el mismo valor ficticio que con ``anonimizar_para_ia``. Los
+    lotes pequeños (o ``max_procesos=1``) se procesan en este proceso. No
+    usa la caché de ``anonimizar_para_ia``.
+
+    Args:
+        textos: Documentos originales
+        max_procesos: Procesos a usar (por defecto, uno por CPU)
+
+    Returns:
+        List[Tuple[str, Dict]]: (texto_anonimizado, mapeo_reverso) de cada
+        documento, en el mismo orden
+    """
+    textos = list(textos)
+    procesos = min(max_procesos or os.cpu_count() or 1, len(textos))
+    if procesos <= 1 or len(textos) < MINIMO_TEXTOS_PARALELO:
+        return [anonimizador.anonimizar_texto(texto) for texto in textos]
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=procesos,
+            initializer=_iniciar_proceso_anonimizacion,
+            initargs=(anonimizador._clave_sesion,),
+        ) as ejecutor:
+            # Bloques grandes para no pagar un envío entre procesos por texto
+            bloque = max(1, len(textos) // (procesos * 4))
+            return list(ejecutor.map(_anonimizar_en_proceso, textos, chunksize=bloque))
+    except Exception as e:
+        raise Exception(f"Error al anonimizar el lote: {e}")
+
+
+def limpiar_cache_anonimizacion():
+    """Olvida los textos anonimizados guardados (por ejemplo al cerrar sesión)."""
+    cache_anonimizacion.limpiar()
+
+
 def restaurar_datos_ia(datos_ia: Dict, mapeo_reverso: Dict) -> Dict:
     """
     Función de conveniencia para restaurar datos reales después de IA.
@@ -0,0 +1,251 @@
+"""
+Detección de nombres de personas en textos judiciales.
+
+Recorre el texto una sola vez, token por token, con una pequeña máquina de
+estados: acumula palabras seguidas con la misma forma (MAYÚSCULAS o Título
+por un lado, minúsculas por otro) y, al cortarse la secuencia, decide si es
+un nombre. No usa patrones con cuantificadores anidados, así el tiempo es
+lineal en el largo del texto sin importar su contenido.
+
+La forma sola no basta: "cédula de ciudadanía" tiene la forma de un nombre
+en minúsculas. Cada secuencia candidata se puntúa contra un diccionario de
+nombres y apellidos colombianos comunes (``utils/datos``), que se carga una
+sola vez la primera vez que se usa.
+"""
+
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import FrozenSet, Iterator, List, Optional, Tuple
+
+# Palabras, números o cualquier otro carácter suelto (sin espacios). Cada
+# alternativa es una sola clase de caracteres: el tokenizador no retrocede.
+_TOKEN = re.compile(r"[^\W\d_]+|\d+|\S")
+
+# Las palabras se comparan en mayúsculas y sin tildes: "Rodriguez" y
+# "RODRÍGUEZ" son la misma clave. La Ñ se conserva.
+_SIN_TILDES = str.maketrans("ÁÉÍÓÚÜ", "AEIOUU")
+
+ARCHIVOS_DICCIONARIO = ("nombres.txt", "apellidos.txt")
+
+
+def clave_palabra(palabra: str) -> str:
+    """Clave de comparación de una palabra: mayúsculas y sin tildes."""
+    return palabra.upper().translate(_SIN_TILDES)
+
+
+def _claves(*palabras: str) -> FrozenSet[str]:
+    return frozenset(clave_palabra(palabra) for palabra in palabras)
+
+
+def _directorio_datos() -> Path:
+    """Carpeta ``datos`` junto a este módulo (o dentro del ejecutable empaquetado)."""
+    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+        return Path(sys._MEIPASS) / "utils" / "datos"
+    return Path(__file__).parent / "datos"
+
+
+@lru_cache(maxsize=None)
+def diccionario_nombres() -> FrozenSet[str]:
+    """Nombres y apellidos conocidos, como claves (ver ``clave_palabra``).
+
+    Se lee de disco solo la primera vez. Si faltan los archivos se devuelve
+    un conjunto vacío y la detección vuelve a depender solo de la forma:
+    anonimizar de más es preferible a dejar un nombre a la vista.
+    """
+    claves = set()
+    for archivo in ARCHIVOS_DICCIONARIO:
+        try:
+            with open(_directorio_datos() / archivo, encoding="utf-8") as f:
+                for linea in f:
+                    linea = linea.strip()
+                    if linea and not linea.startswith("#"):
+                        claves.add(clave_palabra(linea))
+        except OSError as e:
+            print(f"⚠️ Advertencia: No se pudo cargar el diccionario de nombres ({archivo}): {e}")
+            return frozenset()
+    return frozenset(claves)
+
+
+# Partículas que pueden ir dentro de un nombre (MARÍA DE LOS ÁNGELES)
+CONECTORES = _claves("DE", "DEL", "LA", "LAS", "LOS")
+
+# Roles que anuncian un nombre a continuación. Después de uno de ellos se
+# acepta también un solo apellido en mayúsculas o Título (el señor PÉREZ).
+ROLES = _claves(
+    "IMPUTADO", "IMPUTADA", "DEFENSOR", "DEFENSORA", "FISCAL", "VÍCTIMA",
+    "SEÑOR", "SEÑORA", "DR", "DRA", "ABG", "TESTIGO", "ABOGADO", "ABOGADA",
+    "APODERADO", "APODERADA", "ACUSADO", "ACUSADA", "PROCESADO", "PROCESADA",
+    "JUEZ", "JUEZA",
+)
+
+# Palabras de instituciones y lugares: la secuencia que las contiene es el
+# nombre de una entidad, no de una persona, y se descarta. Si después de
+# una de ellas cambia la escritura (Sala Penal JORGE DÍAZ) la secuencia se
+# corta ahí y lo que sigue puede ser un nombre.
+INSTITUCIONES = _claves(
+    "JUZGADO", "TRIBUNAL", "FISCALÍA", "MINISTERIO", "DEFENSORÍA", "POLICÍA",
+    "INPEC", "ICBF", "AUDIENCIA", "SALA", "PENAL", "CIRCUITO", "MUNICIPAL",
+    "COLOMBIA", "BOGOTÁ", "MEDELLÍN", "CALI", "BARRANQUILLA", "NACIONAL",
+    "DISTRITO", "CORTE", "SUPREMA", "SUPERIOR", "REPÚBLICA", "DESPACHO",
+    "SECRETARÍA", "GARANTÍAS", "CONOCIMIENTO", "SECCIONAL", "CARRERA", "CALLE", "AVENIDA", "DIAGONAL", "TRANSVERSAL",
+)
+
+# Palabras que nunca forman parte de un nombre y cortan la secuencia:
+# preposiciones, artículos y verbos de las actas (compareció, declaró...).
+PARADAS = _claves(
+    "A", "AL", "ANTE", "CON", "CONTRA", "DESDE", "EN", "ENTRE", "HACIA",
+    "HASTA", "PARA", "POR", "SEGÚN", "SIN", "SOBRE", "TRAS", "EL", "LO",
+    "LE", "LES", "UN", "UNA", "UNOS", "UNAS", "SU", "SUS", "SE", "QUE",
+    "NO", "SÍ", "SI", "ES", "FUE", "SON", "HA", "Y", "E", "O", "U", "NI",
+    "COMPARECIÓ", "COMPARECIERON", "DECLARÓ", "MANIFESTÓ", "EXPUSO",
+    "ASISTIÓ", "PRESENTÓ", "IDENTIFICADO", "IDENTIFICADA", "PORTADOR",
+    "PORTADORA",
+)
+
+MAX_PALABRAS = 5
+MIN_LETRAS_APELLIDO = 3
+MAX_LETRAS = 15
+
+# Forma de cada palabra
+_MAYUSCULA = "M"  # MAYÚSCULAS o Título: misma familia (Juan PÉREZ García)
+_MINUSCULA = "m"
+
+
+def _escritura(palabra: str) -> bool:
+    """Distingue MAYÚSCULAS de Título dentro de la misma forma."""
+    return palabra.isupper()
+
+
+def _forma(palabra: str) -> str:
+    if palabra.islower():
+        return _MINUSCULA
+    if palabra[0].isupper():
+        return _MAYUSCULA
+    return ""  # mEzClA: no es un nombre
+
+
+def buscar_nombres(texto: str, conocidos: Optional[FrozenSet[str]] = None) -> Iterator[Tuple[int, int]]:
+    """Posiciones ``(inicio, fin)`` de los nombres de personas en ``texto``.
+
+    Un nombre es una secuencia de 2 a 5 palabras con la misma forma,
+    separadas solo por espacios (con conectores como DE o LA en medio) o
+    con una coma en el formato judicial ``APELLIDO, NOMBRE``. Las
+    secuencias más largas se parten en grupos de hasta 5 palabras. Una
+    palabra de institución descarta la secuencia; roles, preposiciones,
+    verbos, números y signos la cortan, igual que un cambio de escritura
+    después de una palabra de institución.
+
+    Cada secuencia se puntúa contra ``diccionario_nombres``: se acepta si
+    alguna de sus palabras es un nombre o apellido conocido, si viene justo
+    después de un rol o si usa la coma de ``APELLIDO, NOMBRE``. Un nombre o
+    apellido conocido escrito en MAYÚSCULAS se acepta aunque esté solo.
+    ``conocidos`` reemplaza al diccionario; vacío, decide solo la forma.
+    """
+    if conocidos is None:
+        conocidos = diccionario_nombres()
+    palabras: List[Tuple[int, int, str]] = []  # (inicio, fin, PALABRA) de la secuencia
+    forma = ""
+    institucional = False
+    mayusculas = False  # escritura de la última palabra que no es conector
+    coma = False  # hay una coma pendiente después de la última palabra
+    coma_usada = False
+    tras_rol = False  # la secuencia empezó justo después de un rol
+    rol_pendiente = False  # el último token fue un rol (o su punto/dos puntos)
+
+    def cerrar() -> Iterator[Tuple[int, int]]:
+        if palabras and not institucional:
+            yield from _nombres_de_secuencia(texto, palabras, forma, tras_rol, coma_usada, conocidos)
+
+    for token in _TOKEN.finditer(texto):
+        valor = token.group()
+        if valor[0].isalpha():
+            clave = clave_palabra(valor)
+            forma_token = _forma(valor)
+
+            if clave in ROLES or clave in PARADAS:
+                yield from cerrar()
+                palabras, institucional, coma, coma_usada = [], False, False, False
+                tras_rol = False
+                rol_pendiente = clave in ROLES
+                continue
+
+            conector = clave in CONECTORES
+            continuar = (
+                palabras
+                and (forma_token == forma or conector and not coma)
+                and len(valor) <= MAX_LETRAS
+                # Tras una institución, un cambio de escritura empieza otra secuencia
+                and not (institucional and not conector and _escritura(valor) != mayusculas)
+            )
+            if continuar:
+                if coma:
+                    coma_usada = True
+                    coma = False
+                palabras.append((token.start(), token.end(), clave))
+                institucional = institucional or clave in INSTITUCIONES
+                if not conector:
+                    mayusculas = _escritura(valor)
+                continue
+
+            # Empieza una secuencia nueva con esta palabra
+            yield from cerrar()
+            palabras, coma, coma_usada = [], False, False
+            institucional = clave in INSTITUCIONES
+            if forma_token and 1 < len(valor) <= MAX_LETRAS and clave not in CONECTORES:
+                palabras.append((token.start(), token.end(), clave))
+                forma = forma_token
+                mayusculas = _escritura(valor)
+                tras_rol = rol_pendiente
+            rol_pendiente = False
+            continue
+
+        if valor == "," and palabras and not coma and not coma_usada and not institucional:
+            coma = True
+            continue
+        if valor in ".:" and rol_pendiente:
+            # Dr. PÉREZ / Testigo: PÉREZ
+            continue
+
+        yield from cerrar()
+        palabras, institucional, coma, coma_usada = [], False, False, False
+        tras_rol = rol_pendiente = False
+
+    yield from cerrar()
+
+
+def _nombres_de_secuencia(
+    texto: str,
+    palabras: List[Tuple[int, int, str]],
+    forma: str,
+    tras_rol: bool,
+    con_coma: bool,
+    conocidos: FrozenSet[str],
+) -> Iterator[Tuple[int, int]]:
+    """Parte una secuencia en grupos de hasta MAX_PALABRAS y devuelve los que son nombres.
+
+    Sin diccionario (``conocidos`` vacío) se decide solo por la forma.
+    """
+    for desde in range(0, len(palabras), MAX_PALABRAS):
+        grupo = palabras[desde:desde + MAX_PALABRAS]
+        # Los conectores no pueden quedar en los extremos
+        while grupo and grupo[-1][2] in CONECTORES:
+            grupo.pop()
+        while grupo and grupo[0][2] in CONECTORES:
+            grupo.pop(0)
+        if not grupo:
+            continue
+
+        contexto = tras_rol and desde == 0
+        conocido = any(clave in conocidos for _, _, clave in grupo)
+        if len(grupo) >= 2:
+            if conocido or contexto or con_coma or not conocidos:
+                yield grupo[0][0], grupo[-1][1]
+            continue
+
+        inicio, fin, clave = grupo[0]
+        if forma != _MAYUSCULA or len(clave) < MIN_LETRAS_APELLIDO:
+            continue
+        if contexto or conocido and texto[inicio:fin].isupper():
+            yield inicio, fin
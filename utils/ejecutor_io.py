@@ -0,0 +1,125 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class EjecutorIO:
+    """Ejecuta las operaciones de archivo fuera del hilo de la interfaz.
+
+    Cada libro (``clave``, normalmente su ruta) tiene su propio hilo y su
+    propia cola: las operaciones sobre un mismo archivo se ejecutan de una en
+    una y en el orden en que se enviaron, mientras que las de archivos
+    distintos no se esperan entre sí.
+
+    Los callbacks de fin (``al_terminar``/``al_fallar``) y los cambios de
+    estado (``al_cambiar_estado(ocupado)``, para mostrar un indicador de
+    progreso) se entregan a través de ``despachar``; en la interfaz se usa
+    ``page.run_thread`` para devolverlos a la página.
+    """
+
+    def __init__(
+        self,
+        despachar: Optional[Callable[..., Any]] = None,
+        al_cambiar_estado: Optional[Callable[[bool], None]] = None,
+    ):
+        self._despachar = despachar or (lambda funcion, *args: funcion(*args))
+        self._al_cambiar_estado = al_cambiar_estado
+        self._ejecutores: Dict[str, ThreadPoolExecutor] = {}
+        # Libros liberados cuya cola aún se está vaciando: se completa cuando
+        # termina la última operación que tenían encolada
+        self._vaciando: Dict[str, Future] = {}
+        self._pendientes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ocupado(self) -> bool:
+        """Indica si hay operaciones en cola o en curso."""
+        return self._pendientes > 0
+
+    def enviar(
+        self,
+        clave: str,
+        operacion: Callable[[], Any],
+        al_terminar: Optional[Callable[[Any], None]] = None,
+        al_fallar: Optional[Callable[[Exception], None]] = None,
+    ) -> Future:
+        """Encola ``operacion`` en la cola del libro ``clave``.
+
+        ``al_terminar`` recibe el resultado y ``al_fallar`` la excepción.
+        """
+        with self._lock:
+            ejecutor = self._ejecutores.get(clave)
+            if ejecutor is None:
+                ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="io-excel")
+                self._ejecutores[clave] = ejecutor
+                anterior = self._vaciando.pop(clave, None)
+                if anterior is not None and not anterior.done():
+                    # La cola nueva no empieza hasta que termine la anterior:
+                    # nunca hay dos hilos escribiendo el mismo libro
+                    ejecutor.submit(anterior.result)
+            # Se encola sin soltar el lock: un ``liberar`` simultáneo no puede
+            # cerrar este ejecutor entre la búsqueda y el envío
+            futuro = ejecutor.submit(operacion)
+            self._pendientes += 1
+            empieza = self._pendientes == 1
+
+        if empieza:
+            self._notificar_estado(True)
+        futuro.add_done_callback(
+            lambda f: self._al_completar(f, al_terminar, al_fallar)
+        )
+        return futuro
+
+    def liberar(self, clave: str):
+        """Cierra la cola de un libro cuando terminen sus operaciones pendientes.
+
+        Si se vuelve a enviar algo al mismo libro antes de que la cola se
+        vacíe, la cola nueva espera a la anterior.
+        """
+        with self._lock:
+            ejecutor = self._ejecutores.pop(clave, None)
+            if ejecutor is None:
+                return
+            vaciada = ejecutor.submit(lambda: None)
+            self._vaciando[clave] = vaciada
+        vaciada.add_done_callback(lambda _: self._olvidar_vaciado(clave, vaciada))
+        ejecutor.shutdown(wait=False)
+
+    def _olvidar_vaciado(self, clave: str, vaciada: Future):
+        with self._lock:
+            if self._vaciando.get(clave) is vaciada:
+                del self._vaciando[clave]
+
+    def cerrar(self, esperar: bool = True):
+        """Cierra todas las colas, esperando opcionalmente a que se vacíen."""
+        with self._lock:
+            ejecutores = list(self._ejecutores.values())
+            vaciando = list(self._vaciando.values())
+            self._ejecutores.clear()
+        for ejecutor in ejecutores:
+            ejecutor.shutdown(wait=esperar)
+        if esperar:
+            for vaciada in vaciando:
+                vaciada.result()
+
+    def _al_completar(self, futuro: Future, al_terminar, al_fallar):
+        with self._lock:
+            self._pendientes -= 1
+            termina = self._pendientes == 0
+
+        error = futuro.exception()
+        try:
+            if error is None:
+                if al_terminar:
+                    self._despachar(al_terminar, futuro.result())
+            elif al_fallar:
+                self._despachar(al_fallar, error)
+            else:
+                print(f"Error en operación de archivo: {error}")
+        finally:
+            if termina:
+                self._notificar_estado(False)
+
+    def _notificar_estado(self, ocupado: bool):
+        if self._al_cambiar_estado:
+            self._despachar(self._al_cambiar_estado, ocupado)
@@ -2,6 +2,8 @@ import os
 import sys
 import shutil
 
+from models.excel_manager import ExcelManager
+
 def obtener_directorio_real():
     """Devuelve la carpeta donde realmente se encuentra el .exe o .py"""
     if getattr(sys, 'frozen', False):
@@ -58,6 +60,10 @@ def eliminar_archivo(nombre_archivo):
     ruta = os.path.join(ARCHIVOS_CREADOS_DIR, nombre_archivo)
     if os.path.exists(ruta):
         os.remove(ruta)
+        # Eliminar también los archivos auxiliares (totales persistidos, etc.)
+        for asociado in ExcelManager.archivos_asociados(ruta):
+            if os.path.exists(asociado):
+                os.remove(asociado)
         return True
     return False
 
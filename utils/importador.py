@@ -0,0 +1,133 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import List, Optional, Tuple
+
+from models.audiencia import Audiencia
+from models.excel_manager import ExcelManager
+
+try:
+    from config.config import STORAGE_ENGINE
+except ImportError:
+    STORAGE_ENGINE = "excel"
+
+CAMPOS = ("radicado", "tipo", "fecha", "hora", "juzgado", "realizada_si", "realizada_no")
+NUM_MOTIVOS = 8
+
+
+def _texto(valor) -> str:
+    """Normaliza un valor leído del archivo a texto sin espacios sobrantes."""
+    return "" if valor is None else str(valor).strip()
+
+
+def audiencia_desde_registro(registro: dict) -> Audiencia:
+    """Crea una audiencia a partir de un registro CSV/JSON.
+
+    Los motivos pueden venir como lista (``"motivos"``) o en las columnas
+    ``motivo_1`` a ``motivo_8``.
+    """
+    motivos = registro.get("motivos")
+    if motivos is None:
+        motivos = [registro.get(f"motivo_{i}") for i in range(1, NUM_MOTIVOS + 1)]
+    motivos = [_texto(motivo) for motivo in motivos][:NUM_MOTIVOS]
+    motivos += [""] * (NUM_MOTIVOS - len(motivos))
+
+    datos = {campo: _texto(registro.get(campo)) for campo in CAMPOS}
+    datos["motivos"] = motivos
+    datos["observaciones"] = _texto(registro.get("observaciones"))
+    return Audiencia.from_form_data(datos)
+
+
+def _leer_csv(ruta: str) -> List[dict]:
+    with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+        muestra = archivo.read(4096)
+        archivo.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;")
+        except csv.Error:
+            dialecto = csv.excel
+        return list(csv.DictReader(archivo, dialect=dialecto))
+
+
+def _leer_json(ruta: str) -> List[dict]:
+    with open(ruta, encoding="utf-8") as archivo:
+        datos = json.load(archivo)
+    if isinstance(datos, dict):
+        datos = datos.get("audiencias", [])
+    if not isinstance(datos, list):
+        raise ValueError("Se esperaba una lista de audiencias")
+    return datos
+
+
+def leer_audiencias(ruta: str) -> List[Audiencia]:
+    """Lee las audiencias de un archivo .csv o .json.
+
+    El CSV lleva encabezados con los nombres de los campos (``radicado``,
+    ``tipo``, ``fecha``, ..., ``motivo_1``..``motivo_8``, ``observaciones``)
+    y puede separarse con comas o punto y coma. El JSON es una lista de
+    objetos con los mismos campos (o ``{"audiencias": [...]}``).
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    lectores = {".csv": _leer_csv, ".json": _leer_json}
+    if extension not in lectores:
+        raise Exception(f"Formato no soportado: {extension or ruta}. Use .csv o .json")
+
+    try:
+        registros = lectores[extension](ruta)
+    except Exception as e:
+        raise Exception(f"Error al leer {os.path.basename(ruta)}: {e}")
+
+    audiencias = []
+    for i, registro in enumerate(registros, start=1):
+        try:
+            audiencias.append(audiencia_desde_registro(registro))
+        except Exception as e:
+            raise Exception(f"Error en el registro {i} de {os.path.basename(ruta)}: {e}")
+    return audiencias
+
+
+def importar_audiencias(manager: ExcelManager, ruta: str) -> Tuple[int, int, List[int]]:
+    """Importa un archivo .csv o .json al libro con una sola escritura.
+
+    Devuelve los totales del libro (registros, realizadas, motivos).
+    """
+    return manager.guardar_lote(leer_audiencias(ruta))
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    """Importa desde la línea de comandos y devuelve el código de salida.
+
+    Uso: ``python -m utils.importador <libro.xlsx> <datos.csv|datos.json>``
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.importador",
+        description="Importa audiencias desde un archivo CSV o JSON a un libro de audiencias.",
+    )
+    parser.add_argument("libro", help="Libro .xlsx de audiencias (creado desde la plantilla)")
+    parser.add_argument("datos", help="Archivo .csv o .json con las audiencias")
+    opciones = parser.parse_args(argumentos)
+
+    if not os.path.exists(opciones.libro):
+        print(f"❌ Error: No se encontró el libro {opciones.libro}")
+        return 1
+
+    manager = ExcelManager(opciones.libro, motor=STORAGE_ENGINE)
+    try:
+        registros, realizadas, _ = importar_audiencias(manager, opciones.datos)
+        # Con el motor SQLite el .xlsx solo queda al día al exportar
+        if not manager.exportar():
+            raise Exception(manager.ultimo_error)
+    except Exception as e:
+        print(f"❌ Error al importar: {e}")
+        return 1
+    finally:
+        manager.cerrar()
+
+    print(f"✅ Importación completa: el libro tiene {registros} registros ({realizadas} realizadas)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import List, Optional, Tuple
 
+from models.audiencia import parsear_fecha, parsear_hora
+
 def validar_campos_obligatorios(datos: dict) -> Tuple[bool, str]:
     """Valida que los campos obligatorios estén completos."""
     campos_obligatorios = {
@@ -26,23 +28,20 @@ def validar_campos_obligatorios(datos: dict) -> Tuple[bool, str]:
 
 def validar_fecha(fecha_str: str) -> Tuple[bool, str]:
     """Valida el formato de fecha DD/MM/AAAA."""
-    try:
-        fecha = datetime.strptime(fecha_str, "%d/%m/%Y")
-        # Verificar que la fecha no sea muy antigua o muy futura
-        año_actual = datetime.now().year
-        if fecha.year < año_actual - 10 or fecha.year > año_actual + 10:
-            return False, f"La fecha parece incorrecta: {fecha_str}"
-        return True, ""
-    except ValueError:
+    fecha = parsear_fecha(fecha_str)
+    if fecha is None:
         return False, f"Formato de fecha inválido: {fecha_str}. Use DD/MM/AAAA"
+    # Verificar que la fecha no sea muy antigua o muy futura
+    año_actual = datetime.now().year
+    if fecha.year < año_actual - 10 or fecha.year > año_actual + 10:
+        return False, f"La fecha parece incorrecta: {fecha_str}"
+    return True, ""
 
 def validar_hora(hora_str: str) -> Tuple[bool, str]:
     """Valida el formato de hora HH:MM."""
-    try:
-        datetime.strptime(hora_str, "%H:%M")
-        return True, ""
-    except ValueError:
+    if parsear_hora(hora_str) is None:
         return False, f"Formato de hora inválido: {hora_str}. Use HH:MM"
+    return True, ""
 
 def validar_motivos_no_realizacion(realizada: str, motivos: List[str]) -> Tuple[bool, str]:
     """Valida que si la audiencia NO se realizó, haya al menos un motivo."""